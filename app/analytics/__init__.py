@@ -0,0 +1,27 @@
+"""Vectorized analytics on datasets and models."""
+
+from functools import cache
+
+from .registry import ModelRegistry
+from app.core import metrics
+from app.core.settings import settings
+from app.storage import get_artifact_cache
+
+
+@cache
+def get_model_registry() -> ModelRegistry:
+    """Dependency to get the registry of deployed models of the application.
+
+    Returns:
+        ModelRegistry: The shared model registry.
+
+    """
+    registry = ModelRegistry(get_artifact_cache(), settings.MODEL_REGISTRY_SIZE)
+    metrics.register("model_registry", registry.stats)
+    return registry
+
+
+__all__ = [
+    "ModelRegistry",
+    "get_model_registry",
+]
@@ -0,0 +1,157 @@
+"""Vectorized profiling of datasets.
+
+Every statistic of every column is computed by a single Arrow aggregation,
+which scans the table once with vectorized kernels; time coverage per geo
+takes a second, grouped aggregation over the time and geo columns only.
+Quantiles are approximated with t-digests.
+
+pyarrow is slow to import: import this module where it is used.
+"""
+
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.storage.columnar import json_value
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+_ALL = "__all__"
+"""Constant key grouping every row, as scalar aggregations only return the
+first quantile of a t-digest."""
+
+
+def _is_numeric(type_: pa.DataType) -> bool:
+    return pa.types.is_integer(type_) or pa.types.is_floating(type_)
+
+
+def _has_min_max(type_: pa.DataType) -> bool:
+    return (
+        _is_numeric(type_)
+        or pa.types.is_temporal(type_)
+        or pa.types.is_string(type_)
+        or pa.types.is_large_string(type_)
+        or pa.types.is_boolean(type_)
+    )
+
+
+def _aggregations(schema: pa.Schema, time_column: str | None) -> list[tuple]:
+    """List the aggregations computing the profile of every column."""
+    aggregations: list[tuple] = []
+    for field in schema:
+        aggregations.append((field.name, "count", pc.CountOptions(mode="only_null")))
+        if _has_min_max(field.type):
+            aggregations.append((field.name, "min_max"))
+        if _is_numeric(field.type):
+            aggregations += [
+                (field.name, "sum"),
+                (field.name, "mean"),
+                (field.name, "stddev"),
+                (field.name, "tdigest", pc.TDigestOptions(q=list(QUANTILES))),
+            ]
+    if time_column is not None:
+        aggregations.append((time_column, "count_distinct"))
+    return aggregations
+
+
+def _column_profile(field: pa.Field, stats: dict[str, Any], num_rows: int) -> dict:
+    name = field.name
+    min_max = stats.get(f"{name}_min_max") or {}
+    profile = {
+        "name": name,
+        "type": str(field.type),
+        "numeric": _is_numeric(field.type),
+        "null_ratio": stats.get(f"{name}_count", 0) / num_rows if num_rows else 0.0,
+        "min": json_value(min_max.get("min")),
+        "max": json_value(min_max.get("max")),
+    }
+    if profile["numeric"]:
+        quantiles = stats.get(f"{name}_tdigest") or [None] * len(QUANTILES)
+        profile |= {
+            "sum": stats.get(f"{name}_sum"),
+            "mean": stats.get(f"{name}_mean"),
+            "std": stats.get(f"{name}_stddev"),
+            "quantiles": {
+                f"p{round(q * 100)}": value
+                for q, value in zip(QUANTILES, quantiles, strict=True)
+            },
+        }
+    return profile
+
+
+def _time_coverage(
+    table: pa.Table,
+    time_column: str,
+    geo_column: str | None,
+    periods: int,
+) -> dict[str, Any]:
+    """Describe the periods covered by the dataset, and by each geo."""
+    times = pc.min_max(table.column(time_column)).as_py() or {}
+    geos = []
+    if geo_column is not None:
+        per_geo = (
+            table.select([geo_column, time_column])
+            .group_by(geo_column)
+            .aggregate(
+                [
+                    (time_column, "min"),
+                    (time_column, "max"),
+                    (time_column, "count_distinct"),
+                ],
+            )
+            .sort_by(geo_column)
+        )
+        geos = [
+            {
+                "geo": str(row[geo_column]),
+                "start": json_value(row[f"{time_column}_min"]),
+                "end": json_value(row[f"{time_column}_max"]),
+                "periods": row[f"{time_column}_count_distinct"],
+                "missing": periods - row[f"{time_column}_count_distinct"],
+            }
+            for row in per_geo.to_pylist()
+        ]
+    return {
+        "time_column": time_column,
+        "geo_column": geo_column,
+        "periods": periods,
+        "start": json_value(times.get("min")),
+        "end": json_value(times.get("max")),
+        "geos": geos,
+    }
+
+
+def profile_table(
+    table: pa.Table,
+    time_column: str | None = None,
+    geo_column: str | None = None,
+) -> dict[str, Any]:
+    """Profile the columns of a dataset and its time coverage per geo.
+
+    Args:
+        table: Dataset
+        time_column: Column of the time period, to profile the time coverage
+        geo_column: Column of the geography, to profile the coverage per geo
+
+    Returns:
+        Number of rows, profile of each column and time coverage, in the
+        format of ``DatasetProfile`` version ``PROFILE_VERSION``
+
+    """
+    grouped = table.append_column(_ALL, pa.nulls(table.num_rows)).group_by(_ALL)
+    rows = grouped.aggregate(_aggregations(table.schema, time_column)).to_pylist()
+    stats = rows[0] if rows else {}
+
+    coverage = None
+    if time_column is not None:
+        periods = stats.get(f"{time_column}_count_distinct", 0)
+        coverage = _time_coverage(table, time_column, geo_column, periods)
+
+    return {
+        "num_rows": table.num_rows,
+        "columns": [
+            _column_profile(field, stats, table.num_rows) for field in table.schema
+        ],
+        "time_coverage": coverage,
+    }
@@ -0,0 +1,121 @@
+"""In-memory registry of the response curves of deployed models.
+
+Simulations of a model need its response curves in memory. They are loaded
+from the artifact cache on first use and kept warm, evicting the least
+recently used models beyond the size of the registry. Concurrent requests
+for a model being loaded wait for that load instead of starting their own.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from app.core.logging import get_logger
+from app.storage import ArtifactCache
+
+if TYPE_CHECKING:
+    from .simulation import ResponseCurves
+
+logger = get_logger(__name__)
+
+_Key = tuple[str, str | None]
+"""URI of a model artifact and checksum of its response curves."""
+
+
+class ModelRegistry:
+    """LRU registry of the response curves of models, by artifact URI and checksum.
+
+    A model whose curves are replaced gets a new entry, and its previous
+    curves age out of the registry.
+
+    Meant to be used from the event loop: artifacts are read in a thread.
+    """
+
+    def __init__(self, artifacts: ArtifactCache, max_size: int) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            artifacts: Cache the artifacts of the models are read from
+            max_size: Maximum number of models kept in memory
+
+        """
+        self.artifacts = artifacts
+        self.max_size = max_size
+        self._models: OrderedDict[_Key, ResponseCurves] = OrderedDict()
+        self._loads: dict[_Key, asyncio.Task[ResponseCurves]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get(
+        self,
+        model_uri: str,
+        curves_checksum: str | None = None,
+    ) -> "ResponseCurves":
+        """Return the response curves of a model, loading them on a miss.
+
+        Args:
+            model_uri: URI of the model artifact
+            curves_checksum: Hex SHA-256 of the response curves, checked when
+                they are downloaded
+
+        Returns:
+            ResponseCurves: The response curves of the model
+
+        Raises:
+            FileNotFoundError: If the model has no response curves
+            ValueError: If the response curves do not match ``curves_checksum``
+
+        """
+        key = (model_uri, curves_checksum)
+        curves = self._models.get(key)
+        if curves is not None:
+            self._models.move_to_end(key)
+            self.hits += 1
+            return curves
+
+        task = self._loads.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.create_task(self._load(key))
+        self._loads[key] = task
+        # Retrieve the error of loads whose requests were all cancelled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        """Return registry counters."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._models),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+    async def _load(self, key: _Key) -> "ResponseCurves":
+        from .simulation import ResponseCurves, response_curves_uri
+
+        model_uri, curves_checksum = key
+        try:
+            file = await self.artifacts.open(
+                response_curves_uri(model_uri),
+                curves_checksum,
+            )
+            with file:
+                curves = await asyncio.to_thread(ResponseCurves.load, file)
+        finally:
+            del self._loads[key]
+        self._models[key] = curves
+        while len(self._models) > self.max_size:
+            self._models.popitem(last=False)
+            self.evictions += 1
+        logger.info("🔥 Loaded the response curves of model %s", model_uri)
+        return curves
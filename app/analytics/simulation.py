@@ -0,0 +1,212 @@
+"""Vectorized simulation of budget scenarios on the response curves of a model.
+
+The response curves of a fitted model give, for each posterior sample and
+channel, the incremental KPI of the channel when its spend over the fitted
+period is scaled by each multiplier of a grid. Scenarios are evaluated by
+linear interpolation between the points of the grid: a scenario is turned
+into the weights of the grid points of each channel, at most two non-zero
+per channel, and the incremental KPI of every posterior sample is the
+product of these weights with the curves. A batch of scenarios is thus a
+single matrix product, with channels assumed additive at steady state.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+
+CURVE_MULTIPLIERS = tuple(i / 4 for i in range(13))
+"""Multipliers of the historical spend of a channel the curves are computed at."""
+
+QUANTILES = (5, 95)
+"""Percentiles of the posterior distribution reported for each scenario."""
+
+
+def response_curves_uri(model_uri: str) -> str:
+    """Return the URI of the response curves of a model artifact."""
+    return str(Path(model_uri).with_suffix(".curves.npz"))
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseCurves:
+    """Response curves of the channels of a fitted model."""
+
+    channels: tuple[str, ...]
+    spend: np.ndarray
+    """Historical spend per channel, shape (C,)."""
+    multipliers: np.ndarray
+    """Increasing multipliers of the historical spend, from 0, shape (G,)."""
+    curves: np.ndarray
+    """Incremental KPI per channel and multiplier, shape (C × G, S)."""
+    means: np.ndarray
+    """Posterior mean of the curves, shape (C × G,)."""
+
+    @classmethod
+    def from_arrays(
+        cls,
+        channels: list[str],
+        spend: np.ndarray,
+        multipliers: np.ndarray,
+        incremental: np.ndarray,
+    ) -> "ResponseCurves":
+        """Build response curves from arrays.
+
+        Args:
+            channels: Names of the channels
+            spend: Historical spend per channel, shape (C,)
+            multipliers: Increasing multipliers from 0, shape (G,)
+            incremental: Incremental KPI per multiplier, posterior sample and
+                channel, shape (G, S, C)
+
+        """
+        # Rows of a channel's grid points are contiguous, for the product
+        curves = np.ascontiguousarray(
+            np.asarray(incremental, dtype=np.float32).transpose(2, 0, 1),
+        ).reshape(len(channels) * len(multipliers), -1)
+        return cls(
+            channels=tuple(channels),
+            spend=np.asarray(spend, dtype=np.float64),
+            multipliers=np.asarray(multipliers, dtype=np.float64),
+            curves=curves,
+            means=curves.mean(axis=1, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> "ResponseCurves":
+        """Load response curves saved with ``save``, from a binary file.
+
+        Arrays are read from the file one at a time, never the whole file.
+        """
+        with np.load(file) as arrays:
+            return cls.from_arrays(
+                channels=arrays["channels"].tolist(),
+                spend=arrays["spend"],
+                multipliers=arrays["multipliers"],
+                incremental=arrays["incremental"],
+            )
+
+    @staticmethod
+    def save(
+        path: str | Path,
+        channels: list[str],
+        spend: np.ndarray,
+        multipliers: np.ndarray,
+        incremental: np.ndarray,
+    ) -> None:
+        """Save response curves, with the arrays of ``from_arrays``."""
+        with Path(path).open("wb") as file:
+            np.savez(
+                file,
+                channels=np.asarray(channels, dtype=str),
+                spend=np.asarray(spend, dtype=np.float64),
+                multipliers=np.asarray(multipliers, dtype=np.float64),
+                incremental=np.asarray(incremental, dtype=np.float32),
+            )
+
+    @property
+    def samples(self) -> int:
+        """Number of posterior samples."""
+        return self.curves.shape[1]
+
+    def weights(self, budgets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the weights of the grid points of scenarios.
+
+        Budgets beyond the grid are capped at its last multiplier. Channels
+        without historical spend only have the point at 0 of the grid: any
+        budget on them is capped to 0.
+
+        Args:
+            budgets: Budget of each channel per scenario, shape (N, C)
+
+        Returns:
+            Weights of shape (N, C × G), and whether each scenario was capped
+
+        """
+        grid = self.multipliers
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(self.spend > 0, budgets / self.spend, 0.0)
+        capped = ((scale > grid[-1]) | ((self.spend <= 0) & (budgets > 0))).any(axis=1)
+        scale = np.clip(scale, 0.0, grid[-1])
+        lower = np.clip(
+            np.searchsorted(grid, scale, side="right") - 1, 0, len(grid) - 2
+        )
+        upper_weight = (scale - grid[lower]) / (grid[lower + 1] - grid[lower])
+
+        rows, channels = budgets.shape
+        weights = np.zeros((rows, channels, len(grid)), dtype=np.float32)
+        row_index = np.arange(rows)[:, None]
+        channel_index = np.arange(channels)
+        weights[row_index, channel_index, lower] = 1.0 - upper_weight
+        weights[row_index, channel_index, lower + 1] = upper_weight
+        return weights.reshape(rows, -1), capped
+
+
+def simulate(
+    curves: ResponseCurves,
+    budgets: np.ndarray,
+    block_elements: int,
+    intervals: bool = True,
+) -> dict[str, Any]:
+    """Evaluate budget scenarios over the posterior samples of a model.
+
+    Means are linear in the curves, so they are computed from the posterior
+    mean of the curves. Percentiles need every sample: scenarios are then
+    evaluated in blocks of at most ``block_elements`` scenario samples, to
+    bound memory whatever the number of scenarios.
+
+    Args:
+        curves: Response curves of the model
+        budgets: Budget of each channel per scenario, over a period as long
+            as the fitted one, shape (N, C)
+        block_elements: Maximum number of scenario samples held at once
+        intervals: Whether to compute the percentiles of the scenarios
+
+    Returns:
+        Arrays of the incremental KPI and ROI of the scenarios, as posterior
+        mean and percentiles, and of the mean incremental KPI and ROI of
+        each of their channels
+
+    """
+    budgets = np.asarray(budgets, dtype=np.float64)
+    rows, channels = budgets.shape
+    block = max(block_elements // curves.samples, 1) if intervals else rows
+    incremental = np.full((len(QUANTILES) + 1, rows), np.nan)
+    channel_incremental = np.empty((rows, channels), dtype=np.float64)
+    capped = np.empty(rows, dtype=bool)
+    for start in range(0, rows, block):
+        stop = min(start + block, rows)
+        weights, capped[start:stop] = curves.weights(budgets[start:stop])
+        channel_incremental[start:stop] = (
+            weights.reshape(stop - start, channels, -1)
+            * curves.means.reshape(channels, -1)
+        ).sum(axis=2)
+        if intervals:
+            samples = weights @ curves.curves
+            incremental[1:, start:stop] = np.percentile(samples, QUANTILES, axis=1)
+    incremental[0] = channel_incremental.sum(axis=1)
+
+    # ROI is the incremental KPI per unit of spend, a monotonic transformation
+    # of the samples, so its percentiles are those of the incremental KPI
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = incremental / budgets.sum(axis=1)
+        # Channels without historical spend have no curve to get a ROI from
+        channel_roi = np.where(
+            (budgets > 0) & (curves.spend > 0),
+            channel_incremental / budgets,
+            np.nan,
+        )
+    return {
+        "channels": list(curves.channels),
+        "incremental": _interval(incremental),
+        "roi": _interval(roi),
+        "channel_incremental": channel_incremental,
+        "channel_roi": channel_roi,
+        "capped": capped,
+    }
+
+
+def _interval(values: np.ndarray) -> dict[str, np.ndarray]:
+    """Name the mean and percentile rows of an array."""
+    names = ("mean", *(f"p{quantile}" for quantile in QUANTILES))
+    return dict(zip(names, values, strict=True))
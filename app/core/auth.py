@@ -0,0 +1,373 @@
+"""API key authentication backend.
+
+API keys are never stored in plain text: the ``api_key`` table holds their
+HMAC-SHA256 keyed by ``AUTH_SECRET``, which is fast enough to compute on
+every request and useless to an attacker without the secret. The same hash
+identifies keys in the in-memory authentication cache, so revoking a stored
+key can evict it without knowing the plain text.
+
+A Bloom filter of the hashes of every valid key rejects unknown keys before
+any lookup, right away, so floods of unknown keys never reach the database.
+Keys created through the API are added to the filter of every worker when
+they are committed, by notification. Keys created any other way (directly
+in Supabase, or while a worker's listener was disconnected) are caught up
+out of band, every ``AUTH_KEY_FILTER_SYNC_INTERVAL``, by a sync reading only
+the keys created or updated since the last one. The filter is also rebuilt
+periodically from the valid local keys, which drops revoked ones; until its
+first build, every key goes through the regular lookups.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import re
+import secrets
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import func, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from . import metrics, notifications
+from .bloom import BloomFilter
+from .cache import TTLCache
+from .db import get_async_engine, get_supabase_client
+from .logging import get_logger
+from .settings import settings
+from app.models import Key, Project, User
+
+logger = get_logger(__name__)
+
+API_KEY_PREFIX = "byn_"
+
+api_key_cache: TTLCache[User | None] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE,
+    ttl=settings.AUTH_CACHE_TTL,
+)
+"""Cache of API key hashes to resolved users (``None`` for unknown keys)."""
+
+metrics.register("auth_cache", api_key_cache.stats)
+
+API_KEYS_CHANNEL = "api_keys"
+"""Notification channel of the hashes of new API keys."""
+
+_KEY_FILTER_MIN_CAPACITY = 1_024
+_KEY_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+_SUPABASE_PAGE_SIZE = 1_000
+_SYNC_OVERLAP = timedelta(minutes=1)
+"""Margin of the sync cursors, for keys committed after their timestamp."""
+
+
+class ApiKeyFilter:
+    """Bloom filter of the hashes of valid API keys.
+
+    Lets every key through until it is first built.
+    """
+
+    def __init__(self, error_rate: float) -> None:
+        """Initialize an empty, not yet built filter.
+
+        Args:
+            error_rate: Target false positive rate of the filter
+
+        """
+        self.error_rate = error_rate
+        self._filter: BloomFilter | None = None
+        self._added_during_rebuild: list[str] | None = None
+        self.synced_at: datetime | None = None
+        """Time of the last sync or rebuild, from which the next sync reads."""
+        self.rejections = 0
+        self.rebuilds = 0
+        self.rebuild_time = 0.0
+        self.syncs = 0
+
+    def might_exist(self, key_hash: str) -> bool:
+        """Return False if the key was not in the filter as of its last sync."""
+        return self._filter is None or key_hash in self._filter
+
+    def add(self, key_hash: str) -> None:
+        """Add the hash of a newly created or synced key."""
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(key_hash)
+        # Syncs read keys again, which must not count twice in the filter
+        if self._filter is not None and key_hash not in self._filter:
+            self._filter.add(key_hash)
+
+    def start_rebuild(self) -> None:
+        """Record keys added while the keys of the next filter are loaded."""
+        self._added_during_rebuild = []
+
+    def rebuild(self, key_hashes: Iterable[str], started_at: float) -> None:
+        """Replace the filter with one built from ``key_hashes``.
+
+        Args:
+            key_hashes: Hashes of every valid key
+            started_at: ``time.perf_counter()`` value when the rebuild started
+
+        """
+        key_hashes = [*key_hashes, *(self._added_during_rebuild or ())]
+        bloom = BloomFilter(
+            # Leave room for the keys created until the next rebuild
+            capacity=max(2 * len(key_hashes), _KEY_FILTER_MIN_CAPACITY),
+            error_rate=self.error_rate,
+        )
+        for key_hash in key_hashes:
+            bloom.add(key_hash)
+        self._filter = bloom
+        self._added_during_rebuild = None
+        self.rebuilds += 1
+        self.rebuild_time = time.perf_counter() - started_at
+
+    def stats(self) -> dict[str, Any]:
+        """Return the filter's size, false positive rate and counters."""
+        bloom = self._filter
+        return {
+            "ready": bloom is not None,
+            "keys": len(bloom) if bloom else 0,
+            "size_bytes": bloom.size_bytes if bloom else 0,
+            "num_hashes": bloom.num_hashes if bloom else 0,
+            "false_positive_rate": bloom.false_positive_rate if bloom else 0.0,
+            "rejections": self.rejections,
+            "syncs": self.syncs,
+            "rebuilds": self.rebuilds,
+            "rebuild_time": self.rebuild_time,
+        }
+
+
+api_key_filter = ApiKeyFilter(error_rate=settings.AUTH_KEY_FILTER_ERROR_RATE)
+"""Filter of valid API key hashes, consulted before any lookup."""
+
+metrics.register("auth_key_filter", api_key_filter.stats)
+notifications.on_notification(API_KEYS_CHANNEL, api_key_filter.add)
+
+
+def generate_api_key() -> str:
+    """Generate a new plain text API key."""
+    return f"{API_KEY_PREFIX}{secrets.token_urlsafe(32)}"
+
+
+def hash_api_key(key: str) -> str:
+    """Return the keyed hash under which an API key is stored."""
+    return hmac.new(
+        settings.AUTH_SECRET.get_secret_value().encode(),
+        key.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def is_api_key_hash(value: str) -> bool:
+    """Return whether a stored key is a hash, rather than a legacy plain text key."""
+    return _KEY_HASH_PATTERN.fullmatch(value) is not None
+
+
+async def backfill_api_key_hashes(session: AsyncSession, batch_size: int) -> int:
+    """Replace the plain text keys of the ``api_key`` table with their hash.
+
+    Keys are processed in batches by ID, each committed on its own, and keys
+    already hashed are left untouched, so the backfill can be interrupted
+    and run again.
+
+    Args:
+        session: Async database session
+        batch_size: Number of keys read per batch
+
+    Returns:
+        Number of hashed keys
+
+    """
+    hashed = 0
+    after = ""
+    while True:
+        result = await session.exec(
+            select(Key).where(Key.id > after).order_by(Key.id).limit(batch_size),
+        )
+        keys = result.all()
+        if not keys:
+            return hashed
+        for key in keys:
+            if not is_api_key_hash(key.key):
+                key.key = hash_api_key(key.key)
+                session.add(key)
+                hashed += 1
+        after = keys[-1].id
+        await session.commit()
+
+
+def invalidate_api_key(key_hash: str) -> None:
+    """Drop a revoked or deactivated API key from the authentication cache."""
+    api_key_cache.delete(key_hash)
+
+
+def invalidate_user(user_id: str) -> int:
+    """Drop every cached API key resolving to the given user.
+
+    Returns:
+        Number of invalidated keys
+
+    """
+    return api_key_cache.delete_where(
+        lambda _, user: user is not None and user.id == user_id,
+    )
+
+
+async def authenticate_api_key(session: AsyncSession, key_hash: str) -> User | None:
+    """Resolve the owner of an active, unexpired API key from the database.
+
+    The key is looked up through the indexed ``api_key.key`` column and its
+    owner is joined through the key's project, in a single query.
+
+    Args:
+        session: Async database session
+        key_hash: Hash of the API key, as returned by ``hash_api_key``
+
+    Returns:
+        The user owning the project of the key, or None if the key is
+        unknown, inactive or expired
+
+    """
+    query = (
+        select(User)
+        .join(Project, Project.user_id == User.id)
+        .join(Key, Key.project_id == Project.id)
+        .where(Key.key == key_hash, *_valid_key_clauses())
+    )
+    result = await session.exec(query)
+    return result.first()
+
+
+def _valid_key_clauses() -> tuple:
+    """Return the clauses selecting active, unexpired keys."""
+    return (
+        Key.is_active,
+        or_(Key.expires_at.is_(None), Key.expires_at > func.now()),
+    )
+
+
+class _SupabaseKeys:
+    """Hashes of the API keys stored in Supabase, read incrementally.
+
+    Keys are read by creation time from a cursor, never all over again.
+    Keys deleted from Supabase are kept, which only costs a lookup.
+    """
+
+    def __init__(self) -> None:
+        self.hashes: set[str] = set()
+        self._created_since: datetime | None = None
+
+    def fetch(self) -> list[str]:
+        """Read the keys created since the last fetch and return their hashes."""
+        table = get_supabase_client().table("apiKey")
+        since = self._created_since
+        new_hashes = []
+        start = 0
+        while True:
+            query = table.select("key, created_at")
+            if since is not None:
+                query = query.gte("created_at", (since - _SYNC_OVERLAP).isoformat())
+            rows = (
+                query.order("created_at")
+                .range(start, start + _SUPABASE_PAGE_SIZE - 1)
+                .execute()
+                .data
+            )
+            for row in rows:
+                key_hash = hash_api_key(row["key"])
+                if key_hash not in self.hashes:
+                    self.hashes.add(key_hash)
+                    new_hashes.append(key_hash)
+                created_at = datetime.fromisoformat(row["created_at"])
+                if self._created_since is None or created_at > self._created_since:
+                    self._created_since = created_at
+            if len(rows) < _SUPABASE_PAGE_SIZE:
+                return new_hashes
+            start += _SUPABASE_PAGE_SIZE
+
+
+_supabase_keys = _SupabaseKeys()
+
+
+async def rebuild_api_key_filter(session: AsyncSession) -> None:
+    """Rebuild the API key filter from every valid local key.
+
+    Keys stored in Supabase are included while the Supabase fallback is
+    enabled, from the keys read so far and the ones created since.
+
+    Args:
+        session: Async database session used to load the local keys
+
+    """
+    started_at = time.perf_counter()
+    synced_at = datetime.now(UTC)
+    api_key_filter.start_rebuild()
+    result = await session.exec(select(Key.key).where(*_valid_key_clauses()))
+    key_hashes = list(result.all())
+    if settings.AUTH_SUPABASE_FALLBACK:
+        await run_in_threadpool(_supabase_keys.fetch)
+        key_hashes += _supabase_keys.hashes
+    api_key_filter.rebuild(key_hashes, started_at)
+    api_key_filter.synced_at = synced_at
+    logger.info(
+        "🔑 API key filter rebuilt with %d keys in %.3fs",
+        len(key_hashes),
+        api_key_filter.rebuild_time,
+    )
+
+
+async def notify_api_key(session: AsyncSession, key_hash: str) -> None:
+    """Add a new key to the filter of every worker once ``session`` commits."""
+    await notifications.notify(session, API_KEYS_CHANNEL, key_hash)
+
+
+async def _sync_api_key_filter() -> None:
+    """Add the keys created or updated since the last sync to the filter."""
+    synced_at = datetime.now(UTC)
+    since = api_key_filter.synced_at - _SYNC_OVERLAP
+    async with AsyncSession(get_async_engine()) as session:
+        result = await session.exec(
+            select(Key.key).where(
+                or_(Key.created_at >= since, Key.updated_at >= since),
+            ),
+        )
+        key_hashes = list(result.all())
+    if settings.AUTH_SUPABASE_FALLBACK:
+        key_hashes += await run_in_threadpool(_supabase_keys.fetch)
+    for key_hash in key_hashes:
+        api_key_filter.add(key_hash)
+    api_key_filter.synced_at = synced_at
+    api_key_filter.syncs += 1
+
+
+def api_key_might_exist(key_hash: str) -> bool:
+    """Return False if an API key is definitely unknown, as of the last sync."""
+    if api_key_filter.might_exist(key_hash):
+        return True
+    api_key_filter.rejections += 1
+    return False
+
+
+async def refresh_api_key_filter() -> None:
+    """Keep the API key filter up to date, until cancelled.
+
+    Rebuilds the filter every ``AUTH_KEY_FILTER_REBUILD_INTERVAL``, and
+    syncs it with new keys every ``AUTH_KEY_FILTER_SYNC_INTERVAL`` in
+    between. A failed rebuild keeps the previous filter, and a failed sync
+    is caught up by the next one.
+    """
+    while True:
+        try:
+            async with AsyncSession(get_async_engine()) as session:
+                await rebuild_api_key_filter(session)
+        except Exception:
+            logger.exception("Failed to rebuild the API key filter")
+        rebuild_at = time.monotonic() + settings.AUTH_KEY_FILTER_REBUILD_INTERVAL
+        while (delay := rebuild_at - time.monotonic()) > 0:
+            await asyncio.sleep(min(delay, settings.AUTH_KEY_FILTER_SYNC_INTERVAL))
+            if api_key_filter.synced_at is None or time.monotonic() >= rebuild_at:
+                continue
+            try:
+                await _sync_api_key_filter()
+            except Exception:
+                logger.exception("Failed to sync the API key filter")
@@ -0,0 +1,68 @@
+"""Bloom filter for fast set membership tests.
+
+A Bloom filter answers "definitely not in the set" or "possibly in the set"
+using a few bits per item. It is used to reject unknown values (such as
+invalid API keys) without looking them up.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings.
+
+    Items cannot be removed; rebuild the filter to drop them.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        """Size the filter for an expected number of items.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False positive rate once ``capacity`` items are added
+
+        """
+        capacity = max(capacity, 1)
+        self.num_bits = max(
+            math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2),
+            8,
+        )
+        self.num_hashes = max(round(self.num_bits / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        """Return the bit positions of an item, by double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Return False if the item was never added, True if it may have been."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of items added."""
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the bit array, in bytes."""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated false positive rate given the items added so far."""
+        fill = 1 - math.exp(-self.num_hashes * self._count / self.num_bits)
+        return fill**self.num_hashes
@@ -0,0 +1,117 @@
+"""In-process caching utilities.
+
+This module provides a thread-safe, size-bounded LRU cache whose entries
+expire after a time-to-live. It is used to keep hot lookups (such as API key
+resolution) out of the network path.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache[V]:
+    """Thread-safe LRU cache with per-entry time-to-live.
+
+    Entries are evicted in least-recently-used order once ``maxsize`` is
+    reached, and are treated as absent once their TTL has elapsed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept in the cache
+            ttl: Default time-to-live of an entry, in seconds
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        """Return the cached value for ``key``, or ``default`` if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> V | Any:
+        """Return the cached value without touching recency or counters."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+        if item is _MISSING or item[0] <= time.monotonic():
+            return default
+        return item[1]
+
+    def set(self, key: Hashable, value: V, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key`` from the cache.
+
+        Returns:
+            True if the key was present, False otherwise
+
+        """
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def delete_where(self, predicate: Callable[[Hashable, V], bool]) -> int:
+        """Remove every entry for which ``predicate(key, value)`` is true.
+
+        Returns:
+            Number of removed entries
+
+        """
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Return the number of entries, including not yet purged expired ones."""
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
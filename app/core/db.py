@@ -1,17 +1,54 @@
-"""Database session management for the application."""
+"""Database session management for the application.
 
-import os
-from collections.abc import Generator
+Engines and Supabase clients are created on first use rather than at import
+time, so importing the application stays cheap and free of side effects.
+"""
 
+from collections.abc import AsyncGenerator, Generator
+from threading import Lock
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine
-from supabase import Client, create_client
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from .pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument
 from .settings import settings
 
-engine = create_engine(
-    settings.DATABASE_URL.get_secret_value(),
-    echo=settings.DEBUG,
-)
+if TYPE_CHECKING:
+    import asyncpg
+    import httpx
+    from supabase import Client
+
+_POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = Lock()
+
+
+def get_engine() -> Engine:
+    """Return the database engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    settings.DATABASE_URL.get_secret_value(),
+                    echo=settings.DEBUG,
+                    poolclass=TimedQueuePool,
+                    **_POOL_OPTIONS,
+                )
+                instrument(_engine, "db_pool")
+    return _engine
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -21,35 +58,193 @@ def get_session() -> Generator[Session, None, None]:
         Session: A SQLModel session for database operations.
 
     """
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
-def get_supabase_client() -> Client:
-    """Dependency to get the Supabase client.
+def _async_database_url(database_url: str) -> tuple[URL, dict]:
+    """Build the asyncpg URL and connect arguments from a connection string.
+
+    asyncpg does not understand libpq's ``sslmode`` query parameter, so it is
+    moved to the ``ssl`` connect argument.
+    """
+    url = make_url(database_url)
+    connect_args = {}
+    if "sslmode" in url.query:
+        connect_args["ssl"] = url.query["sslmode"]
+        url = url.difference_update_query(["sslmode"])
+    return url.set(drivername="postgresql+asyncpg"), connect_args
+
+
+def _statement_name() -> str:
+    """Return a unique prepared statement name, to never reuse one."""
+    return f"__asyncpg_{uuid4()}__"
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the asynchronous database engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                url, connect_args = _async_database_url(
+                    settings.DATABASE_URL.get_secret_value(),
+                )
+                if settings.DB_POOLER:
+                    # Transaction poolers hand each transaction to any server
+                    # connection, where named prepared statements do not exist
+                    connect_args |= {
+                        "statement_cache_size": 0,
+                        "prepared_statement_cache_size": 0,
+                        "prepared_statement_name_func": _statement_name,
+                    }
+                _async_engine = create_async_engine(
+                    url,
+                    echo=settings.DEBUG,
+                    connect_args=connect_args,
+                    poolclass=TimedAsyncAdaptedQueuePool,
+                    **_POOL_OPTIONS,
+                )
+                instrument(_async_engine.sync_engine, "db_async_pool")
+    return _async_engine
+
+
+def is_postgres() -> bool:
+    """Return whether ``DATABASE_URL`` points to a PostgreSQL database."""
+    return make_url(settings.DATABASE_URL.get_secret_value()).get_backend_name() == (
+        "postgresql"
+    )
+
+
+async def connect_listener() -> "asyncpg.Connection":
+    """Open a dedicated asyncpg connection, outside of the pool, for ``LISTEN``.
+
+    Notifications are only received by the connection that listens, which
+    must stay open, so it is not taken from the pool. It connects to
+    ``DATABASE_LISTEN_URL`` if set, which must not go through a transaction
+    pooler.
+    """
+    import asyncpg
+
+    database_url = settings.DATABASE_LISTEN_URL or settings.DATABASE_URL
+    url, connect_args = _async_database_url(database_url.get_secret_value())
+    return await asyncpg.connect(
+        url.set(drivername="postgresql").render_as_string(hide_password=False),
+        **connect_args,
+    )
+
+
+async def dispose_engines() -> None:
+    """Close the connection pools of the engines created so far."""
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an asynchronous database session.
 
     Yields:
-        Client: The Supabase client for database operations.
+        AsyncSession: A SQLModel async session for database operations.
 
     """
-    supabase: Client = create_client(
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+_supabase_transport: "httpx.HTTPTransport | None" = None
+_supabase_http_clients: list["httpx.Client"] = []
+_supabase_clients: dict[str, "Client"] = {}
+_supabase_lock = Lock()
+
+
+def _create_supabase_client(key: str) -> "Client":
+    """Create a Supabase client on top of the shared HTTP connection pool.
+
+    Each client gets its own ``httpx.Client`` because the PostgREST client
+    mutates its base URL and headers, but all of them share one transport,
+    hence one keep-alive connection pool.
+    """
+    # The Supabase SDK is slow to import and only needed on first use
+    import httpx
+    from supabase import ClientOptions, create_client
+
+    global _supabase_transport
+    if _supabase_transport is None:
+        _supabase_transport = httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    http_client = httpx.Client(
+        transport=_supabase_transport,
+        timeout=settings.SUPABASE_HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+    _supabase_http_clients.append(http_client)
+
+    return create_client(
         settings.SUPABASE_URL.get_secret_value(),
-        settings.SUPABASE_KEY.get_secret_value(),
+        key,
+        options=ClientOptions(
+            httpx_client=http_client,
+            auto_refresh_token=False,
+            persist_session=False,
+        ),
     )
 
-    return supabase
 
+def _get_or_create_supabase_client(name: str, key: str) -> "Client":
+    """Return the shared Supabase client ``name``, creating it if needed."""
+    client = _supabase_clients.get(name)
+    if client is None:
+        with _supabase_lock:
+            client = _supabase_clients.get(name)
+            if client is None:
+                client = _create_supabase_client(key)
+                _supabase_clients[name] = client
+    return client
+
+
+def close_supabase_clients() -> None:
+    """Close the shared Supabase clients and their connection pool."""
+    global _supabase_transport
+    with _supabase_lock:
+        for http_client in _supabase_http_clients:
+            http_client.close()
+        _supabase_http_clients.clear()
+        _supabase_clients.clear()
+        if _supabase_transport is not None:
+            _supabase_transport.close()
+            _supabase_transport = None
+
+
+def get_supabase_client() -> "Client":
+    """Dependency to get the Supabase client.
+
+    Returns:
+        Client: The shared Supabase client for database operations.
 
-def get_supabase_admin_auth_client() -> Client:
+    """
+    return _get_or_create_supabase_client(
+        "default",
+        settings.SUPABASE_KEY.get_secret_value(),
+    )
+
+
+def get_supabase_admin_auth_client() -> "Client":
     """Dependency to get the Supabase admin auth client.
 
-    Yields:
-        Client: The Supabase admin auth client for database operations.
+    Returns:
+        Client: The shared Supabase admin auth client for database operations.
 
     """
-    supabase: Client = create_client(
-        settings.SUPABASE_URL.get_secret_value(),
+    return _get_or_create_supabase_client(
+        "admin",
         settings.SUPABASE_SERVICE_ROLE_KEY.get_secret_value(),
     )
-
-    return supabase
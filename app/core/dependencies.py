@@ -4,15 +4,31 @@ from typing import Annotated
 from uuid import uuid4
 
 from fastapi import Depends, Path
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel import Session
-
-from app.core.db import Client, get_session, get_supabase_client
-from app.core.exceptions import InvalidApiKeyError, MissingApiKeyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics import ModelRegistry, get_model_registry
+from app.core.auth import (
+    api_key_cache,
+    api_key_might_exist,
+    authenticate_api_key,
+    hash_api_key,
+)
+from app.core.db import (
+    get_async_session,
+    get_session,
+    get_supabase_client,
+)
+from app.core.exceptions import InvalidApiKeyError, MissingApiKeyError, NotFoundError
 from app.core.logging import get_logger
 from app.core.security import get_bearer_token
-from app.models import User
+from app.core.settings import settings
+from app.models import Project, User
+from app.services import AsyncProjectService
 from app.services.supabase.user import UserService
+from app.storage import BlobStorage, get_blob_storage
 
 ProjectId = Annotated[
     str,
@@ -23,35 +39,68 @@ ProjectId = Annotated[
 logger = get_logger(__name__)
 
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+StorageDep = Annotated[BlobStorage, Depends(get_blob_storage)]
+ModelRegistryDep = Annotated[ModelRegistry, Depends(get_model_registry)]
 
 
-# TODO: move to middleware
-def get_current_user(
-    supabase: Annotated[Client, Depends(get_supabase_client)],
-    key: Annotated[HTTPAuthorizationCredentials, Depends(get_bearer_token)],
-) -> User:
-    """Get the currently authenticated user from the API key."""
-    if not key:
-        raise MissingApiKeyError
+def _resolve_user(key: str) -> User | None:
+    """Resolve the user owning an API key through Supabase.
 
+    Fallback for keys that are not stored locally yet.
+    """
     response = (
-        supabase.table("apiKey")
+        get_supabase_client()
+        .table("apiKey")
         .select("*")
-        .eq("key", key.credentials)
-        .single()
+        .eq("key", key)
+        .maybe_single()
         .execute()
     )
 
-    if not response.data:
-        logger.warning("Unauthorized access attempt with key: %s", key.credentials)
-        raise InvalidApiKeyError
+    if not response or not response.data:
+        return None
 
     user_id = response.data.get("user_id")
 
-    user = UserService().get_user_by_id(user_id)
+    return UserService().get_user_by_id(user_id)
+
+
+# TODO: move to middleware
+async def get_current_user(
+    session: AsyncSessionDep,
+    key: Annotated[HTTPAuthorizationCredentials, Depends(get_bearer_token)],
+) -> User:
+    """Get the currently authenticated user from the API key.
+
+    Keys are looked up by their keyed hash in the local ``api_key`` table,
+    then in Supabase if ``AUTH_SUPABASE_FALLBACK`` is enabled. Resolved keys
+    are cached for ``AUTH_CACHE_TTL`` seconds, and unknown keys for
+    ``AUTH_CACHE_NEGATIVE_TTL`` seconds. Keys missing from the API key filter
+    are rejected right away, without lookup, and are not cached, so floods
+    of invalid keys do not evict valid ones.
+    """
+    if not key:
+        raise MissingApiKeyError
+
+    key_hash = hash_api_key(key.credentials)
+    user = api_key_cache.get(key_hash, default=...)
+
+    if user is ... and not api_key_might_exist(key_hash):
+        user = None
+    elif user is ...:
+        user = await authenticate_api_key(session, key_hash)
+        if user is None and settings.AUTH_SUPABASE_FALLBACK:
+            user = await run_in_threadpool(_resolve_user, key.credentials)
+        api_key_cache.set(
+            key_hash,
+            user,
+            ttl=None if user else settings.AUTH_CACHE_NEGATIVE_TTL,
+        )
 
     if not user:
-        logger.warning("Unauthorized access attempt with key: %s", key.credentials)
+        # Never log the key itself
+        logger.warning("Unauthorized access attempt with key %s...", key_hash[:12])
         raise InvalidApiKeyError
 
     return user
@@ -59,3 +108,19 @@ def get_current_user(
 
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
 """Dependency to get the currently authenticated user."""
+
+
+async def get_current_project(
+    project_id: ProjectId,
+    current_user: CurrentUserDep,
+    session: AsyncSessionDep,
+) -> Project:
+    """Get the project of the path, if owned by the current user."""
+    project = await AsyncProjectService(session).get_by_id(project_id)
+    if project is None or project.user_id != current_user.id:
+        raise NotFoundError("Project not found")
+    return project
+
+
+CurrentProjectDep = Annotated[Project, Depends(get_current_project)]
+"""Dependency to get the project of the path owned by the current user."""
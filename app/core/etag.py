@@ -0,0 +1,101 @@
+"""Conditional GET support with strong ETags.
+
+ETags are computed from a cheap version of the underlying data (such as the
+latest update timestamp and row count), the caller and the request URL,
+without serializing the response. Requests whose ``If-None-Match`` header
+matches get a 304 before the endpoint runs.
+"""
+
+import hashlib
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Annotated, Any
+
+from fastapi import Depends, Request, Response
+
+from .dependencies import CurrentUserDep
+from .exceptions import NotModifiedError
+
+CACHE_CONTROL = "private, no-cache"
+"""Let clients store responses but revalidate them on every use."""
+
+
+def compute_etag(*parts: Hashable) -> str:
+    """Compute a strong ETag from the given parts."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def check_etag(request: Request, user_id: str, data_version: Any) -> dict[str, str]:
+    """Compute the ETag of a request and answer it if it matches.
+
+    Args:
+        request: Current request
+        user_id: ID of the current user
+        data_version: Cheap, hashable version of the data served
+
+    Returns:
+        The caching headers of the response
+
+    Raises:
+        NotModifiedError: If ``If-None-Match`` matches the ETag
+
+    """
+    etag = compute_etag(user_id, request.url.path, request.url.query, data_version)
+    return check_if_none_match(request, etag)
+
+
+def check_if_none_match(request: Request, etag: str) -> dict[str, str]:
+    """Answer a request whose ``If-None-Match`` matches a known ETag.
+
+    Returns:
+        The caching headers of the response
+
+    Raises:
+        NotModifiedError: If ``If-None-Match`` matches the ETag
+
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModifiedError(headers)
+    return headers
+
+
+def conditional_get(
+    version: Callable[..., Hashable | Awaitable[Hashable]],
+) -> Callable[..., Awaitable[dict[str, str]]]:
+    """Build a dependency answering conditional GET requests.
+
+    Args:
+        version: Dependency returning a cheap, hashable version of the data
+            served by the endpoint, e.g. ``(max(updated_at), count)``
+
+    Returns:
+        A dependency raising ``NotModifiedError`` when ``If-None-Match``
+        matches, and returning the caching headers otherwise. The headers are
+        also set on the response, so endpoints returning a ``Response``
+        directly must pass them along.
+
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user: CurrentUserDep,
+        data_version: Annotated[Any, Depends(version)],
+    ) -> dict[str, str]:
+        headers = check_etag(request, current_user.id, data_version)
+        response.headers.update(headers)
+        return headers
+
+    return dependency
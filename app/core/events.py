@@ -0,0 +1,160 @@
+"""Job event streaming.
+
+Job status transitions are published as ``JobEvent`` and pushed to watchers
+of the job's project, so clients do not need to poll the ``jobs`` table.
+
+Events are sent as notifications (see ``app.core.notifications``) in the
+transaction making the change, so they are only delivered once it commits,
+whichever process made it (API or standalone executor). Each API worker
+fans them out to its watchers through an in-process broker. Other databases
+have no ``NOTIFY``: events are then published to the broker of the current
+process only.
+
+Each watcher buffers a bounded number of events. A watcher too slow to keep
+up is disconnected rather than buffering without limit; clients reconnect
+and get the current state of the project's jobs again.
+"""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from . import metrics, notifications
+from .logging import get_logger
+from .settings import settings
+from app.schemas.job import JobEvent
+
+logger = get_logger(__name__)
+
+JOB_EVENTS_CHANNEL = "job_events"
+"""PostgreSQL notification channel of job events."""
+
+
+class Subscription:
+    """Bounded buffer of the events of a project, for one watcher."""
+
+    def __init__(self, project_id: str, maxsize: int) -> None:
+        """Initialize an open subscription.
+
+        Args:
+            project_id: ID of the watched project
+            maxsize: Maximum number of buffered events
+
+        """
+        self.project_id = project_id
+        self.overflowed = False
+        self._queue: asyncio.Queue[JobEvent | None] = asyncio.Queue(maxsize)
+
+    def put(self, event: JobEvent) -> bool:
+        """Buffer an event, closing the subscription if the buffer is full.
+
+        Returns:
+            Whether the event was buffered
+
+        """
+        if self.overflowed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Drop the backlog and wake the watcher up to end its stream
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+            return False
+        return True
+
+    async def get(self) -> JobEvent | None:
+        """Wait for the next event, or return None once the subscription overflowed."""
+        return await self._queue.get()
+
+
+class JobEventBroker:
+    """In-process fan-out of job events to the watchers of each project."""
+
+    def __init__(self, queue_size: int) -> None:
+        """Initialize the broker.
+
+        Args:
+            queue_size: Maximum number of events buffered per watcher
+
+        """
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self.published = 0
+        self.delivered = 0
+        self.overflowed = 0
+
+    def subscribe(self, project_id: str) -> Subscription:
+        """Start buffering the events of a project for a new watcher."""
+        subscription = Subscription(project_id, self.queue_size)
+        self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop buffering events for a watcher."""
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.project_id]
+
+    def publish(self, event: JobEvent) -> None:
+        """Push an event to the watchers of its project.
+
+        Must be called from the event loop of the watchers.
+        """
+        self.published += 1
+        for subscription in list(self._subscriptions.get(event.project_id, ())):
+            if subscription.put(event):
+                self.delivered += 1
+            else:
+                self.overflowed += 1
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of watchers and the event counters."""
+        return {
+            "listening": notifications.listening,
+            "projects": len(self._subscriptions),
+            "watchers": sum(len(s) for s in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+        }
+
+
+job_event_broker = JobEventBroker(queue_size=settings.JOB_EVENTS_QUEUE_SIZE)
+
+metrics.register("job_events", job_event_broker.stats)
+
+
+async def publish_job_events(session: AsyncSession, events: Iterable[JobEvent]) -> None:
+    """Publish job events from the transaction of ``session``.
+
+    On PostgreSQL the events are delivered to every API worker when the
+    transaction commits, and dropped if it rolls back. Elsewhere they are
+    published to this process's watchers right away.
+    """
+    for event in events:
+        await notifications.notify(
+            session,
+            JOB_EVENTS_CHANNEL,
+            event.model_dump_json(),
+        )
+
+
+def _on_job_event(payload: str) -> None:
+    try:
+        event = JobEvent.model_validate_json(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed job event: %s", payload[:200])
+        return
+    job_event_broker.publish(event)
+
+
+notifications.on_notification(JOB_EVENTS_CHANNEL, _on_job_event)
@@ -1,5 +1,7 @@
 """Exceptions for authentication and authorization errors."""
 
+import math
+
 from fastapi import status
 from fastapi.exceptions import HTTPException
 
@@ -28,6 +30,17 @@ class UnauthorizedError(HTTPException):
         )
 
 
+class NotFoundError(HTTPException):
+    """Exception raised for resources that do not exist or are not visible."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=details,
+        )
+
+
 class MissingApiKeyError(HTTPException):
     """Exception raised for missing API key."""
 
@@ -50,3 +63,138 @@ class InvalidApiKeyError(HTTPException):
             detail="Invalid API key",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+class InvalidCursorError(HTTPException):
+    """Exception raised for malformed pagination cursors."""
+
+    def __init__(self) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+class InvalidFieldsError(HTTPException):
+    """Exception raised for unknown fields in a sparse fieldset."""
+
+    def __init__(self, fields: list[str]) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(fields)}",
+        )
+
+
+class InvalidFilterError(HTTPException):
+    """Exception raised for filter values that do not match their column."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=details,
+        )
+
+
+class NotModifiedError(HTTPException):
+    """Exception raised when a conditional request matches the current ETag."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        """Initialize the exception with a specific status code and headers."""
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+
+class RateLimitExceededError(HTTPException):
+    """Exception raised when a client exceeds its rate or concurrency limit."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize the exception with the seconds to wait before retrying."""
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+class JobBacklogFullError(HTTPException):
+    """Exception raised when a project has too many pending jobs."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize the exception with the seconds to wait before retrying."""
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many pending jobs for this project",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+class UploadConflictError(HTTPException):
+    """Exception raised when an upload cannot receive data in its current state."""
+
+    def __init__(self, details: str, offset: int | None = None) -> None:
+        """Initialize the exception with the upload's offset, if known."""
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=details,
+            headers=None if offset is None else {"Upload-Offset": str(offset)},
+        )
+
+
+class UploadTooLargeError(HTTPException):
+    """Exception raised when an upload receives more data than declared."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the exception with the declared size of the upload."""
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds its declared size of {size} bytes",
+        )
+
+
+class InvalidDatasetError(HTTPException):
+    """Exception raised for dataset files that cannot be used."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=details,
+        )
+
+
+class DatasetInUseError(HTTPException):
+    """Exception raised when deleting a dataset pipelines still use."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=details,
+        )
+
+
+class ModelUnavailableError(HTTPException):
+    """Exception raised for models that cannot be simulated in their current state."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=details,
+        )
+
+
+class InvalidScenarioError(HTTPException):
+    """Exception raised for budget scenarios that do not fit a model."""
+
+    def __init__(self, details: str) -> None:
+        """Initialize the exception with a specific status code and detail."""
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=details,
+        )
@@ -0,0 +1,49 @@
+"""Sparse fieldsets for list endpoints.
+
+Clients pass ``fields=id,name`` to receive only some fields of each item,
+which lets services select fewer columns.
+"""
+
+from collections.abc import Callable
+from typing import Annotated
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from .exceptions import InvalidFieldsError
+
+
+def sparse_fieldset(model: type[BaseModel]) -> Callable[..., tuple[str, ...]]:
+    """Build a dependency parsing the ``fields`` query parameter.
+
+    Args:
+        model: Response model whose fields may be requested
+
+    Returns:
+        A dependency returning the requested field names, in model order,
+        or every field of the model when ``fields`` is omitted
+
+    """
+    allowed = tuple(model.model_fields)
+
+    def get_fields(
+        fields: Annotated[
+            str | None,
+            Query(
+                description=(
+                    "Comma-separated list of fields to return. "
+                    f"Available fields: {', '.join(allowed)}"
+                ),
+                example="id,name",
+            ),
+        ] = None,
+    ) -> tuple[str, ...]:
+        if not fields:
+            return allowed
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = sorted(requested.difference(allowed))
+        if unknown:
+            raise InvalidFieldsError(unknown)
+        return tuple(field for field in allowed if field in requested)
+
+    return get_fields
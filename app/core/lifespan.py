@@ -0,0 +1,57 @@
+"""Application lifespan hooks.
+
+Application-scoped resources (database engines, Supabase clients) are created
+lazily on first use, so startup does not wait on them; they are released on
+shutdown. Background tasks, such as the API key filter refresh and the
+notifications listener, are started on startup and cancelled on shutdown; the
+job executor, when enabled, is drained instead. Their modules are imported
+when the application starts, not with it, so importing the application stays
+fast and this module does not depend on ``app.tasks``.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI
+
+from .db import close_supabase_clients, dispose_engines
+from .logging import get_logger
+from .settings import settings
+
+if TYPE_CHECKING:
+    from app.tasks.executor import JobExecutor
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Manage application-scoped resources."""
+    from .auth import refresh_api_key_filter
+    from .notifications import listen_notifications
+
+    tasks = [asyncio.create_task(listen_notifications())]
+    if settings.AUTH_KEY_FILTER_ENABLED:
+        tasks.append(asyncio.create_task(refresh_api_key_filter()))
+    executor: JobExecutor | None = None
+    if settings.JOB_EXECUTOR_ENABLED:
+        from app.tasks.executor import JobExecutor
+
+        executor = JobExecutor()
+        executor_task = asyncio.create_task(executor.run())
+    try:
+        yield
+    finally:
+        if executor is not None:
+            executor.stop()
+            await executor_task
+        for task in tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        close_supabase_clients()
+        await dispose_engines()
+        logger.info("🔌 Supabase clients and database pool closed")
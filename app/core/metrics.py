@@ -0,0 +1,25 @@
+"""Registry of runtime metrics exposed by the application.
+
+Components register a collector returning a dictionary of counters; the
+health router exposes all of them in a single payload.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+Collector = Callable[[], dict[str, Any]]
+
+_collectors: dict[str, Collector] = {}
+
+
+def register(name: str, collector: Collector) -> None:
+    """Register a metrics collector under the given name.
+
+    Registering a name twice replaces the previous collector.
+    """
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    """Collect metrics from every registered collector."""
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,121 @@
+"""PostgreSQL notifications between the API workers.
+
+Changes one worker makes that the others must act on (job events, new API
+keys) are sent with ``NOTIFY`` in the transaction making them, so they are
+only delivered once it commits. Each API worker holds a single ``LISTEN``
+connection for every channel with a handler, and calls the handler of the
+channel with the payload of each notification it receives, including its
+own. Other databases have no ``NOTIFY``: handlers are then called in the
+current process only, right away.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .db import connect_listener, is_postgres
+from .logging import get_logger
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = get_logger(__name__)
+
+_RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+"""Seconds to wait before reconnecting the listener, after each failure."""
+
+_handlers: dict[str, Callable[[str], None]] = {}
+_connect_callbacks: list[Callable[[], None]] = []
+
+listening = False
+"""Whether the listener of this process is connected."""
+
+
+def on_notification(channel: str, handler: Callable[[str], None]) -> None:
+    """Call ``handler`` with the payload of every notification of ``channel``.
+
+    Handlers are registered when their module is imported, before the
+    listener connects, and run in its event loop: they must not block.
+    """
+    _handlers[channel] = handler
+
+
+def on_connect(callback: Callable[[], None]) -> None:
+    """Call ``callback`` whenever the listener (re)connects.
+
+    Notifications sent while the listener was disconnected are lost, so
+    state kept up to date by them must be reset.
+    """
+    _connect_callbacks.append(callback)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """Notify every API worker from the transaction of ``session``.
+
+    On PostgreSQL the notification is delivered when the transaction
+    commits, and dropped if it rolls back. Elsewhere the handler of the
+    channel is called in this process right away.
+    """
+    if session.bind.dialect.name != "postgresql":
+        _handlers[channel](payload)
+        return
+    await session.exec(select(func.pg_notify(channel, payload)))
+
+
+def _dispatch(_connection: Any, _pid: int, channel: str, payload: str) -> None:
+    try:
+        _handlers[channel](payload)
+    except Exception:
+        logger.exception("Failed to handle a notification of %s", channel)
+
+
+async def _listen(connection: "asyncpg.Connection") -> None:
+    """Dispatch the notifications received by a connection until it is lost."""
+    global listening
+    lost = asyncio.Event()
+    connection.add_termination_listener(lambda _: lost.set())
+    for channel in _handlers:
+        await connection.add_listener(channel, _dispatch)
+    listening = True
+    for callback in _connect_callbacks:
+        callback()
+    logger.info("📡 Listening to %s", ", ".join(_handlers))
+    await lost.wait()
+    logger.warning("Notifications listener disconnected")
+
+
+async def listen_notifications() -> None:
+    """Dispatch the notifications of PostgreSQL to their handlers, until cancelled.
+
+    The listener reconnects with a growing delay when its connection is lost.
+    Notifications sent while it is disconnected are lost. Does nothing on
+    other databases.
+    """
+    global listening
+    if not is_postgres():
+        return
+
+    failures = 0
+    while True:
+        try:
+            connection = await connect_listener()
+        except Exception:
+            logger.exception("Failed to connect the notifications listener")
+        else:
+            failures = 0
+            try:
+                await _listen(connection)
+            except Exception:
+                logger.exception("Notifications listener failed")
+            finally:
+                listening = False
+                if not connection.is_closed():
+                    await connection.close()
+
+        await asyncio.sleep(
+            _RECONNECT_DELAYS[min(failures, len(_RECONNECT_DELAYS) - 1)]
+        )
+        failures += 1
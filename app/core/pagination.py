@@ -0,0 +1,67 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe strings encoding the sort key of the last item
+of a page, so the next page starts right after it without scanning the
+skipped rows.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Query
+
+from .exceptions import InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortKey = tuple[datetime, str]
+"""Sort key of a paginated item: its creation timestamp and ID."""
+
+
+@dataclass
+class Page[T]:
+    """A page of items with the cursor of the following page, if any."""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Encode a sort key into an opaque cursor."""
+    created_at, id_ = key
+    payload = json.dumps([created_at.isoformat(), id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Decode an opaque cursor into a sort key.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(id_)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError from exc
+
+
+def get_cursor(
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=(
+                "Opaque cursor returned in the X-Next-Cursor header of the "
+                "previous page. Takes precedence over offset."
+            ),
+        ),
+    ] = None,
+) -> SortKey | None:
+    """Dependency decoding the optional ``cursor`` query parameter."""
+    return decode_cursor(cursor) if cursor else None
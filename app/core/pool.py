@@ -0,0 +1,116 @@
+"""Instrumented database connection pools.
+
+The pools defined here behave like SQLAlchemy's queue pools and record how
+long checkouts wait and how often connections are opened, closed or
+invalidated, so pool exhaustion can be told apart from slow queries.
+"""
+
+import time
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from . import metrics
+
+
+class PoolMetrics:
+    """Counters describing the activity of a connection pool."""
+
+    def __init__(self) -> None:
+        """Initialize every counter to zero."""
+        self._lock = Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        """Record the time spent waiting for a connection on checkout."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def incr(self, counter: str) -> None:
+        """Increment one of the connection lifecycle counters."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class _TimedPoolMixin:
+    """Mixin timing ``_do_get``, i.e. the wait for a connection on checkout."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - start)
+
+    def recreate(self) -> Any:
+        # Keep counting across engine.dispose()
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """Queue pool recording checkout wait times."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """Asyncio-compatible queue pool recording checkout wait times."""
+
+
+def pool_stats(engine: Engine) -> dict[str, Any]:
+    """Return the live state and counters of an engine's pool."""
+    pool = engine.pool
+    pool_metrics: PoolMetrics = pool.metrics
+    checkouts = pool_metrics.checkouts
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "checkins": pool_metrics.checkins,
+        "wait_time_avg": pool_metrics.wait_time_total / checkouts if checkouts else 0.0,
+        "wait_time_max": pool_metrics.wait_time_max,
+        "connects": pool_metrics.connects,
+        "closes": pool_metrics.closes,
+        "invalidations": pool_metrics.invalidations,
+    }
+
+
+def instrument(engine: Engine, name: str) -> None:
+    """Count connection churn on an engine and register its pool metrics.
+
+    Args:
+        engine: Sync engine (or ``AsyncEngine.sync_engine``) using a timed pool
+        name: Name under which the metrics are exposed
+
+    """
+
+    def _incr(counter: str) -> Any:
+        def listener(*_: Any) -> None:
+            engine.pool.metrics.incr(counter)
+
+        return listener
+
+    event.listen(engine, "checkin", _incr("checkins"))
+    event.listen(engine, "connect", _incr("connects"))
+    event.listen(engine, "close", _incr("closes"))
+    event.listen(engine, "invalidate", _incr("invalidations"))
+    metrics.register(name, lambda: pool_stats(engine))
@@ -0,0 +1,231 @@
+"""Per API key rate limiting and concurrency caps.
+
+Requests are limited by token buckets keyed by API key and, for routes
+scoped to a project, by project. Each API key is also limited to a number of
+requests in flight, so a single integration cannot hold every worker.
+Requests over a limit get a 429 response with a ``Retry-After`` header.
+
+Buckets are only charged once the request is authenticated, and the bucket
+of a project once its owner is: invalid keys would otherwise empty the
+bucket of any project whose ID they know, and evict the buckets of valid
+keys. Invalid keys are rejected by authentication without a database lookup.
+
+The in-process backend keeps its state in memory and limits each process
+independently. Limits shared across processes only need a backend
+implementing ``RateLimitBackend``.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Annotated, Any
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+
+from . import metrics
+from .auth import hash_api_key
+from .dependencies import CurrentProjectDep, CurrentUserDep
+from .exceptions import RateLimitExceededError
+from .security import get_bearer_token
+from .settings import settings
+
+
+class RateLimitBackend(ABC):
+    """Storage interface of the rate limiter."""
+
+    @abstractmethod
+    def take(self, bucket: str, rate: float, burst: int) -> float:
+        """Take a token from a bucket.
+
+        Args:
+            bucket: Name of the bucket
+            rate: Tokens added to the bucket per second
+            burst: Capacity of the bucket
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+
+        """
+
+    @abstractmethod
+    def acquire(self, slot: str, limit: int) -> bool:
+        """Take one of the ``limit`` concurrency slots of ``slot``, if any is free."""
+
+    @abstractmethod
+    def release(self, slot: str) -> None:
+        """Give back a concurrency slot taken with ``acquire``."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]:
+        """Return backend counters."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """In-process backend keeping at most ``maxsize`` buckets.
+
+    Least recently used buckets are dropped first, which only refills them.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the backend.
+
+        Args:
+            maxsize: Maximum number of buckets kept in memory
+
+        """
+        self.maxsize = maxsize
+        # Bucket name to [tokens, last refill time]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._slots: dict[str, int] = {}
+        self._lock = Lock()
+
+    def take(self, bucket: str, rate: float, burst: int) -> float:
+        """Take a token from a bucket, refilled at ``rate`` tokens per second."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._buckets.get(bucket)
+            if state is None:
+                state = self._buckets[bucket] = [float(burst), now]
+                if len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(bucket)
+                state[0] = min(burst, state[0] + (now - state[1]) * rate)
+                state[1] = now
+            if state[0] >= 1:
+                state[0] -= 1
+                return 0.0
+            return (1 - state[0]) / rate
+
+    def acquire(self, slot: str, limit: int) -> bool:
+        """Take one of the ``limit`` concurrency slots of ``slot``, if any is free."""
+        with self._lock:
+            in_flight = self._slots.get(slot, 0)
+            if in_flight >= limit:
+                return False
+            self._slots[slot] = in_flight + 1
+            return True
+
+    def release(self, slot: str) -> None:
+        """Give back a concurrency slot taken with ``acquire``."""
+        with self._lock:
+            in_flight = self._slots.pop(slot, 0) - 1
+            if in_flight > 0:
+                self._slots[slot] = in_flight
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of buckets and of requests in flight."""
+        return {
+            "buckets": len(self._buckets),
+            "in_flight": sum(self._slots.values()),
+        }
+
+
+class RateLimiter:
+    """Rate limiter keyed by API key and project."""
+
+    def __init__(self, backend: RateLimitBackend, *, enabled: bool = True) -> None:
+        """Initialize the limiter with a storage backend."""
+        self.backend = backend
+        self.enabled = enabled
+        self.allowed = 0
+        self.limited = 0
+        self.saturated = 0
+
+    def check(self, key_hash: str) -> None:
+        """Take a token from the bucket of an API key.
+
+        Raises:
+            RateLimitExceededError: If the bucket is empty
+
+        """
+        self._take(
+            f"key:{key_hash}",
+            settings.RATE_LIMIT_KEY_RATE,
+            settings.RATE_LIMIT_KEY_BURST,
+        )
+
+    def check_project(self, project_id: str) -> None:
+        """Take a token from the bucket of a project.
+
+        Raises:
+            RateLimitExceededError: If the bucket is empty
+
+        """
+        self._take(
+            f"project:{project_id}",
+            settings.RATE_LIMIT_PROJECT_RATE,
+            settings.RATE_LIMIT_PROJECT_BURST,
+        )
+
+    def _take(self, bucket: str, rate: float, burst: int) -> None:
+        retry_after = self.backend.take(bucket, rate, burst)
+        if retry_after:
+            self.limited += 1
+            raise RateLimitExceededError(retry_after)
+        self.allowed += 1
+
+    @contextmanager
+    def concurrency(self, key_hash: str) -> Iterator[None]:
+        """Hold one of the concurrency slots of an API key.
+
+        Raises:
+            RateLimitExceededError: If every slot is taken
+
+        """
+        slot = f"key:{key_hash}"
+        if not self.backend.acquire(slot, settings.RATE_LIMIT_KEY_CONCURRENCY):
+            self.saturated += 1
+            raise RateLimitExceededError(retry_after=1)
+        try:
+            yield
+        finally:
+            self.backend.release(slot)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the limiter and backend counters."""
+        return {
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "saturated": self.saturated,
+            **self.backend.stats(),
+        }
+
+
+rate_limiter = RateLimiter(
+    MemoryRateLimitBackend(maxsize=settings.RATE_LIMIT_MAXSIZE),
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
+
+metrics.register("rate_limit", rate_limiter.stats)
+
+
+async def rate_limit(
+    key: Annotated[HTTPAuthorizationCredentials, Depends(get_bearer_token)],
+    current_user: CurrentUserDep,
+) -> AsyncIterator[None]:
+    """Dependency limiting the rate and concurrency of requests per API key.
+
+    Requests are authenticated first, so only valid API keys are charged.
+    """
+    if not rate_limiter.enabled:
+        yield
+        return
+
+    key_hash = hash_api_key(key.credentials)
+    rate_limiter.check(key_hash)
+    with rate_limiter.concurrency(key_hash):
+        yield
+
+
+async def rate_limit_project(project: CurrentProjectDep) -> None:
+    """Dependency limiting the rate of requests per project.
+
+    Only requests of the owner of the project are charged.
+    """
+    if rate_limiter.enabled:
+        rate_limiter.check_project(project.id)
@@ -0,0 +1,271 @@
+"""Read-through cache of GET responses.
+
+Responses are cached per user, route and query parameters. Each user has a
+generation number per namespace (e.g. ``projects``) that is part of the cache
+key; writes bump it, so stale entries are never served again and age out of
+the backend. Routes consult the cache before anything else, so hits skip
+every query, including the version query of their ETag, which is cached
+with the response.
+
+The in-memory backend is bounded in size, generations included, and kept by
+each worker. Writes bump the generation of their worker after they commit,
+and of every other worker by notification (see ``app.core.notifications``),
+so reads are fresh whichever worker serves them. On PostgreSQL, the cache is
+bypassed while the notifications listener is disconnected and cleared when
+it reconnects, as invalidations may have been missed. Other databases have
+no ``NOTIFY``: with them, the cache must be disabled when running several
+workers. Backends for a shared store only need to implement
+``CacheBackend``.
+"""
+
+import itertools
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from . import metrics, notifications
+from .cache import TTLCache
+from .db import is_postgres
+from .settings import settings
+
+RESPONSE_CACHE_CHANNEL = "response_cache"
+"""Notification channel of the namespaces to invalidate."""
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """A response stored in the cache."""
+
+    body: bytes
+    status_code: int
+    media_type: str | None
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def to_response(self) -> Response:
+        """Rebuild a response from the cached entry."""
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers=self.headers,
+        )
+
+
+class CacheBackend(ABC):
+    """Storage interface of the response cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the response cached under ``key``, if any."""
+
+    @abstractmethod
+    def set(self, key: str, value: CachedResponse) -> None:
+        """Cache a response under ``key``."""
+
+    @abstractmethod
+    def generation(self, namespace: str) -> int:
+        """Return the current generation of a namespace."""
+
+    @abstractmethod
+    def bump(self, namespace: str) -> int:
+        """Increment the generation of a namespace, invalidating its entries."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every cached response."""
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]:
+        """Return backend counters."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process, size-bounded LRU backend with per-entry TTL.
+
+    Generations are drawn from a single increasing counter, and at most
+    ``maxsize`` of them are kept. Namespaces without a generation share the
+    highest generation dropped so far, so dropping one never makes stale
+    entries current again.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize the backend.
+
+        Args:
+            maxsize: Maximum number of cached responses, and of generations
+            ttl: Seconds a response stays cached
+
+        """
+        self.maxsize = maxsize
+        self._entries: TTLCache[CachedResponse] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._dropped_generation = 0
+        self._counter = itertools.count(1)
+        self._lock = Lock()
+        self.invalidations = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the response cached under ``key``, if any."""
+        return self._entries.get(key)
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        """Cache a response under ``key``."""
+        self._entries.set(key, value)
+
+    def generation(self, namespace: str) -> int:
+        """Return the current generation of a namespace."""
+        return self._generations.get(namespace, self._dropped_generation)
+
+    def bump(self, namespace: str) -> int:
+        """Move a namespace to a new generation, invalidating its entries."""
+        with self._lock:
+            generation = next(self._counter)
+            self._generations[namespace] = generation
+            self._generations.move_to_end(namespace)
+            if len(self._generations) > self.maxsize:
+                _, dropped = self._generations.popitem(last=False)
+                self._dropped_generation = max(self._dropped_generation, dropped)
+            self.invalidations += 1
+        return generation
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return backend counters."""
+        return {
+            **self._entries.stats(),
+            "generations": len(self._generations),
+            "invalidations": self.invalidations,
+        }
+
+
+class ResponseCache:
+    """Response cache keyed by user, namespace, route and query parameters."""
+
+    def __init__(self, backend: CacheBackend, *, enabled: bool = True) -> None:
+        """Initialize the cache with a storage backend."""
+        self.backend = backend
+        self.enabled = enabled
+        self._shared: bool | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether responses can be served from and stored in the cache.
+
+        On PostgreSQL, only while invalidations are received from every worker.
+        """
+        if not self.enabled:
+            return False
+        if self._shared is None:
+            self._shared = is_postgres()
+        return notifications.listening or not self._shared
+
+    @staticmethod
+    def _namespace(namespace: str, user_id: str) -> str:
+        return f"{namespace}:{user_id}"
+
+    def invalidate(self, namespace: str, user_id: str) -> None:
+        """Invalidate every cached response of a user in a namespace, in this worker.
+
+        Called once the write committed, so the next read of its user is fresh
+        even before the notification of ``notify_invalidation`` is received.
+        """
+        self.backend.bump(self._namespace(namespace, user_id))
+
+    async def notify_invalidation(
+        self,
+        session: AsyncSession,
+        namespace: str,
+        user_id: str,
+    ) -> None:
+        """Invalidate a namespace of a user in every worker once ``session`` commits."""
+        await notifications.notify(
+            session,
+            RESPONSE_CACHE_CHANNEL,
+            self._namespace(namespace, user_id),
+        )
+
+    def key(self, namespace: str, user_id: str, request: Request) -> str:
+        """Build the cache key of a request."""
+        scoped = self._namespace(namespace, user_id)
+        generation = self.backend.generation(scoped)
+        query = sorted(request.query_params.multi_items())
+        return f"{scoped}:{generation}:{request.url.path}:{query}"
+
+
+response_cache = ResponseCache(
+    MemoryCacheBackend(
+        maxsize=settings.RESPONSE_CACHE_MAXSIZE,
+        ttl=settings.RESPONSE_CACHE_TTL,
+    ),
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+metrics.register("response_cache", lambda: response_cache.backend.stats())
+notifications.on_notification(
+    RESPONSE_CACHE_CHANNEL,
+    lambda namespace: response_cache.backend.bump(namespace),
+)
+notifications.on_connect(lambda: response_cache.backend.clear())
+
+
+class CachedRoute:
+    """Cache lookup and storage for one request, as returned by ``cached``."""
+
+    def __init__(self, cache: ResponseCache, key: str) -> None:
+        """Bind the cache to the key of the current request."""
+        self.cache = cache
+        self.key = key
+
+    def get(self) -> Response | None:
+        """Return the cached response, if any."""
+        if not self.cache.active:
+            return None
+        cached = self.cache.backend.get(self.key)
+        return cached.to_response() if cached else None
+
+    def store(self, response: Response) -> Response:
+        """Cache a successful response and return it unchanged."""
+        if self.cache.active and response.status_code == status.HTTP_200_OK:
+            self.cache.backend.set(
+                self.key,
+                CachedResponse(
+                    body=bytes(response.body),
+                    status_code=response.status_code,
+                    media_type=response.media_type,
+                    headers={
+                        name: value
+                        for name, value in response.headers.items()
+                        if name not in {"content-length", "content-type"}
+                    },
+                ),
+            )
+        return response
+
+
+def cached(namespace: str) -> Callable[..., CachedRoute]:
+    """Build a dependency giving access to the response cache of a route.
+
+    Args:
+        namespace: Namespace invalidated by writes to the underlying data
+
+    """
+    # Imported here as services, which depend on this module, are themselves
+    # imported by the dependencies module
+    from .dependencies import CurrentUserDep
+
+    def dependency(request: Request, current_user: CurrentUserDep) -> CachedRoute:
+        return CachedRoute(
+            response_cache,
+            response_cache.key(namespace, current_user.id, request),
+        )
+
+    return dependency
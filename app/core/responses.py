@@ -0,0 +1,36 @@
+"""Response classes for the application.
+
+``FastJSONResponse`` renders JSON with orjson. It is the default response
+class of the application, and list endpoints returning data already shaped
+like their response model return it directly, which skips FastAPI's
+response model validation.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects orjson does not support natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Supports dicts, lists, dataclasses, datetimes, UUIDs, NumPy arrays and
+    Pydantic models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Render the content to JSON bytes."""
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -9,11 +9,11 @@ import tomllib
 from enum import Enum
 from pathlib import Path
 
-from pydantic import SecretStr
+from pydantic import SecretStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Read version from pyproject.toml
-with Path.open("pyproject.toml", "rb") as f:
+# Read version from pyproject.toml, wherever the application is started from
+with (Path(__file__).resolve().parents[2] / "pyproject.toml").open("rb") as f:
     pyproject = tomllib.load(f)
     version = pyproject["project"]["version"]
 
@@ -47,17 +47,186 @@ class Settings(BaseSettings):
     DESCRIPTION: str = DESCRIPTION
 
     DATABASE_URL: SecretStr
+    DATABASE_LISTEN_URL: SecretStr | None = None
+    """Direct connection string for ``LISTEN``, bypassing any pooler.
+
+    Defaults to ``DATABASE_URL``; required when ``DB_POOLER`` is set, as
+    ``LISTEN`` does not survive transaction pooling.
+    """
+
+    # Database connection pool settings
+    DB_POOL_SIZE: int = 5
+    """Number of connections kept open in the pool."""
+    DB_MAX_OVERFLOW: int = 10
+    """Number of connections allowed beyond ``DB_POOL_SIZE``."""
+    DB_POOL_TIMEOUT: float = 30.0
+    """Seconds to wait for a connection before giving up."""
+    DB_POOL_RECYCLE: int = 1800
+    """Seconds after which a connection is replaced (-1 to disable)."""
+    DB_POOL_PRE_PING: bool = True
+    """Whether to test connections for liveness on checkout."""
+    DB_POOLER: bool = False
+    """Whether ``DATABASE_URL`` goes through a transaction pooler like PgBouncer.
+
+    Disables the prepared statement caches of asyncpg, whose statements do
+    not survive transaction pooling.
+    """
 
     # Supabase settings
     SUPABASE_URL: SecretStr
     SUPABASE_KEY: SecretStr
     SUPABASE_SERVICE_ROLE_KEY: SecretStr
 
+    # Supabase HTTP connection pool settings
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 100
+    """Maximum number of concurrent connections to Supabase."""
+    SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    """Maximum number of idle connections kept alive."""
+    SUPABASE_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    """Seconds an idle connection is kept alive."""
+    SUPABASE_HTTP_TIMEOUT: float = 10.0
+    """Timeout of requests to Supabase, in seconds."""
+
+    # Authentication settings
+    AUTH_SECRET: SecretStr
+    """Secret keying the hashes under which API keys are stored."""
+    AUTH_SUPABASE_FALLBACK: bool = True
+    """Whether API keys unknown locally are looked up in Supabase."""
+    AUTH_KEY_FILTER_ENABLED: bool = True
+    """Whether unknown API keys are rejected by a Bloom filter before lookup."""
+    AUTH_KEY_FILTER_ERROR_RATE: float = 0.001
+    """Target false positive rate of the API key filter."""
+    AUTH_KEY_FILTER_REBUILD_INTERVAL: float = 3600.0
+    """Seconds between rebuilds of the API key filter, which drop revoked keys."""
+    AUTH_KEY_FILTER_SYNC_INTERVAL: float = 10.0
+    """Seconds between syncs of the API key filter with new keys.
+
+    Keys created through the API are added to the filter of every worker on
+    commit; keys created elsewhere, such as in Supabase, are rejected until
+    the next sync.
+    """
+
+    # Authentication cache settings
+    AUTH_CACHE_MAXSIZE: int = 10_000
+    """Maximum number of API keys kept in the authentication cache."""
+    AUTH_CACHE_TTL: float = 60.0
+    """Seconds a resolved API key stays cached."""
+    AUTH_CACHE_NEGATIVE_TTL: float = 5.0
+    """Seconds an unknown API key stays cached as invalid."""
+
+    # Rate limiting settings
+    RATE_LIMIT_ENABLED: bool = True
+    """Whether requests are rate limited per API key and project."""
+    RATE_LIMIT_KEY_RATE: float = 10.0
+    """Sustained requests per second allowed per API key."""
+    RATE_LIMIT_KEY_BURST: int = 20
+    """Requests an API key can make in a burst."""
+    RATE_LIMIT_PROJECT_RATE: float = 50.0
+    """Sustained requests per second allowed per project."""
+    RATE_LIMIT_PROJECT_BURST: int = 100
+    """Requests a project can receive in a burst."""
+    RATE_LIMIT_KEY_CONCURRENCY: int = 8
+    """Maximum number of requests in flight per API key."""
+    RATE_LIMIT_MAXSIZE: int = 100_000
+    """Maximum number of rate limit buckets kept in memory."""
+
+    # Job executor settings
+    JOB_EXECUTOR_ENABLED: bool = False
+    """Whether the API process also runs pipeline jobs.
+
+    Jobs can instead run on dedicated workers with ``python -m app.tasks``.
+    """
+    JOB_EXECUTOR_MAX_WORKERS: int = 2
+    """Maximum number of jobs running at once, each in its own process."""
+    JOB_EXECUTOR_POLL_INTERVAL: float = 5.0
+    """Seconds between polls of the jobs table when idle."""
+    JOB_EXECUTOR_DRAIN_TIMEOUT: float = 300.0
+    """Seconds to wait for running jobs on shutdown before requeuing them."""
+    JOB_HEARTBEAT_INTERVAL: float = 30.0
+    """Seconds between heartbeats of the jobs an executor is running."""
+    JOB_LEASE_TIMEOUT: float = 120.0
+    """Seconds without heartbeat after which a running job is put back to pending.
+
+    Jobs of crashed executors would otherwise stay running forever.
+    """
+    JOB_MAX_RETRIES: int = 2
+    """Times a job is put back to pending after its worker process died.
+
+    Jobs whose worker dies once more fail, so a job that always kills its
+    worker, by running out of memory for instance, does not run forever.
+    """
+    JOB_MAX_RUNNING_PER_PROJECT: int = 2
+    """Maximum number of jobs of a project running at once."""
+    JOB_MAX_PENDING_PER_PROJECT: int = 100
+    """Pending jobs of a project above which submissions are rejected."""
+    JOB_PROJECT_WEIGHTS: dict[str, float] = {}
+    """Share of the workers of each project relative to others (default: 1)."""
+    JOB_ARTIFACTS_DIR: str = "artifacts"
+    """Directory where fitted models are written."""
+    JOB_EVENTS_QUEUE_SIZE: int = 100
+    """Job events buffered per watcher before it is disconnected as too slow."""
+    JOB_EVENTS_KEEPALIVE: float = 15.0
+    """Seconds between keep-alive comments on idle job event streams."""
+
+    # Storage settings
+    STORAGE_DIR: str = "data"
+    """Directory of the local blob storage holding dataset files."""
+    UPLOAD_MAX_SIZE: int = 2 * 1024**3
+    """Maximum size of an uploaded dataset file, in bytes."""
+    UPLOAD_BUFFER_SIZE: int = 1024**2
+    """Bytes of an upload buffered in memory before being written to storage."""
+    UPLOAD_HEADER_MAX_SIZE: int = 64 * 1024
+    """Maximum size of the header row of an uploaded CSV file, in bytes."""
+    ARTIFACT_CACHE_DIR: str = "cache/artifacts"
+    """Directory of the local cache of model artifacts."""
+    ARTIFACT_CACHE_MAX_SIZE: int = 10 * 1024**3
+    """Maximum total size of the cached model artifacts, in bytes."""
+    DATASET_CHUNK_SIZE: int = 16 * 1024**2
+    """Average size, in CSV, of the rows of each Parquet chunk of datasets, in bytes.
+
+    Each chunk is a row group: smaller chunks are shared more often by similar
+    files, larger ones are faster to read.
+    """
+    DATASET_PREVIEW_MAX_ROWS: int = 1_000
+    """Maximum number of rows returned by a dataset preview."""
+    DATASET_ROWS_MAX_LIMIT: int = 50_000
+    """Maximum number of rows of a streamed window of dataset rows."""
+
+    # Simulation settings
+    MODEL_REGISTRY_SIZE: int = 32
+    """Maximum number of deployed models kept in memory for simulations."""
+    SIMULATION_MAX_SCENARIOS: int = 10_000
+    """Maximum number of budget scenarios of a simulation request."""
+    SIMULATION_MAX_SAMPLES: int = 1_000
+    """Posterior samples kept in the response curves of a fitted model."""
+    SIMULATION_BLOCK_ELEMENTS: int = 4 * 1024**2
+    """Scenario samples evaluated at once, to bound the memory of a simulation."""
+
+    # Response cache settings
+    RESPONSE_CACHE_ENABLED: bool = True
+    """Whether GET responses are cached per user.
+
+    Disable it when running several workers on a database other than
+    PostgreSQL, which cannot notify them of invalidations.
+    """
+    RESPONSE_CACHE_MAXSIZE: int = 5_000
+    """Maximum number of responses kept in the cache."""
+    RESPONSE_CACHE_TTL: float = 30.0
+    """Seconds a response stays cached."""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         use_enum_values=True,
     )
 
+    @model_validator(mode="after")
+    def _require_listen_url(self) -> "Settings":
+        """Require a direct connection for ``LISTEN`` behind a pooler."""
+        if self.DB_POOLER and self.DATABASE_LISTEN_URL is None:
+            msg = "DATABASE_LISTEN_URL is required when DB_POOLER is set"
+            raise ValueError(msg)
+        return self
+
     def is_prod(self) -> bool:
         """Check if the application is running in production environment."""
         return self.ENV == Env.PROD
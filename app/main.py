@@ -6,6 +6,8 @@ security configurations, and API routers.
 
 from fastapi import FastAPI
 
+from .core.lifespan import lifespan
+from .core.responses import FastJSONResponse
 from .core.settings import settings
 from .routers.health import router as health_router
 from .routers.v1 import router as v1_router
@@ -20,6 +22,8 @@ app = FastAPI(
     ),
     version=settings.VERSION,
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     servers=[
         {
             "url": "https://baynext-api.onrender.com",
@@ -1,9 +1,11 @@
 """SQLModel database models for Baynext API."""
 
+from .key import Key
 from .project import Project
 from .user import User
 
 __all__ = [
+    "Key",
     "Project",
     "User",
 ]
@@ -16,7 +16,7 @@ class TimestampMixin:
     )
     updated_at: datetime | None = Field(
         default=None,
-        sa_column_kwargs={"onupdate": datetime.now(UTC)},
+        sa_column_kwargs={"onupdate": lambda: datetime.now(UTC)},
         alias="updatedAt",
     )
 
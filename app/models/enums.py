@@ -9,3 +9,11 @@ class ProjectStatus(str, Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
     COMPLETED = "completed"
+
+
+class BatchItemStatus(str, Enum):
+    """Enumeration for the outcome of one item of a batch operation."""
+
+    CREATED = "created"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
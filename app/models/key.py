@@ -1,6 +1,5 @@
 """API Key schema for database operations and API responses."""
 
-import secrets
 import uuid
 from datetime import UTC, datetime, timedelta
 
@@ -47,8 +46,7 @@ class Key(KeyBase, table=True):
         description="ID of the project that owns this API key",
     )
     key: str = Field(
-        default_factory=lambda: f"byn_{secrets.token_urlsafe(32)}",
-        description="Hashed version of the API key for security",
+        description="Keyed hash of the API key, see ``app.core.auth``",
         index=True,
     )
     is_active: bool = Field(
@@ -72,7 +70,7 @@ class Key(KeyBase, table=True):
         """Check if the API key has expired."""
         if self.expires_at is None:
             return False
-        return datetime.now(datetime.UTC) > self.expires_at
+        return datetime.now(UTC) > self.expires_at
 
     @property
     def is_valid(self) -> bool:
@@ -118,7 +116,7 @@ class KeyPublic(SQLModel):
         """Check if the API key has expired."""
         if self.expires_at is None:
             return False
-        return datetime.now(datetime.UTC) > self.expires_at
+        return datetime.now(UTC) > self.expires_at
 
 
 class KeyResponse(KeyPublic):
@@ -164,7 +162,7 @@ class KeyCreateRequest(SQLModel):
         """Convert to KeyCreate with calculated expiration date."""
         expires_at = None
         if self.expires_in_days:
-            expires_at = datetime.now(datetime.UTC) + timedelta(
+            expires_at = datetime.now(UTC) + timedelta(
                 days=self.expires_in_days,
             )
 
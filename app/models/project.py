@@ -4,9 +4,11 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pydantic import field_validator
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from .base import TimestampMixin, UUIDMixin
+from .enums import BatchItemStatus
 
 if TYPE_CHECKING:
     from .user import User
@@ -14,6 +16,7 @@ if TYPE_CHECKING:
 DESCRIPTION_MAX_LENGTH = 1000
 PROJECT_NAME_MIN_LENGTH = 3
 PROJECT_NAME_MAX_LENGTH = 200
+PROJECT_BATCH_MAX_SIZE = 100
 
 
 class ProjectBase(SQLModel):
@@ -30,6 +33,10 @@ class Project(ProjectBase, UUIDMixin, TimestampMixin, table=True):
     """Project model with SQLModel."""
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # Serves keyset pagination of a user's projects
+        Index("ix_projects_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     slug: str = Field(max_length=200, index=True)
     """Slug for the project."""
@@ -96,3 +103,27 @@ class ProjectPublic(ProjectCreated):
     owner_id: str
     created_at: datetime
     updated_at: datetime | None
+
+
+class ProjectBatchCreate(SQLModel):
+    """Batch project creation model for API requests."""
+
+    projects: list[ProjectCreate] = Field(
+        min_length=1,
+        max_length=PROJECT_BATCH_MAX_SIZE,
+    )
+
+
+class ProjectBatchDelete(SQLModel):
+    """Batch project deletion model for API requests."""
+
+    ids: list[str] = Field(min_length=1, max_length=PROJECT_BATCH_MAX_SIZE)
+
+
+class ProjectBatchResult(SQLModel):
+    """Outcome of one item of a batch operation."""
+
+    index: int
+    """Position of the item in the request."""
+    id: str
+    status: BatchItemStatus
@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter
 
+from app.core.metrics import collect
+
 router = APIRouter(
     prefix="/health",
     tags=["health"],
@@ -16,3 +18,12 @@ async def health_check() -> dict:
     Returns the health status of the service.
     """
     return {"status": "healthy"}
+
+
+@router.get("/metrics")
+async def metrics() -> dict:
+    """Runtime metrics endpoint.
+
+    Returns the counters of caches, pools and other in-process components.
+    """
+    return collect()
@@ -1,10 +1,11 @@
 """API v1 module."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from . import projects, user
+from app.core.rate_limit import rate_limit
 
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", dependencies=[Depends(rate_limit)])
 
 router.include_router(projects.router)
 router.include_router(user.router)
@@ -3,12 +3,19 @@
 This module defines the API endpoints for managing resources related to a specific project.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from .base import router as base_router
+from .datasets import router as datasets_router
+from .jobs import router as jobs_router
+from .models import router as models_router
+from app.core.rate_limit import rate_limit_project
 
-router = APIRouter(prefix="/{project_id}")
+router = APIRouter(prefix="/{project_id}", dependencies=[Depends(rate_limit_project)])
 router.include_router(base_router)
+router.include_router(datasets_router)
+router.include_router(jobs_router)
+router.include_router(models_router)
 
 for route in router.routes:
     route.path = route.path.rstrip("/")
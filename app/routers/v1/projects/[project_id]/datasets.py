@@ -0,0 +1,287 @@
+"""Endpoints for dataset management.
+
+Dataset files are uploaded in resumable parts: an upload is started with the
+size of the file, then its bytes are sent with one or more ``PATCH``
+requests, each starting at the number of bytes received so far. The dataset
+is created when the last byte is received, along with a Parquet copy, in
+chunks shared between similar files, that previews, profiles and jobs read
+from.
+"""
+
+from collections.abc import Iterator
+from datetime import date
+from typing import TYPE_CHECKING, Annotated
+
+import orjson
+from fastapi import APIRouter, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import AsyncSessionDep, CurrentProjectDep, StorageDep
+from app.core.settings import settings
+from app.schemas.dataset import (
+    DatasetPreview,
+    DatasetPublic,
+    DatasetUploadCreate,
+    DatasetUploadPublic,
+)
+from app.schemas.profile import DatasetProfile, ModelSpecCheck
+from app.services.dataset import AsyncDatasetService, AsyncDatasetUploadService
+from app.validations.model_spec import ModelSpec
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+router = APIRouter(tags=["Dataset"], prefix="/datasets")
+
+
+@router.post(
+    "/uploads",
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a dataset upload",
+)
+async def create_upload(
+    project: CurrentProjectDep,
+    upload_data: DatasetUploadCreate,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+) -> DatasetUploadPublic:
+    """Start the upload of a CSV dataset file of a known size.
+
+    If ``sha256`` is given, the file is checked against it once complete.
+    """
+    return await AsyncDatasetUploadService(session, storage).create(
+        upload_data,
+        project_id=project.id,
+    )
+
+
+@router.get(
+    "/uploads/{upload_id}",
+    summary="Get a dataset upload",
+)
+async def get_upload(
+    project: CurrentProjectDep,
+    upload_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+) -> DatasetUploadPublic:
+    """Get an upload and the number of bytes received, to resume it."""
+    return await AsyncDatasetUploadService(session, storage).get(
+        upload_id,
+        project_id=project.id,
+    )
+
+
+@router.patch(
+    "/uploads/{upload_id}",
+    summary="Upload a part of a dataset file",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/offset+octet-stream": {
+                    "schema": {"type": "string", "format": "binary"},
+                },
+            },
+        },
+    },
+)
+async def upload_part(
+    project: CurrentProjectDep,
+    upload_id: str,
+    upload_offset: Annotated[int, Header(ge=0)],
+    request: Request,
+    response: Response,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+    upload_checksum: Annotated[str | None, Header()] = None,
+) -> DatasetUploadPublic:
+    """Append the request body to an upload, starting at ``Upload-Offset``.
+
+    The body is streamed to storage and never held in memory as a whole.
+    ``Upload-Offset`` must be the number of bytes received so far, otherwise
+    the request gets a 409 with the current offset. An optional
+    ``Upload-Checksum: sha256 <base64 digest>`` header checks the part.
+
+    Bytes received before a connection drops are kept, unless the part had a
+    checksum: get the upload to find its offset and resume from there. The
+    first part must hold the header row of the file, which is validated
+    before anything is stored. The dataset is created with the last byte.
+    """
+    upload = await AsyncDatasetUploadService(session, storage).append(
+        upload_id,
+        project_id=project.id,
+        offset=upload_offset,
+        body=request.stream(),
+        checksum=upload_checksum,
+    )
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return upload
+
+
+@router.get(
+    "/{dataset_id}",
+    summary="Get a dataset",
+)
+async def get_dataset(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+) -> DatasetPublic:
+    """Get a dataset, with its number of rows and the statistics of its columns."""
+    return await AsyncDatasetService(session, storage).get(
+        dataset_id,
+        project_id=project.id,
+    )
+
+
+@router.delete(
+    "/{dataset_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a dataset",
+)
+async def delete_dataset(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+) -> None:
+    """Delete a dataset that no pipeline uses.
+
+    Its stored file is deleted along with the last dataset of the same content.
+    """
+    await AsyncDatasetService(session, storage).delete(
+        dataset_id,
+        project_id=project.id,
+    )
+
+
+@router.get(
+    "/{dataset_id}/preview",
+    summary="Preview a dataset",
+)
+async def preview_dataset(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+    limit: Annotated[int, Query(ge=1, le=settings.DATASET_PREVIEW_MAX_ROWS)] = 100,
+    columns: Annotated[list[str] | None, Query()] = None,
+) -> DatasetPreview:
+    """Get the first rows of a dataset, optionally of some of its columns only."""
+    return await AsyncDatasetService(session, storage).preview(
+        dataset_id,
+        project_id=project.id,
+        limit=limit,
+        columns=columns,
+    )
+
+
+def _rows_stream(
+    columns: list[str],
+    batches: Iterator["pa.RecordBatch"],
+) -> Iterator[bytes]:
+    """Render batches of rows as a ``DatasetPreview`` JSON document, in chunks."""
+    yield b'{"columns":' + orjson.dumps(columns) + b',"rows":['
+    separator = b""
+    for batch in batches:
+        if batch.num_rows:
+            rows = zip(*(column.to_pylist() for column in batch.columns), strict=True)
+            yield separator + orjson.dumps(list(rows))[1:-1]
+            separator = b","
+    yield b"]}"
+
+
+@router.get(
+    "/{dataset_id}/rows",
+    response_class=StreamingResponse,
+    responses={200: {"model": DatasetPreview}},
+    summary="Read a window of dataset rows",
+)
+async def read_rows(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=settings.DATASET_ROWS_MAX_LIMIT)] = 100,
+    columns: Annotated[list[str] | None, Query()] = None,
+    geo: Annotated[list[str] | None, Query()] = None,
+    start: date | None = None,
+    end: date | None = None,
+    time_column: str | None = None,
+    geo_column: str | None = None,
+) -> StreamingResponse:
+    """Stream ``limit`` rows of a dataset from ``offset``, like a preview.
+
+    Rows can be filtered on their ``geo`` and on a ``start`` and ``end``
+    period of their time, in which case ``offset`` counts matching rows. The
+    time and geo columns default to ``time`` and ``geo``, like in profiles.
+    Only the row groups of the dataset holding the rows are read, so late
+    windows are as fast as the first one.
+    """
+    names, batches = await AsyncDatasetService(session, storage).rows(
+        dataset_id,
+        project_id=project.id,
+        offset=offset,
+        limit=limit,
+        columns=columns,
+        geos=geo,
+        start=start,
+        end=end,
+        time_column=time_column,
+        geo_column=geo_column,
+    )
+    return StreamingResponse(
+        _rows_stream(names, batches), media_type="application/json"
+    )
+
+
+@router.get(
+    "/{dataset_id}/profile",
+    summary="Profile a dataset",
+)
+async def profile_dataset(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+    time_column: str | None = None,
+    geo_column: str | None = None,
+) -> DatasetProfile:
+    """Get the statistics of the columns of a dataset and its time coverage per geo.
+
+    The time and geo columns default to ``time`` and ``geo``, when they exist.
+    Profiles are computed on first request, then served from storage.
+    """
+    return await AsyncDatasetService(session, storage).profile(
+        dataset_id,
+        project_id=project.id,
+        time_column=time_column,
+        geo_column=geo_column,
+    )
+
+
+@router.post(
+    "/{dataset_id}/validate",
+    summary="Validate a model specification against a dataset",
+)
+async def validate_model_spec(
+    project: CurrentProjectDep,
+    dataset_id: str,
+    spec: ModelSpec,
+    session: AsyncSessionDep,
+    storage: StorageDep,
+) -> ModelSpecCheck:
+    """Check a model specification fits a dataset, from the dataset's profile.
+
+    Lists missing or non-numeric columns, missing values, spend columns with
+    negative or no spend, geos not covering every period, and lags or knots
+    exceeding the number of periods.
+    """
+    return await AsyncDatasetService(session, storage).validate_model_spec(
+        dataset_id,
+        project_id=project.id,
+        spec=spec,
+    )
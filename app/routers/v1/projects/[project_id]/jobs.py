@@ -0,0 +1,103 @@
+"""Endpoints for pipeline job management."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, status
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import AsyncSessionDep, CurrentProjectDep
+from app.core.events import Subscription, job_event_broker
+from app.core.settings import settings
+from app.schemas.job import JobCreate, JobEvent, JobSubmitted
+from app.services.job import AsyncJobService
+
+router = APIRouter(tags=["Job"], prefix="/jobs")
+
+OVERFLOW_DETAIL = '{"detail":"Too slow to keep up with job events, reconnect"}'
+
+
+@router.post(
+    "/",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a pipeline job",
+)
+async def submit_job(
+    project: CurrentProjectDep,
+    job_data: JobCreate,
+    session: AsyncSessionDep,
+) -> JobSubmitted:
+    """Queue a job of one of the project's pipelines.
+
+    Jobs are started fairly across projects, and by priority class within the
+    project. The response gives the number of the project's pending jobs that will start
+    before this one. Projects with too many pending jobs get a 429 with a
+    ``Retry-After`` header.
+
+    A job identical to a job of the project that succeeded, with the same
+    dataset content, model specification and parameters, is not fitted
+    again: it succeeds at once and reuses that job's model, given in
+    ``model_id``. Set ``force`` to fit it anyway.
+    """
+    return await AsyncJobService(session).submit(job_data, project_id=project.id)
+
+
+def _sse(event: str, data: str) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _event_stream(
+    snapshot: list[JobEvent],
+    subscription: Subscription,
+) -> AsyncIterator[str]:
+    """Stream the snapshot, then the events of a subscription until it overflows."""
+    try:
+        for event in snapshot:
+            yield _sse("job", event.model_dump_json())
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(),
+                    settings.JOB_EVENTS_KEEPALIVE,
+                )
+            except TimeoutError:
+                # Keeps proxies from closing idle streams
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                yield _sse("overflow", OVERFLOW_DETAIL)
+                return
+            yield _sse("job", event.model_dump_json())
+    finally:
+        job_event_broker.unsubscribe(subscription)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    summary="Stream job events",
+)
+async def stream_job_events(
+    project: CurrentProjectDep,
+    session: AsyncSessionDep,
+) -> StreamingResponse:
+    """Stream the status transitions of the project's jobs as server-sent events.
+
+    The stream starts with a ``job`` event for each pending or running job,
+    followed by a ``job`` event for each transition as it happens. Clients
+    too slow to read their events get an ``overflow`` event and the stream
+    ends; reconnecting gives the current status of the jobs again.
+    """
+    # Subscribe before reading the snapshot so no transition is missed
+    subscription = job_event_broker.subscribe(project.id)
+    try:
+        snapshot = await AsyncJobService(session).active_events(project.id)
+    except BaseException:
+        job_event_broker.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _event_stream(snapshot, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
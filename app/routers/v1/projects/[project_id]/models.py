@@ -0,0 +1,47 @@
+"""Endpoints for the use of fitted models."""
+
+from fastapi import APIRouter
+
+from app.core.dependencies import AsyncSessionDep, CurrentProjectDep, ModelRegistryDep
+from app.core.responses import FastJSONResponse
+from app.schemas.model import SimulationRequest, SimulationResult
+from app.services.model import AsyncModelService
+
+router = APIRouter(tags=["Model"], prefix="/models")
+
+
+@router.post(
+    "/{model_id}/simulate",
+    response_model=SimulationResult,
+    summary="Simulate budget scenarios",
+)
+async def simulate_budgets(
+    project: CurrentProjectDep,
+    model_id: str,
+    request: SimulationRequest,
+    session: AsyncSessionDep,
+    registry: ModelRegistryDep,
+) -> FastJSONResponse:
+    """Get the incremental KPI and ROI of budget scenarios on a deployed model.
+
+    Each scenario gives the budget of every channel, over a period as long as
+    the one the model was fitted on, in the order of ``channels``. Outcomes
+    are computed on the response curves of the model, over its posterior
+    samples, as the mean and the 5th and 95th percentiles per scenario.
+    Budgets above the response curves, three times the historical spend of
+    a channel, are capped and flagged in ``capped``, as are budgets on a
+    channel the model was fitted without spend on.
+
+    Deployed models are kept in memory after their first simulation, and all
+    the scenarios of a request are evaluated at once: batch scenarios in as
+    few requests as possible. Percentiles are most of the work: set
+    ``intervals`` to false to only get means, an order of magnitude faster.
+    """
+    result = await AsyncModelService(session, registry).simulate(
+        model_id,
+        project_id=project.id,
+        request=request,
+    )
+    # Arrays are serialized directly instead of being validated against the
+    # response model
+    return FastJSONResponse(result)
@@ -2,11 +2,24 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Request
 
-from app.core.dependencies import CurrentUserDep, SessionDep
-from app.models.project import ProjectCreate, ProjectCreated, ProjectPublic
-from app.services import ProjectService
+from app.core.dependencies import AsyncSessionDep, CurrentUserDep
+from app.core.etag import check_etag, check_if_none_match
+from app.core.fieldsets import sparse_fieldset
+from app.core.pagination import NEXT_CURSOR_HEADER, SortKey, get_cursor
+from app.core.response_cache import CachedRoute, cached
+from app.core.responses import FastJSONResponse
+from app.models.project import (
+    ProjectBatchCreate,
+    ProjectBatchDelete,
+    ProjectBatchResult,
+    ProjectCreate,
+    ProjectCreated,
+    ProjectPublic,
+)
+from app.services import AsyncProjectService
+from app.services.project import CACHE_NAMESPACE
 
 router = APIRouter(tags=["Project"])
 
@@ -14,12 +27,15 @@ router = APIRouter(tags=["Project"])
 @router.get(
     "/",
     summary="List all projects a user is a member of",
-    response_model_exclude_none=True,
-    response_model_exclude_unset=True,
+    response_model=list[ProjectPublic],
 )
 async def list_user_projects(
     current_user: CurrentUserDep,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    request: Request,
+    cache: Annotated[CachedRoute, Depends(cached(CACHE_NAMESPACE))],
+    cursor: Annotated[SortKey | None, Depends(get_cursor)],
+    fields: Annotated[tuple[str, ...], Depends(sparse_fieldset(ProjectPublic))],
     limit: Annotated[
         int | None,
         Query(example=10, gt=0, lt=100, description="Number of projects to return"),
@@ -28,14 +44,38 @@ async def list_user_projects(
         int | None,
         Query(example=0, description="Number of projects to skip"),
     ] = None,
-) -> list[ProjectPublic]:
-    """List projects for the current authenticated user."""
-    project_service = ProjectService(session)
-    return project_service.list_user_projects(
+) -> FastJSONResponse:
+    """List projects for the current authenticated user.
+
+    Projects are ordered by creation date. When more projects are available,
+    the cursor of the next page is returned in the ``X-Next-Cursor`` header.
+    Use ``fields`` to only return some fields of each project.
+
+    Responses carry an ETag; requests with a matching ``If-None-Match`` header
+    get a 304 without listing the projects. Responses are cached per user
+    until their projects change, and cached responses, or a 304 when their
+    ETag matches, are served without querying the database.
+    """
+    if cached_response := cache.get():
+        check_if_none_match(request, cached_response.headers["ETag"])
+        return cached_response
+
+    project_service = AsyncProjectService(session)
+    version = await project_service.list_user_projects_version(current_user.id)
+    etag_headers = check_etag(request, current_user.id, version)
+    page = await project_service.list_user_projects(
         user_id=current_user.id,
         limit=limit or 100,
         offset=offset or 0,
+        after=cursor,
+        fields=fields,
     )
+    # The service returns trusted rows shaped like ProjectPublic, so they are
+    # serialized directly instead of being validated against the response model
+    headers = dict(etag_headers)
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return cache.store(FastJSONResponse(page.items, headers=headers))
 
 
 @router.post(
@@ -46,7 +86,52 @@ async def list_user_projects(
 async def create(
     current_user: CurrentUserDep,
     project_data: ProjectCreate,
-    session: SessionDep,
+    session: AsyncSessionDep,
 ) -> ProjectCreated:
     """Create a new project for the current authenticated user."""
-    return ProjectService(session).create(project_data, user_id=current_user.id)
+    return await AsyncProjectService(session).create(
+        project_data,
+        user_id=current_user.id,
+    )
+
+
+@router.post(
+    "/batch",
+    status_code=201,
+    summary="Create several projects",
+)
+async def create_many(
+    current_user: CurrentUserDep,
+    batch: ProjectBatchCreate,
+    session: AsyncSessionDep,
+) -> list[ProjectBatchResult]:
+    """Create several projects for the current authenticated user.
+
+    Projects are created in a single transaction: either all of them are
+    created or none is. The outcome of each project is returned in request
+    order.
+    """
+    return await AsyncProjectService(session).create_many(
+        batch.projects,
+        user_id=current_user.id,
+    )
+
+
+@router.post(
+    "/batch-delete",
+    summary="Delete several projects",
+)
+async def delete_many(
+    current_user: CurrentUserDep,
+    batch: ProjectBatchDelete,
+    session: AsyncSessionDep,
+) -> list[ProjectBatchResult]:
+    """Delete several projects of the current authenticated user.
+
+    Projects are deleted in a single transaction. Projects that do not exist
+    or are not owned by the user are reported as ``not_found``.
+    """
+    return await AsyncProjectService(session).delete_many(
+        batch.ids,
+        user_id=current_user.id,
+    )
@@ -1,18 +1,25 @@
 """FastAPI router for user-related endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.core.dependencies import CurrentUserDep
+from app.core.etag import conditional_get
 from app.models.user import User
 
 router = APIRouter(prefix="/me")
 
 
-@router.get("")
+def current_user_version(current_user: CurrentUserDep) -> tuple:
+    """Dependency returning the version of the current user's details."""
+    return current_user.email, current_user.updated_at
+
+
+@router.get("", dependencies=[Depends(conditional_get(current_user_version))])
 def get_current_user_details(current_user: CurrentUserDep) -> User:
     """Get the current user.
 
     This endpoint is used to retrieve the user information of the currently
-    authenticated user.
+    authenticated user. Responses carry an ETag; requests with a matching
+    ``If-None-Match`` header get a 304.
     """
     return current_user
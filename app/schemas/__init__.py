@@ -6,14 +6,12 @@ operations and API request/response models.
 
 from .dataset import Dataset
 from .job import Job
-from .key import Key
 from .model import Model
 from .pipeline import Pipeline
 
 __all__ = [
     "Dataset",
     "Job",
-    "Key",
     "Model",
     "Pipeline",
 ]
@@ -0,0 +1,171 @@
+"""Dataset schemas for database and validation."""
+
+import uuid
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, Field, Relationship, SQLModel
+
+from app.core.settings import settings
+
+if TYPE_CHECKING:
+    from .pipeline import Pipeline
+
+# Dataset IDs are plain UUIDs, see ``PipelineCreate.validate_dataset_id``
+_PREFIX = ""
+
+SHA256_PATTERN = r"^[0-9a-f]{64}$"
+
+
+class DatasetBase(SQLModel):
+    """Base dataset model for shared attributes."""
+
+    name: str = Field(min_length=1, max_length=255, description="Dataset name")
+
+
+class DatasetChunk(SQLModel, table=True):
+    """Parquet chunk of dataset contents, deleted once no content uses it."""
+
+    __tablename__ = "dataset_chunks"
+
+    id: str = Field(primary_key=True, description="SHA-256 of the chunk")
+    refs: int = Field(description="Number of contents made of the chunk")
+
+
+class DatasetContent(SQLModel, table=True):
+    """Content of dataset files, stored once whatever the number of uploads.
+
+    The file is converted to Parquet once, and kept as chunks shared with the
+    files of other contents. The content is deleted with its last dataset.
+    """
+
+    __tablename__ = "dataset_contents"
+
+    id: str = Field(primary_key=True, description="SHA-256 of the file")
+    size: int = Field(description="Size of the file, in bytes")
+    chunks: list[str] = Field(
+        sa_column=Column(JSONB),
+        description="SHA-256 of the Parquet chunks of the file, in order",
+    )
+    num_rows: int
+    columns: list[dict[str, Any]] = Field(sa_column=Column(JSONB))
+    row_group_offsets: list[int] = Field(sa_column=Column(JSONB))
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class Dataset(DatasetBase, table=True):
+    """Dataset model.
+
+    Datasets uploaded since content addressing point at their content by
+    ``sha256``, and copy the chunks and summary of the content.
+    """
+
+    __tablename__ = "datasets"
+
+    id: str = Field(
+        default_factory=lambda: f"{_PREFIX}{uuid.uuid4()!s}",
+        primary_key=True,
+    )
+    project_id: str = Field(foreign_key="projects.id", index=True)
+    uri: str | None = Field(
+        default=None,
+        description="URI of the dataset file in blob storage, in Parquet if converted",
+    )
+    chunks: list[str] | None = Field(
+        default=None,
+        sa_column=Column(JSONB),
+        description="SHA-256 of the Parquet chunks of the file, if uploaded as content",
+    )
+    source_uri: str | None = Field(
+        default=None,
+        description="URI of the file as uploaded, if converted before contents",
+    )
+    size: int | None = Field(default=None, description="Size of the file, in bytes")
+    sha256: str | None = Field(
+        default=None,
+        foreign_key="dataset_contents.id",
+        index=True,
+        description="SHA-256 of the file, the ID of its content",
+    )
+    num_rows: int | None = None
+    columns: list[dict[str, Any]] | None = Field(default=None, sa_column=Column(JSONB))
+    row_group_offsets: list[int] | None = Field(
+        default=None,
+        sa_column=Column(JSONB),
+        description="First row of each row group of the Parquet files",
+    )
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    # Relationships
+    pipelines: list["Pipeline"] | None = Relationship(back_populates="dataset")
+
+
+class ColumnSummary(SQLModel):
+    """Type and statistics of a dataset column."""
+
+    name: str
+    type: str
+    null_count: int
+    min: Any = None
+    max: Any = None
+
+
+class DatasetPublic(DatasetBase):
+    """Public dataset model for API responses."""
+
+    id: str
+    size: int | None = None
+    num_rows: int | None = None
+    columns: list[ColumnSummary] | None = None
+    created_at: datetime
+
+
+class DatasetPreview(SQLModel):
+    """First rows of a dataset."""
+
+    columns: list[str]
+    rows: list[list[Any]]
+
+
+class DatasetUploadCreate(DatasetBase):
+    """Dataset upload model for API requests."""
+
+    size: int = Field(
+        gt=0,
+        le=settings.UPLOAD_MAX_SIZE,
+        description="Size of the file, in bytes",
+    )
+    sha256: str | None = Field(
+        default=None,
+        regex=SHA256_PATTERN,
+        description="Hex SHA-256 of the file, checked once the upload is complete",
+    )
+
+
+class DatasetUpload(DatasetUploadCreate, table=True):
+    """Resumable upload of a dataset file.
+
+    Bytes received so far are kept in blob storage, which is the source of
+    truth for the upload's offset.
+    """
+
+    __tablename__ = "dataset_uploads"
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    project_id: str = Field(foreign_key="projects.id", index=True)
+    dataset_id: str | None = Field(default=None, foreign_key="datasets.id")
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class DatasetUploadPublic(DatasetBase):
+    """Public dataset upload model for API responses."""
+
+    id: str
+    size: int
+    offset: int = Field(description="Number of bytes received so far")
+    dataset_id: str | None = Field(description="ID of the dataset, once complete")
+    created_at: datetime
@@ -2,20 +2,22 @@
 # Inspiration: https://cloud.google.com/vertex-ai/docs/reference/rest/v1/projects.locations.pipelineJobs
 
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from pydantic import field_validator
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Column, Field, Relationship, SQLModel
 
-from app.validations.enums import JobStatus
+from app.validations.enums import JobPriority, JobStatus
 from app.validations.job_parameters import JobParams
 
 if TYPE_CHECKING:
     from .model import Model
     from .pipeline import Pipeline
 
+JOB_EVENT_ERROR_MAX_LENGTH = 1_000
+
 
 class Job(SQLModel, table=True):
     __tablename__ = "jobs"
@@ -26,14 +28,28 @@ class Job(SQLModel, table=True):
     # model_id: str | None = Field(default=None, foreign_key="models.id")
 
     status: JobStatus = JobStatus.pending
+    priority: JobPriority = JobPriority.normal
 
     params: JobParams = Field(sa_column=Column(JSONB))
+    fingerprint: str | None = Field(
+        default=None,
+        index=True,
+        description="Hash of the dataset content, model spec and parameters",
+    )
     # metrics: dict | None = Field(default=None, sa_column=Column(JSONB))
 
-    started_at: datetime | None = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), index=True)
+    started_at: datetime | None = None
     finished_at: datetime | None = None
+    heartbeat_at: datetime | None = Field(
+        default=None,
+        description="Last time the executor running the job showed it was alive",
+    )
 
-    # retries: int = 0
+    retries: int = Field(
+        default=0,
+        description="Times the job was put back to pending after its worker died",
+    )
     error: str | None = None
 
     # Relationships
@@ -43,3 +59,52 @@ class Job(SQLModel, table=True):
     @field_validator("params")
     def val_model_spec(cls, val):  # pylint: disable=C0116,E0213
         return val.dict()
+
+
+class JobCreate(SQLModel):
+    """Job submission model for API requests."""
+
+    pipeline_id: str
+    params: JobParams = Field(default_factory=JobParams)
+    priority: JobPriority = JobPriority.normal
+    force: bool = Field(
+        default=False,
+        description="Fit the model even if an identical job already succeeded",
+    )
+
+
+class JobSubmitted(SQLModel):
+    """Job submission model for API responses."""
+
+    id: str
+    status: JobStatus
+    priority: JobPriority
+    queue_position: int
+    """Number of pending jobs of the project that will start before this one."""
+    memoized_from: str | None = None
+    """ID of the identical succeeded job whose model the job reuses, if any."""
+    model_id: str | None = None
+    """ID of the model of the job, if reused."""
+
+
+class JobEvent(SQLModel):
+    """Status transition of a job, pushed to the watchers of its project."""
+
+    job_id: str
+    project_id: str
+    status: JobStatus
+    error: str | None = None
+    at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    @classmethod
+    def from_job(cls, job: Job, project_id: str) -> "JobEvent":
+        """Build the event of the current status of a job.
+
+        Errors are truncated, as PostgreSQL notifications are limited to 8kB.
+        """
+        return cls(
+            job_id=job.id,
+            project_id=project_id,
+            status=job.status,
+            error=job.error[:JOB_EVENT_ERROR_MAX_LENGTH] if job.error else None,
+        )
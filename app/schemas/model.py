@@ -1,11 +1,12 @@
 # app/models/model.py
 
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 
 from sqlmodel import Field, Relationship, SQLModel
 
 from .job import Job  # Avoid circular import
+from app.core.settings import settings
 
 
 class ModelBase(SQLModel):
@@ -19,9 +20,11 @@ class Model(SQLModel, table=True):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     job_id: str = Field(foreign_key="jobs.id")
     uri: str  # blob storage URI
+    sha256: str | None = None  # checksum of the artifact, to cache it
+    curves_sha256: str | None = None  # checksum of the response curves
 
     deployed: bool | None = Field(default=False)
-    created_at: datetime | None = Field(default_factory=datetime.utcnow)
+    created_at: datetime | None = Field(default_factory=lambda: datetime.now(UTC))
 
     # Relationships
     job: Job = Relationship(
@@ -40,3 +43,54 @@ class ModelPublic(ModelBase):
     id: str
     created_at: datetime
     deployed: bool
+
+
+class SimulationRequest(SQLModel):
+    """Budget scenarios to simulate on a deployed model."""
+
+    scenarios: list[list[float]] = Field(
+        min_length=1,
+        max_length=settings.SIMULATION_MAX_SCENARIOS,
+        description="Budget of each channel per scenario, over the fitted period",
+    )
+    channels: list[str] | None = Field(
+        default=None,
+        description="Channels of the budgets, in order; the model's if omitted",
+    )
+    intervals: bool = Field(
+        default=True,
+        description="Whether to compute percentiles, which are most of the work",
+    )
+
+
+class PosteriorSummary(SQLModel):
+    """Posterior mean and percentiles of a quantity, per scenario.
+
+    Percentiles are null when not requested.
+    """
+
+    mean: list[float | None]
+    p5: list[float | None]
+    p95: list[float | None]
+
+
+class SimulationResult(SQLModel):
+    """Outcome of budget scenarios, in the order of the request."""
+
+    channels: list[str]
+    incremental: PosteriorSummary
+    """Incremental KPI of the scenarios."""
+    roi: PosteriorSummary
+    """Incremental KPI per unit of total budget of the scenarios."""
+    channel_incremental: list[list[float]]
+    """Mean incremental KPI of each channel per scenario."""
+    channel_roi: list[list[float | None]]
+    """Mean ROI of each channel per scenario.
+
+    Null without budget, or for a channel without historical spend.
+    """
+    capped: list[bool]
+    """Whether a budget of the scenario exceeds the response curves, and was capped.
+
+    Any budget on a channel without historical spend exceeds its curve.
+    """
@@ -58,7 +58,7 @@ class Pipeline(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
     # Relationship
-    project: "Project" = Relationship(back_populates="pipelines")
+    project: "Project" = Relationship()
     dataset: "Dataset" = Relationship(back_populates="pipelines")
     jobs: list["Job"] | None = Relationship(back_populates="pipeline")
 
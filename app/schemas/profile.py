@@ -0,0 +1,143 @@
+"""Dataset profile schemas for database and validation."""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, Field, SQLModel
+
+from app.validations.model_spec import ModelSpec
+
+PROFILE_VERSION = 1
+"""Version of the profile format, part of the key of stored profiles."""
+
+_LISTED_GEOS = 5
+
+
+class ColumnProfile(SQLModel):
+    """Profile of a dataset column."""
+
+    name: str
+    type: str
+    numeric: bool
+    null_ratio: float = Field(description="Share of missing values")
+    min: Any = None
+    max: Any = None
+    sum: float | None = Field(default=None, description="Total, e.g. of a spend")
+    mean: float | None = None
+    std: float | None = None
+    quantiles: dict[str, float | None] | None = Field(
+        default=None,
+        description="Approximate 5th, 25th, 50th, 75th and 95th percentiles",
+    )
+
+
+class GeoCoverage(SQLModel):
+    """Periods covered by a geo."""
+
+    geo: str
+    start: Any
+    end: Any
+    periods: int
+    missing: int = Field(description="Periods of the dataset the geo has no row for")
+
+
+class TimeCoverage(SQLModel):
+    """Periods covered by a dataset."""
+
+    time_column: str
+    geo_column: str | None
+    periods: int
+    start: Any
+    end: Any
+    geos: list[GeoCoverage]
+
+
+class DatasetProfile(SQLModel):
+    """Profile of the columns of a dataset and of its time coverage."""
+
+    num_rows: int
+    columns: list[ColumnProfile]
+    time_coverage: TimeCoverage | None
+
+    def model_spec_issues(self, spec: ModelSpec) -> list[str]:
+        """List what prevents a model specification from fitting the dataset."""
+        columns = {column.name: column for column in self.columns}
+        mapping = spec.columns
+        issues = [
+            f"Column {name} does not exist"
+            for name in (
+                mapping.time,
+                mapping.geo,
+                mapping.kpi,
+                *mapping.media,
+                *mapping.media_spend,
+                *mapping.controls,
+            )
+            if name not in columns
+        ]
+
+        for name in (
+            mapping.kpi,
+            *mapping.media,
+            *mapping.media_spend,
+            *mapping.controls,
+        ):
+            column = columns.get(name)
+            if column is None:
+                continue
+            if not column.numeric:
+                issues.append(f"Column {name} is not numeric")
+            elif column.null_ratio:
+                issues.append(
+                    f"Column {name} has {column.null_ratio:.1%} missing values"
+                )
+
+        for name in mapping.media_spend:
+            column = columns.get(name)
+            if column is None or not column.numeric:
+                continue
+            if column.min is not None and column.min < 0:
+                issues.append(f"Spend column {name} has negative values")
+            if not column.sum:
+                issues.append(f"Spend column {name} has no spend")
+
+        coverage = self.time_coverage
+        if coverage is not None:
+            incomplete = [geo.geo for geo in coverage.geos if geo.missing]
+            if incomplete:
+                listed = ", ".join(incomplete[:_LISTED_GEOS])
+                more = "..." if len(incomplete) > _LISTED_GEOS else ""
+                issues.append(
+                    f"{len(incomplete)} geos do not cover every period: {listed}{more}",
+                )
+            if spec.max_lag >= coverage.periods:
+                issues.append(f"max_lag must be below the {coverage.periods} periods")
+            if spec.knots is not None and spec.knots > coverage.periods:
+                issues.append(f"knots must not exceed the {coverage.periods} periods")
+        return issues
+
+
+class StoredProfile(SQLModel, table=True):
+    """Profile of a dataset, stored by content hash.
+
+    Datasets with the same content share their profile, which is computed
+    once per version of the profile format and time and geo columns.
+    """
+
+    __tablename__ = "dataset_profiles"
+
+    content_hash: str = Field(primary_key=True)
+    version: int = Field(primary_key=True)
+    time_column: str = Field(primary_key=True, description="Empty if none")
+    geo_column: str = Field(primary_key=True, description="Empty if none")
+    profile: dict[str, Any] = Field(sa_column=Column(JSONB))
+
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class ModelSpecCheck(SQLModel):
+    """Result of the validation of a model specification against a dataset."""
+
+    valid: bool
+    issues: list[str]
@@ -1,9 +1,20 @@
 """Database services for the application."""
 
-from .project import ProjectService
-from .user import UserService
+from .dataset import AsyncDatasetService, AsyncDatasetUploadService
+from .job import AsyncJobService
+from .key import AsyncKeyService
+from .model import AsyncModelService
+from .project import AsyncProjectService, ProjectService
+from .user import AsyncUserService, UserService
 
 __all__ = [
+    "AsyncDatasetService",
+    "AsyncDatasetUploadService",
+    "AsyncJobService",
+    "AsyncKeyService",
+    "AsyncModelService",
+    "AsyncProjectService",
+    "AsyncUserService",
     "ProjectService",
     "UserService",
 ]
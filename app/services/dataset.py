@@ -0,0 +1,840 @@
+"""Dataset services for resumable dataset uploads, columnar reads and profiles.
+
+Upload bodies are streamed to blob storage in buffers of
+``UPLOAD_BUFFER_SIZE`` bytes, so memory per upload stays constant whatever
+the size of the file. The SHA-256 of the file is updated as bytes are
+written; its state is kept in memory between the requests of an upload, and
+recomputed from the stored part when an upload resumes on another worker.
+
+Complete uploads are stored by content: files with the same SHA-256 share
+their content, which is converted to Parquet once, in content-defined chunks
+that files differing by a few rows share. Datasets are read from the chunks:
+memory-mapped, with only the columns needed. Chunks count the contents made
+of them, and contents are deleted with their last dataset, along with the
+chunks no other content uses.
+
+Profiles are computed once per content hash, in a single vectorized pass,
+and stored: datasets uploaded twice, and every view and model specification
+check of a dataset, reuse them.
+"""
+
+import base64
+import hashlib
+import tempfile
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.exceptions import (
+    DatasetInUseError,
+    InvalidDatasetError,
+    InvalidFieldsError,
+    InvalidFilterError,
+    NotFoundError,
+    UploadConflictError,
+    UploadTooLargeError,
+)
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.schemas import Dataset, Pipeline
+from app.schemas.dataset import (
+    DatasetChunk,
+    DatasetContent,
+    DatasetPreview,
+    DatasetUpload,
+    DatasetUploadCreate,
+    DatasetUploadPublic,
+)
+from app.schemas.profile import (
+    PROFILE_VERSION,
+    DatasetProfile,
+    ModelSpecCheck,
+    StoredProfile,
+)
+from app.storage import BlobStorage
+from app.storage.artifacts import file_sha256
+from app.validations.dataset import parse_csv_header
+from app.validations.model_spec import ModelSpec
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from app.storage.columnar import RowFilter
+
+logger = get_logger(__name__)
+
+CHECKSUM_ALGORITHM = "sha256"
+"""Algorithm of the ``Upload-Checksum`` header of upload requests."""
+
+_HASHES_MAXSIZE = 1_000
+
+# Upload ID to (offset, SHA-256 of the part up to the offset)
+_hashes: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+
+
+def _write(
+    storage: BlobStorage,
+    upload_id: str,
+    offset: int,
+    data: bytearray,
+    *hashes: Any,
+) -> None:
+    """Write a buffer to an upload's part and add it to the hashes."""
+    storage.write_part(upload_id, offset, data)
+    for hash_ in hashes:
+        hash_.update(data)
+
+
+def _convert(
+    storage: BlobStorage,
+    source_uri: str,
+    target: Path,
+) -> tuple[list[Path], list[str], dict]:
+    """Convert a CSV dataset to Parquet chunks in a local directory.
+
+    Returns:
+        The paths and SHA-256 of the chunks, and the summary of the dataset
+
+    """
+    # pyarrow is slow to import and only needed once a dataset is complete
+    from app.storage import columnar
+
+    paths, summary = columnar.convert_csv(storage.local_path(source_uri), target)
+    return paths, [file_sha256(path) for path in paths], summary
+
+
+def _put_chunks(storage: BlobStorage, paths: list[Path], digests: list[str]) -> None:
+    """Store the chunks of a content, unless already stored."""
+    new = sum(
+        storage.put_chunk(path, digest)
+        for digest, path in dict(zip(digests, paths, strict=True)).items()
+    )
+    logger.info("📦 Stored %d chunks, %d new", len(digests), new)
+
+
+def _delete_chunks(storage: BlobStorage, digests: list[str]) -> None:
+    """Delete chunks from storage."""
+    for digest in digests:
+        storage.delete(storage.chunk_uri(digest))
+    logger.info("🗑️ Deleted %d chunks", len(digests))
+
+
+async def _reference_chunks(session: AsyncSession, digests: list[str]) -> None:
+    """Count a new content in the references of its chunks."""
+    insert_chunks = insert(DatasetChunk).values(
+        [{"id": digest, "refs": refs} for digest, refs in Counter(digests).items()],
+    )
+    await session.exec(
+        insert_chunks.on_conflict_do_update(
+            index_elements=[DatasetChunk.id],
+            set_={"refs": DatasetChunk.refs + insert_chunks.excluded.refs},
+        ),
+    )
+
+
+async def _release_chunks(session: AsyncSession, digests: list[str]) -> None:
+    """Remove a deleted content from the references of its chunks."""
+    by_refs: dict[int, list[str]] = {}
+    for digest, refs in Counter(digests).items():
+        by_refs.setdefault(refs, []).append(digest)
+    for refs, ids in by_refs.items():
+        await session.exec(
+            update(DatasetChunk)
+            .where(DatasetChunk.id.in_(ids))
+            .values(refs=DatasetChunk.refs - refs),
+        )
+
+
+def dataset_uris(storage: BlobStorage, dataset: Dataset) -> list[str]:
+    """Return the URIs of the files of a dataset: its chunks, if any."""
+    if dataset.chunks is None:
+        return [dataset.uri]
+    return [storage.chunk_uri(digest) for digest in dataset.chunks]
+
+
+def _paths(storage: BlobStorage, dataset: Dataset) -> list[Path]:
+    """Return the local paths of the files of a dataset."""
+    return [storage.local_path(uri) for uri in dataset_uris(storage, dataset)]
+
+
+def _head(paths: list[Path], limit: int, columns: list[str] | None) -> "pa.Table":
+    """Read the first rows of the files of a dataset, Parquet or CSV."""
+    from app.storage import columnar
+
+    if paths[0].suffix == ".csv":
+        return columnar.csv_head(paths[0], limit, columns)
+    return columnar.head(paths, limit, columns)
+
+
+def _rows(
+    paths: list[Path],
+    offset: int,
+    limit: int,
+    columns: list[str] | None,
+    row_filter: "RowFilter | None",
+    offsets: list[int] | None,
+) -> tuple[list[str], Iterator["pa.RecordBatch"]]:
+    """Open a window of rows of the files of a dataset, Parquet or CSV."""
+    from app.storage import columnar
+
+    if paths[0].suffix == ".csv":
+        return columnar.csv_rows(paths[0], offset, limit, columns, row_filter)
+    return columnar.iter_rows(paths, offset, limit, columns, row_filter, offsets)
+
+
+def _profile(
+    paths: list[Path],
+    time_column: str | None,
+    geo_column: str | None,
+) -> dict:
+    """Profile the files of a dataset, Parquet or CSV."""
+    from pyarrow import csv
+
+    from app.analytics.profiling import profile_table
+    from app.storage import columnar
+
+    if paths[0].suffix == ".csv":
+        table = csv.read_csv(paths[0])
+    else:
+        table = columnar.read_table(paths)
+    return profile_table(table, time_column, geo_column)
+
+
+def _hash_part(storage: BlobStorage, upload_id: str) -> Any:
+    """Compute the SHA-256 of an upload's part from storage."""
+    hash_ = hashlib.sha256()
+    for chunk in storage.read_part(upload_id, settings.UPLOAD_BUFFER_SIZE):
+        hash_.update(chunk)
+    return hash_
+
+
+class AsyncDatasetUploadService:
+    """Asynchronous service class for dataset uploads."""
+
+    def __init__(self, session: AsyncSession, storage: BlobStorage) -> None:
+        """Initialize the dataset upload service.
+
+        Args:
+            session: SQLModel async database session for operations
+            storage: Blob storage receiving the files
+
+        """
+        self.session = session
+        self.storage = storage
+
+    async def create(
+        self,
+        upload_data: DatasetUploadCreate,
+        project_id: str,
+    ) -> DatasetUploadPublic:
+        """Start the upload of a dataset file.
+
+        Args:
+            upload_data: Name, size and optional checksum of the file
+            project_id: ID of the project owning the dataset
+
+        Returns:
+            DatasetUploadPublic: The upload, with no bytes received yet
+
+        """
+        upload = DatasetUpload.model_validate(
+            upload_data,
+            update={"project_id": project_id},
+        )
+        self.session.add(upload)
+        await self.session.commit()
+        await self.session.refresh(upload)
+        logger.info("🆕 Dataset upload %s started", upload.id)
+        return self._public(upload, offset=0)
+
+    async def get(self, upload_id: str, project_id: str) -> DatasetUploadPublic:
+        """Get an upload of a project and the number of bytes received.
+
+        Raises:
+            NotFoundError: If the upload does not belong to the project
+
+        """
+        upload = await self._get_upload(upload_id, project_id)
+        if upload.dataset_id is not None:
+            return self._public(upload, offset=upload.size)
+        offset = await run_in_threadpool(self.storage.part_size, upload_id)
+        return self._public(upload, offset)
+
+    async def append(
+        self,
+        upload_id: str,
+        project_id: str,
+        offset: int,
+        body: AsyncIterator[bytes],
+        checksum: str | None = None,
+    ) -> DatasetUploadPublic:
+        """Stream a part of a file to an upload, completing it at the last byte.
+
+        Bytes received before the client disconnects are kept, so the upload
+        can resume from the returned offset, unless the part had a checksum.
+
+        Args:
+            upload_id: ID of the upload
+            project_id: ID of the project owning the upload
+            offset: Offset of the part in the file, which must be the number
+                of bytes received so far
+            body: Bytes of the part
+            checksum: ``sha256 <base64 digest>`` of the part, if any
+
+        Returns:
+            DatasetUploadPublic: The upload, with the dataset once complete
+
+        Raises:
+            NotFoundError: If the upload does not belong to the project
+            UploadConflictError: If the upload is complete, receiving another
+                part, or the offset is not the number of bytes received
+            UploadTooLargeError: If the part goes past the size of the file
+            InvalidDatasetError: If the header or a checksum is invalid
+
+        """
+        expected_digest = self._parse_checksum(checksum) if checksum else None
+        upload = await self._get_upload(upload_id, project_id)
+        # Locked in storage, as the parts of an upload may reach any worker
+        with self.storage.lock_part(upload_id) as locked:
+            if not locked:
+                raise UploadConflictError("Upload is receiving another part")
+            # The upload may have completed before the lock was acquired
+            await self.session.refresh(upload)
+            if upload.dataset_id is not None:
+                raise UploadConflictError("Upload is already complete", upload.size)
+            # Release the database connection while the body streams
+            await self.session.commit()
+
+            received = await run_in_threadpool(self.storage.part_size, upload_id)
+            if offset != received:
+                raise UploadConflictError("Offset does not match the upload", received)
+            file_hash = await self._file_hash(upload_id, received)
+            received = await self._receive(
+                upload,
+                offset,
+                body,
+                file_hash,
+                expected_digest,
+            )
+            if received < upload.size:
+                return self._public(upload, received)
+            return await self._complete(upload, file_hash)
+
+    async def _receive(
+        self,
+        upload: DatasetUpload,
+        offset: int,
+        body: AsyncIterator[bytes],
+        file_hash: Any,
+        expected_digest: bytes | None,
+    ) -> int:
+        """Write a part to storage, returning the new offset of the upload."""
+        part_hash = hashlib.sha256() if expected_digest is not None else None
+        hashes = [h for h in (file_hash, part_hash) if h is not None]
+        received = offset
+        buffer = bytearray()
+        header_pending = offset == 0
+        try:
+            async for chunk in body:
+                if received + len(buffer) + len(chunk) > upload.size:
+                    raise UploadTooLargeError(upload.size)
+                buffer += chunk
+                if header_pending:
+                    header_pending = not self._check_header(buffer, final=False)
+                if len(buffer) >= settings.UPLOAD_BUFFER_SIZE and not header_pending:
+                    await run_in_threadpool(
+                        _write, self.storage, upload.id, received, buffer, *hashes
+                    )
+                    received += len(buffer)
+                    buffer = bytearray()
+            if header_pending:
+                self._check_header(buffer, final=True)
+            if buffer:
+                await run_in_threadpool(
+                    _write, self.storage, upload.id, received, buffer, *hashes
+                )
+                received += len(buffer)
+            if part_hash is not None and part_hash.digest() != expected_digest:
+                raise InvalidDatasetError("Checksum of the part does not match")
+        except BaseException as exc:
+            if part_hash is not None or isinstance(exc, HTTPException):
+                # The part is rejected as a whole, the cached hash still
+                # matches the original offset
+                await run_in_threadpool(self.storage.truncate_part, upload.id, offset)
+                raise
+            # Bytes written before the body broke off are kept for resuming
+            self._store_hash(upload.id, received, file_hash)
+            raise
+        self._store_hash(upload.id, received, file_hash)
+        return received
+
+    async def _complete(
+        self, upload: DatasetUpload, file_hash: Any
+    ) -> DatasetUploadPublic:
+        """Check a fully received file and register its dataset."""
+        sha256 = file_hash.hexdigest()
+        _hashes.pop(upload.id, None)
+        if upload.sha256 is not None and sha256 != upload.sha256:
+            await run_in_threadpool(self.storage.truncate_part, upload.id, 0)
+            msg = "Checksum of the file does not match, upload it again"
+            raise InvalidDatasetError(msg)
+
+        # Shared lock, so the content is not deleted before the dataset is added
+        content = await self.session.get(
+            DatasetContent,
+            sha256,
+            with_for_update={"read": True},
+        )
+        if content is None:
+            content = await self._store_content(upload, sha256)
+        else:
+            await run_in_threadpool(self.storage.delete_part, upload.id)
+            logger.info("♻️ Upload %s reuses content %s", upload.id, sha256)
+
+        dataset = Dataset(
+            name=upload.name,
+            project_id=upload.project_id,
+            chunks=content.chunks,
+            size=upload.size,
+            sha256=sha256,
+            num_rows=content.num_rows,
+            columns=content.columns,
+            row_group_offsets=content.row_group_offsets,
+        )
+        upload.dataset_id = dataset.id
+        self.session.add(dataset)
+        self.session.add(upload)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            # The same content was stored concurrently, with the same chunks
+            await self.session.rollback()
+            await _release_chunks(self.session, dataset.chunks)
+            await self.session.refresh(upload)
+            upload.dataset_id = dataset.id
+            self.session.add(dataset)
+            self.session.add(upload)
+            await self.session.commit()
+        logger.info("✅ Dataset %s uploaded", dataset.id)
+        return self._public(upload, upload.size)
+
+    async def _store_content(
+        self,
+        upload: DatasetUpload,
+        sha256: str,
+    ) -> DatasetContent:
+        """Convert a new content to Parquet chunks and store them."""
+        # Uploads of the same file may complete concurrently
+        source_uri = await run_in_threadpool(
+            self.storage.commit_part,
+            upload.id,
+            f"sources/{upload.id}.csv",
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                paths, digests, summary = await run_in_threadpool(
+                    _convert,
+                    self.storage,
+                    source_uri,
+                    Path(tmp),
+                )
+                # Chunks are referenced before being stored: a deletion of
+                # their last content then either sees the reference, or
+                # deletes them before they are found missing and stored again.
+                # References of failed uploads are leaked, never missing.
+                await _reference_chunks(self.session, digests)
+                await self.session.commit()
+                await run_in_threadpool(_put_chunks, self.storage, paths, digests)
+            except ValueError as exc:
+                await run_in_threadpool(self.storage.delete, source_uri)
+                msg = f"Dataset could not be read, upload it again: {exc}"
+                raise InvalidDatasetError(msg) from exc
+            except BaseException:
+                # The file is fine: keep it, for the upload to complete again
+                await run_in_threadpool(
+                    self.storage.restore_part, upload.id, source_uri
+                )
+                raise
+        await run_in_threadpool(self.storage.delete, source_uri)
+        content = DatasetContent(
+            id=sha256,
+            size=upload.size,
+            chunks=digests,
+            num_rows=summary["num_rows"],
+            columns=summary["columns"],
+            row_group_offsets=summary["row_group_offsets"],
+        )
+        self.session.add(content)
+        return content
+
+    async def _get_upload(self, upload_id: str, project_id: str) -> DatasetUpload:
+        upload = await self.session.get(DatasetUpload, upload_id)
+        if upload is None or upload.project_id != project_id:
+            raise NotFoundError("Upload not found")
+        return upload
+
+    async def _file_hash(self, upload_id: str, offset: int) -> Any:
+        """Return a copy of the SHA-256 of an upload's part up to ``offset``."""
+        cached = _hashes.get(upload_id)
+        if cached is not None and cached[0] == offset:
+            return cached[1].copy()
+        return await run_in_threadpool(_hash_part, self.storage, upload_id)
+
+    @staticmethod
+    def _store_hash(upload_id: str, offset: int, file_hash: Any) -> None:
+        _hashes[upload_id] = (offset, file_hash)
+        _hashes.move_to_end(upload_id)
+        if len(_hashes) > _HASHES_MAXSIZE:
+            _hashes.popitem(last=False)
+
+    @staticmethod
+    def _check_header(buffer: bytearray, *, final: bool) -> bool:
+        """Validate the header row once the buffer holds it.
+
+        Returns:
+            Whether the header was found and is valid
+
+        Raises:
+            InvalidDatasetError: If the header is invalid, too long, or not
+                in the first part of the upload
+
+        """
+        end = buffer.find(b"\n", 0, settings.UPLOAD_HEADER_MAX_SIZE)
+        if end == -1:
+            if len(buffer) < settings.UPLOAD_HEADER_MAX_SIZE and not final:
+                return False
+            msg = "The first part of an upload must hold the whole header row"
+            raise InvalidDatasetError(msg)
+        try:
+            parse_csv_header(bytes(buffer[:end]))
+        except ValueError as exc:
+            raise InvalidDatasetError(str(exc)) from exc
+        return True
+
+    @staticmethod
+    def _parse_checksum(checksum: str) -> bytes:
+        """Decode a ``sha256 <base64 digest>`` checksum header."""
+        algorithm, _, digest = checksum.partition(" ")
+        if algorithm.lower() != CHECKSUM_ALGORITHM:
+            msg = f"Unsupported checksum algorithm, use {CHECKSUM_ALGORITHM}"
+            raise InvalidDatasetError(msg)
+        try:
+            return base64.b64decode(digest, validate=True)
+        except ValueError as exc:
+            msg = "Checksum must be a base64 encoded digest"
+            raise InvalidDatasetError(msg) from exc
+
+    @staticmethod
+    def _public(upload: DatasetUpload, offset: int) -> DatasetUploadPublic:
+        return DatasetUploadPublic.model_validate(upload, update={"offset": offset})
+
+
+class AsyncDatasetService:
+    """Asynchronous service class for reading datasets."""
+
+    def __init__(self, session: AsyncSession, storage: BlobStorage) -> None:
+        """Initialize the dataset service.
+
+        Args:
+            session: SQLModel async database session for operations
+            storage: Blob storage holding the files
+
+        """
+        self.session = session
+        self.storage = storage
+
+    async def get(self, dataset_id: str, project_id: str) -> Dataset:
+        """Get a dataset of a project.
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+
+        """
+        dataset = await self.session.get(Dataset, dataset_id)
+        if dataset is None or dataset.project_id != project_id:
+            raise NotFoundError("Dataset not found")
+        return dataset
+
+    async def delete(self, dataset_id: str, project_id: str) -> None:
+        """Delete a dataset, and its content if no other dataset has it.
+
+        Chunks of the content that no other content is made of are deleted
+        from storage.
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+            DatasetInUseError: If pipelines use the dataset
+
+        """
+        dataset = await self.get(dataset_id, project_id)
+        pipelines = await self.session.exec(
+            select(func.count())
+            .select_from(Pipeline)
+            .where(Pipeline.dataset_id == dataset_id),
+        )
+        if pipelines.one():
+            raise DatasetInUseError("Dataset is used by pipelines")
+        await self.session.delete(dataset)
+
+        digests: list[str] = []
+        if dataset.sha256 is not None:
+            # Locked, so no upload adds a dataset to the content meanwhile
+            content = await self.session.get(
+                DatasetContent,
+                dataset.sha256,
+                with_for_update=True,
+            )
+            datasets = await self.session.exec(
+                select(func.count())
+                .select_from(Dataset)
+                .where(Dataset.sha256 == dataset.sha256, Dataset.id != dataset_id),
+            )
+            if content is not None and not datasets.one():
+                digests = content.chunks
+                await _release_chunks(self.session, digests)
+                await self.session.delete(content)
+        try:
+            await self.session.commit()
+        except IntegrityError as exc:
+            await self.session.rollback()
+            raise DatasetInUseError("Dataset is used by pipelines") from exc
+        logger.info("🗑️ Dataset %s deleted", dataset_id)
+        if digests:
+            await self._sweep_chunks(digests)
+
+    async def _sweep_chunks(self, digests: list[str]) -> None:
+        """Delete the chunks that no content references anymore.
+
+        Chunks are deleted from storage while their row is locked: a content
+        referencing them again waits, then finds them missing and stores them.
+        """
+        result = await self.session.exec(
+            select(DatasetChunk)
+            .where(DatasetChunk.id.in_(set(digests)), DatasetChunk.refs <= 0)
+            .with_for_update(skip_locked=True),
+        )
+        unused = result.all()
+        if unused:
+            await run_in_threadpool(
+                _delete_chunks,
+                self.storage,
+                [chunk.id for chunk in unused],
+            )
+            for chunk in unused:
+                await self.session.delete(chunk)
+        await self.session.commit()
+
+    async def preview(
+        self,
+        dataset_id: str,
+        project_id: str,
+        limit: int,
+        columns: list[str] | None = None,
+    ) -> DatasetPreview:
+        """Read the first rows of a dataset.
+
+        Args:
+            dataset_id: ID of the dataset
+            project_id: ID of the project owning the dataset
+            limit: Maximum number of rows
+            columns: Columns to read, all of them if None
+
+        Returns:
+            DatasetPreview: The column names and the rows
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+            InvalidFieldsError: If a column does not exist
+
+        """
+        dataset = await self.get(dataset_id, project_id)
+        if columns and dataset.columns is not None:
+            known = {column["name"] for column in dataset.columns}
+            unknown = [name for name in columns if name not in known]
+            if unknown:
+                raise InvalidFieldsError(unknown)
+        table = await run_in_threadpool(
+            _head,
+            _paths(self.storage, dataset),
+            limit,
+            columns or None,
+        )
+        return DatasetPreview(
+            columns=table.column_names,
+            rows=[list(row.values()) for row in table.to_pylist()],
+        )
+
+    async def rows(
+        self,
+        dataset_id: str,
+        project_id: str,
+        offset: int,
+        limit: int,
+        columns: list[str] | None = None,
+        geos: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        time_column: str | None = None,
+        geo_column: str | None = None,
+    ) -> tuple[list[str], Iterator["pa.RecordBatch"]]:
+        """Open a window of rows of a dataset, optionally filtered.
+
+        Rows are read from the row groups holding the window only, found from
+        the index of row groups built at ingest, as the batches are iterated.
+
+        Args:
+            dataset_id: ID of the dataset
+            project_id: ID of the project owning the dataset
+            offset: Number of rows, matching the filters, to skip
+            limit: Maximum number of rows
+            columns: Columns to read, all of them if None
+            geos: Geos of the rows, in the geo column
+            start: First period of the rows, in the time column
+            end: Last period of the rows, in the time column
+            time_column: Column of the time period (default: ``time``)
+            geo_column: Column of the geography (default: ``geo``)
+
+        Returns:
+            The names of the columns and an iterator over batches of rows
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+            InvalidFieldsError: If a column does not exist
+            InvalidFilterError: If a filter value does not match its column
+
+        """
+        from app.storage.columnar import RowFilter
+
+        dataset = await self.get(dataset_id, project_id)
+        row_filter = None
+        if geos or start is not None or end is not None:
+            row_filter = RowFilter(
+                geo_column=geo_column or "geo",
+                time_column=time_column or "time",
+                geos=tuple(geos or ()),
+                start=start,
+                end=end,
+            )
+        if dataset.columns is not None:
+            known = [column["name"] for column in dataset.columns]
+            needed = [*(columns or []), *(row_filter.columns if row_filter else [])]
+            unknown = [name for name in needed if name not in known]
+            if unknown:
+                raise InvalidFieldsError(unknown)
+        try:
+            return await run_in_threadpool(
+                _rows,
+                _paths(self.storage, dataset),
+                offset,
+                limit,
+                columns or None,
+                row_filter,
+                dataset.row_group_offsets,
+            )
+        except (KeyError, ValueError) as exc:
+            msg = f"Filter does not match the dataset: {exc}"
+            raise InvalidFilterError(msg) from exc
+
+    async def profile(
+        self,
+        dataset_id: str,
+        project_id: str,
+        time_column: str | None = None,
+        geo_column: str | None = None,
+    ) -> DatasetProfile:
+        """Profile the columns of a dataset and its time coverage per geo.
+
+        Profiles are stored by content hash, and computed only on first use.
+
+        Args:
+            dataset_id: ID of the dataset
+            project_id: ID of the project owning the dataset
+            time_column: Column of the time period, ``time`` if it exists
+            geo_column: Column of the geography, ``geo`` if it exists
+
+        Returns:
+            DatasetProfile: The profile of the dataset
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+            InvalidFieldsError: If the time or geo column does not exist
+
+        """
+        dataset = await self.get(dataset_id, project_id)
+        if dataset.columns is not None:
+            known = {column["name"] for column in dataset.columns}
+            unknown = [
+                name for name in (time_column, geo_column) if name and name not in known
+            ]
+            if unknown:
+                raise InvalidFieldsError(unknown)
+            time_column = time_column or ("time" if "time" in known else None)
+            geo_column = geo_column or ("geo" if "geo" in known else None)
+        if time_column is None:
+            geo_column = None
+
+        key = (
+            dataset.sha256 or dataset.id,
+            PROFILE_VERSION,
+            time_column or "",
+            geo_column or "",
+        )
+        stored = await self.session.get(StoredProfile, key)
+        if stored is None:
+            profile = await run_in_threadpool(
+                _profile,
+                _paths(self.storage, dataset),
+                time_column,
+                geo_column,
+            )
+            self.session.add(
+                StoredProfile(
+                    content_hash=key[0],
+                    version=key[1],
+                    time_column=key[2],
+                    geo_column=key[3],
+                    profile=profile,
+                ),
+            )
+            try:
+                await self.session.commit()
+            except IntegrityError:
+                # Profiled concurrently: the stored profile is the same
+                await self.session.rollback()
+        else:
+            profile = stored.profile
+        return DatasetProfile.model_validate(profile)
+
+    async def validate_model_spec(
+        self,
+        dataset_id: str,
+        project_id: str,
+        spec: ModelSpec,
+    ) -> ModelSpecCheck:
+        """Check a model specification against the profile of a dataset.
+
+        Raises:
+            NotFoundError: If the dataset does not belong to the project
+
+        """
+        dataset = await self.get(dataset_id, project_id)
+        known = {column["name"] for column in dataset.columns or []}
+        # Missing columns are reported as issues of the specification
+        profile = await self.profile(
+            dataset_id,
+            project_id,
+            time_column=spec.columns.time if spec.columns.time in known else None,
+            geo_column=spec.columns.geo if spec.columns.geo in known else None,
+        )
+        issues = profile.model_spec_issues(spec)
+        return ModelSpecCheck(valid=not issues, issues=issues)
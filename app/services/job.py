@@ -0,0 +1,249 @@
+"""Job service for submitting and watching pipeline jobs.
+
+Jobs are fingerprinted by the content of their dataset, their normalized
+model specification and their parameters. A job identical to a job of the
+project that succeeded reuses its model instead of being fitted again.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from typing import Any
+
+import orjson
+from sqlmodel import func, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.events import publish_job_events
+from app.core.exceptions import JobBacklogFullError, NotFoundError
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.schemas import Dataset, Job, Model, Pipeline
+from app.schemas.job import JobCreate, JobEvent, JobSubmitted
+from app.tasks.scheduler import PRIORITY_RANK
+from app.validations.enums import JobStatus
+from app.validations.job_parameters import JobParams
+from app.validations.model_spec import ModelSpec
+
+logger = get_logger(__name__)
+
+BACKLOG_RETRY_AFTER = 60
+"""Seconds clients are asked to wait when a project's backlog is full."""
+
+FINGERPRINT_VERSION = 1
+"""Version of job fingerprints, to bump when fits of the same inputs change."""
+
+
+def fingerprint(content_id: str, model_spec: dict[str, Any], params: JobParams) -> str:
+    """Compute the fingerprint of a job.
+
+    The model specification and parameters are validated, which fills their
+    defaults, and serialized with sorted keys, so equivalent jobs get the
+    same fingerprint however they were written.
+
+    Args:
+        content_id: ID of the content of the dataset
+        model_spec: Model specification of the pipeline
+        params: Parameters of the job
+
+    Returns:
+        Hex SHA-256 of the canonical JSON of the job's inputs
+
+    """
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "content": content_id,
+        "model_spec": ModelSpec.model_validate(model_spec).model_dump(mode="json"),
+        "params": params.model_dump(mode="json"),
+    }
+    return hashlib.sha256(orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class AsyncJobService:
+    """Asynchronous service class for submitting and watching pipeline jobs."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the job service with an async database session.
+
+        Args:
+            session: SQLModel async database session for operations
+
+        """
+        self.session = session
+
+    async def submit(self, job_data: JobCreate, project_id: str) -> JobSubmitted:
+        """Queue a job of one of the project's pipelines.
+
+        A job identical to a job of the project that succeeded is not queued,
+        unless forced: it succeeds at once, with the model of that job.
+
+        Args:
+            job_data: Pipeline, parameters and priority of the job
+            project_id: ID of the project owning the pipeline
+
+        Returns:
+            JobSubmitted: The queued job and its position in the project's
+            queue, or the succeeded job and its reused model
+
+        Raises:
+            NotFoundError: If the pipeline does not belong to the project
+            JobBacklogFullError: If the project has too many pending jobs
+
+        """
+        pipeline = await self.session.get(Pipeline, job_data.pipeline_id)
+        if pipeline is None or pipeline.project_id != project_id:
+            raise NotFoundError("Pipeline not found")
+
+        dataset = await self.session.get(Dataset, pipeline.dataset_id)
+        job_fingerprint = fingerprint(
+            dataset.sha256 or f"dataset:{dataset.id}",
+            pipeline.model_spec,
+            job_data.params,
+        )
+        if not job_data.force:
+            memoized = await self._memoized(job_data, job_fingerprint, project_id)
+            if memoized is not None:
+                return memoized
+
+        pending = await self._pending_jobs(project_id)
+        if pending >= settings.JOB_MAX_PENDING_PER_PROJECT:
+            raise JobBacklogFullError(retry_after=BACKLOG_RETRY_AFTER)
+
+        job = Job(
+            pipeline_id=pipeline.id,
+            params=job_data.params.model_dump(),
+            priority=job_data.priority,
+            fingerprint=job_fingerprint,
+        )
+        self.session.add(job)
+        await self.session.flush()
+        await publish_job_events(self.session, [JobEvent.from_job(job, project_id)])
+        await self.session.commit()
+        await self.session.refresh(job)
+        logger.info("🆕 Job %s queued!", job.id)
+
+        return JobSubmitted(
+            id=job.id,
+            status=job.status,
+            priority=job.priority,
+            queue_position=await self._queue_position(job, project_id),
+        )
+
+    async def _memoized(
+        self,
+        job_data: JobCreate,
+        job_fingerprint: str,
+        project_id: str,
+    ) -> JobSubmitted | None:
+        """Record a job as succeeded if an identical job of the project did.
+
+        The job gets a model of its own, pointing at the fitted model of the
+        latest identical job.
+
+        Returns:
+            JobSubmitted: The succeeded job, or None if no identical job
+            succeeded
+
+        """
+        result = await self.session.exec(
+            select(Job.id, Model.uri, Model.sha256, Model.curves_sha256)
+            .join(Model, Model.job_id == Job.id)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(
+                Pipeline.project_id == project_id,
+                Job.fingerprint == job_fingerprint,
+                Job.status == JobStatus.succeeded,
+            )
+            .order_by(Job.finished_at.desc())
+            .limit(1),
+        )
+        row = result.first()
+        if row is None:
+            return None
+        source_id, model_uri, model_sha256, curves_sha256 = row
+
+        now = datetime.now(UTC)
+        job = Job(
+            pipeline_id=job_data.pipeline_id,
+            params=job_data.params.model_dump(),
+            priority=job_data.priority,
+            fingerprint=job_fingerprint,
+            status=JobStatus.succeeded,
+            started_at=now,
+            finished_at=now,
+        )
+        model = Model(
+            job_id=job.id,
+            uri=model_uri,
+            sha256=model_sha256,
+            curves_sha256=curves_sha256,
+        )
+        self.session.add(job)
+        self.session.add(model)
+        await self.session.flush()
+        await publish_job_events(self.session, [JobEvent.from_job(job, project_id)])
+        await self.session.commit()
+        logger.info("♻️ Job %s reuses the model of job %s", job.id, source_id)
+
+        return JobSubmitted(
+            id=job.id,
+            status=job.status,
+            priority=job.priority,
+            queue_position=0,
+            memoized_from=source_id,
+            model_id=model.id,
+        )
+
+    async def active_events(self, project_id: str) -> list[JobEvent]:
+        """Return the current status of the project's pending and running jobs.
+
+        Args:
+            project_id: ID of the project
+
+        Returns:
+            list[JobEvent]: One event per job, oldest job first
+
+        """
+        result = await self.session.exec(
+            select(Job)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(
+                Pipeline.project_id == project_id,
+                Job.status.in_([JobStatus.pending, JobStatus.running]),
+            )
+            .order_by(Job.created_at),
+        )
+        return [JobEvent.from_job(job, project_id) for job in result.all()]
+
+    async def _pending_jobs(self, project_id: str) -> int:
+        """Count the pending jobs of a project."""
+        result = await self.session.exec(
+            select(func.count())
+            .select_from(Job)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(Pipeline.project_id == project_id, Job.status == JobStatus.pending),
+        )
+        return result.one()
+
+    async def _queue_position(self, job: Job, project_id: str) -> int:
+        """Count the pending jobs of a project that start before ``job``.
+
+        Those are jobs of a higher priority class, or of the same class and
+        submitted earlier.
+        """
+        rank = PRIORITY_RANK[job.priority]
+        higher = [p for p, r in PRIORITY_RANK.items() if r < rank]
+        result = await self.session.exec(
+            select(func.count())
+            .select_from(Job)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(
+                Pipeline.project_id == project_id,
+                Job.status == JobStatus.pending,
+                Job.id != job.id,
+                or_(
+                    Job.priority.in_(higher),
+                    (Job.priority == job.priority) & (Job.created_at <= job.created_at),
+                ),
+            ),
+        )
+        return result.one()
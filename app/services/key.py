@@ -0,0 +1,93 @@
+"""API key service for managing API key operations."""
+
+from datetime import UTC, datetime
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.auth import (
+    api_key_filter,
+    generate_api_key,
+    hash_api_key,
+    invalidate_api_key,
+    notify_api_key,
+)
+from app.core.logging import get_logger
+from app.models.key import Key, KeyCreate, KeyResponse
+
+logger = get_logger(__name__)
+
+
+class AsyncKeyService:
+    """Asynchronous service class for managing API keys."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the key service with an async database session.
+
+        Args:
+            session: SQLModel async database session for operations
+
+        """
+        self.session = session
+
+    async def create(self, key_data: KeyCreate) -> KeyResponse:
+        """Create a new API key.
+
+        Only the keyed hash of the key is stored. The key is added to the
+        API key filter of every worker once committed.
+
+        Args:
+            key_data: Key creation data containing the owning project
+
+        Returns:
+            KeyResponse: The created key, including its plain text value,
+            which cannot be retrieved afterwards
+
+        """
+        plain_key = generate_api_key()
+        db_key = Key.model_validate(
+            {**key_data.model_dump(), "key": hash_api_key(plain_key)},
+        )
+
+        self.session.add(db_key)
+        await notify_api_key(self.session, db_key.key)
+        await self.session.commit()
+        await self.session.refresh(db_key)
+        api_key_filter.add(db_key.key)
+        logger.info("🔑 API key %s created!", db_key.id)
+        return KeyResponse.model_validate({**db_key.model_dump(), "key": plain_key})
+
+    async def get_by_id(self, key_id: str) -> Key | None:
+        """Retrieve an API key by its ID.
+
+        Args:
+            key_id: The unique identifier for the API key
+
+        Returns:
+            Key if found, None otherwise
+
+        """
+        return await self.session.get(Key, key_id)
+
+    async def revoke(self, key_id: str) -> bool:
+        """Deactivate an API key and evict it from the authentication cache.
+
+        The key stays in the API key filter until its next rebuild, which
+        only costs a lookup.
+
+        Args:
+            key_id: The unique identifier for the API key
+
+        Returns:
+            True if the key was revoked, False if not found
+
+        """
+        db_key = await self.get_by_id(key_id)
+        if not db_key:
+            return False
+
+        db_key.is_active = False
+        db_key.updated_at = datetime.now(UTC)
+        await self.session.commit()
+        invalidate_api_key(db_key.key)
+        logger.info("🔒 API key %s revoked!", key_id)
+        return True
@@ -0,0 +1,133 @@
+"""Model service for simulating budget scenarios on deployed models.
+
+The response curves of deployed models are kept in memory by the model
+registry, and every scenario of a request is evaluated in one vectorized
+pass over the posterior samples, in a thread.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics import ModelRegistry
+from app.core.exceptions import (
+    InvalidScenarioError,
+    ModelUnavailableError,
+    NotFoundError,
+)
+from app.core.settings import settings
+from app.schemas import Job, Model, Pipeline
+from app.schemas.model import SimulationRequest
+
+if TYPE_CHECKING:
+    from app.analytics.simulation import ResponseCurves
+
+
+def _simulate(curves: "ResponseCurves", request: SimulationRequest) -> dict[str, Any]:
+    """Check budget scenarios against the channels of a model and simulate them."""
+    import numpy as np
+
+    from app.analytics.simulation import simulate
+
+    channels = request.channels or list(curves.channels)
+    if sorted(channels) != sorted(curves.channels):
+        msg = f"Channels must be those of the model: {', '.join(curves.channels)}"
+        raise InvalidScenarioError(msg)
+    try:
+        budgets = np.array(request.scenarios, dtype=np.float64)
+    except ValueError as exc:
+        msg = "Scenarios must all have a budget per channel"
+        raise InvalidScenarioError(msg) from exc
+    if budgets.shape[1] != len(channels):
+        msg = f"Scenarios must have a budget for each of the {len(channels)} channels"
+        raise InvalidScenarioError(msg)
+    if not np.isfinite(budgets).all() or (budgets < 0).any():
+        msg = "Budgets must be finite and not negative"
+        raise InvalidScenarioError(msg)
+
+    # Column of each requested channel in the curves of the model
+    positions = [curves.channels.index(channel) for channel in channels]
+    ordered = np.empty_like(budgets)
+    ordered[:, positions] = budgets
+    result = simulate(
+        curves,
+        ordered,
+        settings.SIMULATION_BLOCK_ELEMENTS,
+        intervals=request.intervals,
+    )
+    result["channels"] = channels
+    # Arrays are serialized as they are, which needs them C-contiguous
+    for name in ("channel_incremental", "channel_roi"):
+        result[name] = np.ascontiguousarray(result[name][:, positions])
+    return result
+
+
+class AsyncModelService:
+    """Asynchronous service class for using fitted models."""
+
+    def __init__(self, session: AsyncSession, registry: ModelRegistry) -> None:
+        """Initialize the model service.
+
+        Args:
+            session: SQLModel async database session for operations
+            registry: Registry of the response curves of deployed models
+
+        """
+        self.session = session
+        self.registry = registry
+
+    async def get(self, model_id: str, project_id: str) -> Model:
+        """Get a model of a project.
+
+        Raises:
+            NotFoundError: If the model does not belong to the project
+
+        """
+        result = await self.session.exec(
+            select(Model)
+            .join(Job, Model.job_id == Job.id)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(Model.id == model_id, Pipeline.project_id == project_id),
+        )
+        model = result.first()
+        if model is None:
+            raise NotFoundError("Model not found")
+        return model
+
+    async def simulate(
+        self,
+        model_id: str,
+        project_id: str,
+        request: SimulationRequest,
+    ) -> dict[str, Any]:
+        """Simulate budget scenarios on a deployed model of a project.
+
+        Args:
+            model_id: ID of the model
+            project_id: ID of the project
+            request: Budget scenarios and the order of their channels
+
+        Returns:
+            dict: Arrays shaped like ``SimulationResult``
+
+        Raises:
+            NotFoundError: If the model does not belong to the project
+            ModelUnavailableError: If the model is not deployed, or its
+                response curves are missing or do not match their checksum
+            InvalidScenarioError: If the scenarios do not fit the model
+
+        """
+        model = await self.get(model_id, project_id)
+        if not model.deployed:
+            raise ModelUnavailableError("Model is not deployed")
+        try:
+            curves = await self.registry.get(model.uri, model.curves_sha256)
+        except FileNotFoundError as exc:
+            msg = "Model has no response curves, fit it again to simulate it"
+            raise ModelUnavailableError(msg) from exc
+        except ValueError as exc:
+            msg = "Response curves of the model are corrupted, fit it again"
+            raise ModelUnavailableError(msg) from exc
+        return await run_in_threadpool(_simulate, curves, request)
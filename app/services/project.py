@@ -1,12 +1,169 @@
 """Dataset service for managing dataset CRUD operations."""
 
-from sqlmodel import Session, or_, select
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Delete, Insert, Select, delete, insert, tuple_
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.logging import get_logger
-from app.models.project import Project, ProjectCreate, ProjectPublic
+from app.core.pagination import Page, SortKey, encode_cursor
+from app.core.response_cache import response_cache
+from app.models.enums import BatchItemStatus
+from app.models.project import Project, ProjectBatchResult, ProjectCreate
 
 logger = get_logger(__name__)
 
+CACHE_NAMESPACE = "projects"
+"""Response cache namespace invalidated by project writes."""
+
+
+def slugify(name: str) -> str:
+    """Build a URL-friendly slug from a project name."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+PUBLIC_COLUMNS = {
+    "id": Project.id,
+    "name": Project.name,
+    "owner_id": Project.user_id,
+    "created_at": Project.created_at,
+    "updated_at": Project.updated_at,
+}
+"""Columns selected for each field of ``ProjectPublic``."""
+
+_SORT_KEY = ("created_at", "id")
+
+
+def _user_projects_query(
+    user_id: str,
+    limit: int,
+    offset: int,
+    after: SortKey | None,
+    fields: Sequence[str],
+) -> tuple[Select, tuple[str, ...]]:
+    """Build the query listing a page of a user's projects.
+
+    Only the columns of the requested fields are selected, followed by the
+    sort key columns when they were not requested, so rows are plain tuples
+    rather than hydrated ORM objects.
+
+    Projects are ordered by ``(created_at, id)``. With ``after``, the page
+    starts right after that key (keyset pagination) and ``offset`` is
+    ignored. One extra row is fetched to know whether a next page exists.
+
+    Returns:
+        The query and the names of the selected columns
+
+    """
+    names = (*fields, *(key for key in _SORT_KEY if key not in fields))
+    query = (
+        select(*(PUBLIC_COLUMNS[name] for name in names))
+        .where(Project.user_id == user_id)
+        .order_by(Project.created_at, Project.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        return query.where(tuple_(Project.created_at, Project.id) > after), names
+    return query.offset(offset), names
+
+
+def _user_projects_version_query(user_id: str) -> Select:
+    """Build the query returning the version of a user's project list.
+
+    The version is the latest creation or update timestamp and the number of
+    projects, which changes whenever a project is created, updated or deleted.
+    """
+    return select(
+        func.max(func.coalesce(Project.updated_at, Project.created_at)),
+        func.count(),
+    ).where(Project.user_id == user_id)
+
+
+def _to_page(
+    rows: Sequence[tuple],
+    names: tuple[str, ...],
+    fields: Sequence[str],
+    limit: int,
+) -> Page[dict[str, Any]]:
+    """Shape projected rows like ``ProjectPublic`` and compute the next cursor.
+
+    Rows are trusted and are not validated. Sort key columns that were not
+    requested are dropped, as is the extra row fetched by the query. Null
+    fields are left out, like the response model's ``exclude_none``.
+    """
+    items = [
+        {
+            name: value
+            for name, value in zip(fields, row, strict=False)
+            if value is not None
+        }
+        for row in rows[:limit]
+    ]
+    if len(rows) <= limit:
+        return Page(items=items)
+    last = dict(zip(names, rows[limit - 1], strict=True))
+    return Page(
+        items=items,
+        next_cursor=encode_cursor((last["created_at"], last["id"])),
+    )
+
+
+def _new_project(project_data: ProjectCreate, user_id: str) -> Project:
+    """Build a project owned by ``user_id`` from creation data."""
+    return Project.model_validate(
+        {
+            **project_data.model_dump(),
+            "slug": slugify(project_data.name),
+            "user_id": user_id,  # Set the owner ID from the current user
+        },
+    )
+
+
+def _batch_insert_query(projects: Sequence[Project]) -> Insert:
+    """Build a single multi-row INSERT of ``projects``.
+
+    Identifiers and timestamps are generated client side, so nothing needs to
+    be read back from the database.
+    """
+    return insert(Project).values([project.model_dump() for project in projects])
+
+
+def _batch_delete_query(user_id: str, project_ids: Sequence[str]) -> Delete:
+    """Build a single DELETE of a user's projects, returning the deleted IDs."""
+    return (
+        delete(Project)
+        .where(Project.user_id == user_id, Project.id.in_(project_ids))
+        .returning(Project.id)
+    )
+
+
+def _created_results(projects: Sequence[Project]) -> list[ProjectBatchResult]:
+    """Report every project of a batch as created."""
+    return [
+        ProjectBatchResult(index=index, id=project.id, status=BatchItemStatus.CREATED)
+        for index, project in enumerate(projects)
+    ]
+
+
+def _deleted_results(
+    project_ids: Sequence[str],
+    deleted: set[str],
+) -> list[ProjectBatchResult]:
+    """Report each requested project as deleted or not found."""
+    return [
+        ProjectBatchResult(
+            index=index,
+            id=project_id,
+            status=BatchItemStatus.DELETED
+            if project_id in deleted
+            else BatchItemStatus.NOT_FOUND,
+        )
+        for index, project_id in enumerate(project_ids)
+    ]
+
 
 class ProjectService:
     """Service class for managing project CRUD operations."""
@@ -35,19 +192,37 @@ class ProjectService:
             Exception: If project creation fails
 
         """
-        db_project = Project.model_validate(
-            {
-                **project_data.model_dump(),
-                "owner_id": user_id,  # Set the owner ID from the current user
-            },
-        )
+        db_project = _new_project(project_data, user_id)
 
         self.session.add(db_project)
         self.session.commit()
         self.session.refresh(db_project)
+        response_cache.invalidate(CACHE_NAMESPACE, user_id)
         logger.info("🆕 Project %s created!", db_project.id)
         return db_project
 
+    def create_many(
+        self,
+        projects_data: Sequence[ProjectCreate],
+        user_id: str,
+    ) -> list[ProjectBatchResult]:
+        """Create several projects in a single transaction.
+
+        Args:
+            projects_data: Creation data of each project
+            user_id: ID of the user creating the projects
+
+        Returns:
+            The outcome of each project, in request order
+
+        """
+        projects = [_new_project(data, user_id) for data in projects_data]
+        self.session.exec(_batch_insert_query(projects))
+        self.session.commit()
+        response_cache.invalidate(CACHE_NAMESPACE, user_id)
+        logger.info("🆕 %d projects created!", len(projects))
+        return _created_results(projects)
+
     def get_by_id(self, project_id: str) -> Project | None:
         """Retrieve a project by its ID.
 
@@ -65,24 +240,36 @@ class ProjectService:
         user_id: str,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[ProjectPublic]:
+        after: SortKey | None = None,
+        fields: Sequence[str] = tuple(PUBLIC_COLUMNS),
+    ) -> Page[dict[str, Any]]:
         """List projects owned by a specific user.
 
         Args:
             user_id: User ID to filter projects by owner
             limit: Maximum number of projects to return (default: 100)
             offset: Number of projects to skip (default: 0)
+            after: Sort key of the last project of the previous page
+            fields: ProjectPublic fields to select (default: all)
 
         Returns:
-            List of ProjectPublic objects owned by the user
+            Page of projects owned by the user, shaped like ProjectPublic
 
         """
-        query = select(Project).where(
-            or_(
-                Project.owner_id == user_id,
-            ),
-        )
-        return self.session.exec(query.offset(offset).limit(limit)).all()
+        query, names = _user_projects_query(user_id, limit, offset, after, fields)
+        return _to_page(self.session.exec(query).all(), names, fields, limit)
+
+    def list_user_projects_version(self, user_id: str) -> tuple:
+        """Return a cheap version of the list of projects owned by a user.
+
+        Args:
+            user_id: User ID to filter projects by owner
+
+        Returns:
+            Tuple of the latest change timestamp and the number of projects
+
+        """
+        return tuple(self.session.exec(_user_projects_version_query(user_id)).one())
 
     def delete(self, project_id: str) -> bool:
         """Delete a project from the database.
@@ -100,5 +287,188 @@ class ProjectService:
 
         self.session.delete(project)
         self.session.commit()
+        response_cache.invalidate(CACHE_NAMESPACE, project.user_id)
         logger.info("🗑️ Project %s deleted!", project_id)
         return True
+
+    def delete_many(
+        self,
+        project_ids: Sequence[str],
+        user_id: str,
+    ) -> list[ProjectBatchResult]:
+        """Delete several projects of a user in a single transaction.
+
+        Args:
+            project_ids: IDs of the projects to delete
+            user_id: ID of the user owning the projects
+
+        Returns:
+            The outcome of each project, in request order. Projects that do
+            not exist or are not owned by the user are reported as not found.
+
+        """
+        result = self.session.exec(_batch_delete_query(user_id, project_ids))
+        deleted = set(result.scalars().all())
+        self.session.commit()
+        if deleted:
+            response_cache.invalidate(CACHE_NAMESPACE, user_id)
+        logger.info("🗑️ %d projects deleted!", len(deleted))
+        return _deleted_results(project_ids, deleted)
+
+
+class AsyncProjectService:
+    """Asynchronous service class for managing project CRUD operations."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the project service with an async database session.
+
+        Args:
+            session: SQLModel async database session for operations
+
+        """
+        self.session = session
+
+    async def create(self, project_data: ProjectCreate, user_id: str) -> Project:
+        """Create a new project in the database.
+
+        Args:
+            project_data: Project creation data containing required fields
+            user_id: ID of the user creating the project
+
+        Returns:
+            Project: The created project with generated timestamps
+
+        """
+        db_project = _new_project(project_data, user_id)
+
+        self.session.add(db_project)
+        await response_cache.notify_invalidation(self.session, CACHE_NAMESPACE, user_id)
+        await self.session.commit()
+        await self.session.refresh(db_project)
+        response_cache.invalidate(CACHE_NAMESPACE, user_id)
+        logger.info("🆕 Project %s created!", db_project.id)
+        return db_project
+
+    async def create_many(
+        self,
+        projects_data: Sequence[ProjectCreate],
+        user_id: str,
+    ) -> list[ProjectBatchResult]:
+        """Create several projects in a single transaction.
+
+        Args:
+            projects_data: Creation data of each project
+            user_id: ID of the user creating the projects
+
+        Returns:
+            The outcome of each project, in request order
+
+        """
+        projects = [_new_project(data, user_id) for data in projects_data]
+        await self.session.exec(_batch_insert_query(projects))
+        await response_cache.notify_invalidation(self.session, CACHE_NAMESPACE, user_id)
+        await self.session.commit()
+        response_cache.invalidate(CACHE_NAMESPACE, user_id)
+        logger.info("🆕 %d projects created!", len(projects))
+        return _created_results(projects)
+
+    async def get_by_id(self, project_id: str) -> Project | None:
+        """Retrieve a project by its ID.
+
+        Args:
+            project_id: The unique identifier for the project
+
+        Returns:
+            Project if found, None otherwise
+
+        """
+        return await self.session.get(Project, project_id)
+
+    async def list_user_projects(
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        after: SortKey | None = None,
+        fields: Sequence[str] = tuple(PUBLIC_COLUMNS),
+    ) -> Page[dict[str, Any]]:
+        """List projects owned by a specific user.
+
+        Args:
+            user_id: User ID to filter projects by owner
+            limit: Maximum number of projects to return (default: 100)
+            offset: Number of projects to skip (default: 0)
+            after: Sort key of the last project of the previous page
+            fields: ProjectPublic fields to select (default: all)
+
+        Returns:
+            Page of projects owned by the user, shaped like ProjectPublic
+
+        """
+        query, names = _user_projects_query(user_id, limit, offset, after, fields)
+        result = await self.session.exec(query)
+        return _to_page(result.all(), names, fields, limit)
+
+    async def list_user_projects_version(self, user_id: str) -> tuple:
+        """Return a cheap version of the list of projects owned by a user.
+
+        Args:
+            user_id: User ID to filter projects by owner
+
+        Returns:
+            Tuple of the latest change timestamp and the number of projects
+
+        """
+        result = await self.session.exec(_user_projects_version_query(user_id))
+        return tuple(result.one())
+
+    async def delete(self, project_id: str) -> bool:
+        """Delete a project from the database.
+
+        Args:
+            project_id: The unique identifier for the project
+
+        Returns:
+            True if project was deleted, False if not found
+
+        """
+        project = await self.get_by_id(project_id)
+        if not project:
+            return False
+
+        await self.session.delete(project)
+        await response_cache.notify_invalidation(
+            self.session, CACHE_NAMESPACE, project.user_id
+        )
+        await self.session.commit()
+        response_cache.invalidate(CACHE_NAMESPACE, project.user_id)
+        logger.info("🗑️ Project %s deleted!", project_id)
+        return True
+
+    async def delete_many(
+        self,
+        project_ids: Sequence[str],
+        user_id: str,
+    ) -> list[ProjectBatchResult]:
+        """Delete several projects of a user in a single transaction.
+
+        Args:
+            project_ids: IDs of the projects to delete
+            user_id: ID of the user owning the projects
+
+        Returns:
+            The outcome of each project, in request order. Projects that do
+            not exist or are not owned by the user are reported as not found.
+
+        """
+        result = await self.session.exec(_batch_delete_query(user_id, project_ids))
+        deleted = set(result.scalars().all())
+        if deleted:
+            await response_cache.notify_invalidation(
+                self.session, CACHE_NAMESPACE, user_id
+            )
+        await self.session.commit()
+        if deleted:
+            response_cache.invalidate(CACHE_NAMESPACE, user_id)
+        logger.info("🗑️ %d projects deleted!", len(deleted))
+        return _deleted_results(project_ids, deleted)
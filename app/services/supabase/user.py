@@ -13,7 +13,7 @@ class UserService:
     """Service for managing user-related operations on Supabase."""
 
     def __init__(self) -> None:
-        """Initialize the user service."""
+        """Initialize the user service with the shared admin client."""
         self.supabase = get_supabase_admin_auth_client()
 
     def get_user_by_id(self, user_id: str) -> User | None:
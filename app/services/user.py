@@ -1,6 +1,7 @@
 """User service for managing user CRUD operations."""
 
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.user import User
 
@@ -130,3 +131,79 @@ class UserService:
 
         """
         return self.session.exec(select(User).offset(offset).limit(limit)).all()
+
+
+class AsyncUserService:
+    """Asynchronous service class for managing user CRUD operations."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the user service with an async database session.
+
+        Args:
+            session: SQLModel async database session for operations
+
+        """
+        self.session = session
+
+    async def get_by_id(self, user_id: str) -> User | None:
+        """Retrieve a user by their ID.
+
+        Args:
+            user_id: The unique identifier for the user
+
+        Returns:
+            User if found, None otherwise
+
+        """
+        return await self.session.get(User, user_id)
+
+    async def get_by_email(self, email: str) -> User | None:
+        """Retrieve a user by their email address.
+
+        Args:
+            email: The email address of the user
+
+        Returns:
+            User if found, None otherwise
+
+        """
+        statement = select(User).where(User.email == email)
+        result = await self.session.exec(statement)
+        return result.first()
+
+    async def delete(self, user_id: str) -> bool:
+        """Delete a user from the database.
+
+        Args:
+            user_id: The unique identifier for the user
+
+        Returns:
+            True if user was deleted, False if not found
+
+        """
+        user = await self.get_by_id(user_id)
+        if not user:
+            return False
+
+        await self.session.delete(user)
+        await self.session.commit()
+
+        return True
+
+    async def list(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[User]:
+        """List users with optional filtering and pagination.
+
+        Args:
+            limit: Maximum number of users to return (default: 100)
+            offset: Number of users to skip (default: 0)
+
+        Returns:
+            List of User objects matching the criteria
+
+        """
+        result = await self.session.exec(select(User).offset(offset).limit(limit))
+        return result.all()
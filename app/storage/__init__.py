@@ -0,0 +1,46 @@
+"""Storage of dataset files."""
+
+from functools import cache
+
+from .artifacts import ArtifactCache
+from .base import BlobStorage
+from .local import LocalBlobStorage
+from app.core import metrics
+from app.core.settings import settings
+
+
+@cache
+def get_blob_storage() -> BlobStorage:
+    """Dependency to get the blob storage of the application.
+
+    Returns:
+        BlobStorage: The shared blob storage.
+
+    """
+    return LocalBlobStorage(settings.STORAGE_DIR)
+
+
+@cache
+def get_artifact_cache() -> ArtifactCache:
+    """Dependency to get the model artifact cache of the application.
+
+    Returns:
+        ArtifactCache: The shared artifact cache.
+
+    """
+    artifact_cache = ArtifactCache(
+        get_blob_storage(),
+        settings.ARTIFACT_CACHE_DIR,
+        settings.ARTIFACT_CACHE_MAX_SIZE,
+    )
+    metrics.register("artifact_cache", artifact_cache.stats)
+    return artifact_cache
+
+
+__all__ = [
+    "ArtifactCache",
+    "BlobStorage",
+    "LocalBlobStorage",
+    "get_artifact_cache",
+    "get_blob_storage",
+]
@@ -0,0 +1,216 @@
+"""Local cache of model artifacts.
+
+Model artifacts are fetched from blob storage into a size-bounded directory,
+and evicted in least-recently-used order. Entries are keyed by the URI and
+checksum of the artifact, so a changed artifact is never served stale.
+
+The directory may be shared by several processes: its size is read from the
+directory itself before evicting, and recency from the modification times
+of its files, which hits update.
+
+Artifacts are downloaded to a temporary file and renamed once verified, so
+an entry is never seen partially written, even by other processes sharing
+the directory. Concurrent requests for an artifact being downloaded wait for
+that download instead of starting their own.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .base import BlobStorage
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_HASH_BUFFER_SIZE = 1024**2
+
+
+def file_sha256(path: str | Path) -> str:
+    """Compute the hex SHA-256 of a file."""
+    hash_ = hashlib.sha256()
+    with Path(path).open("rb") as file:
+        while chunk := file.read(_HASH_BUFFER_SIZE):
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
+
+class ArtifactCache:
+    """Size-bounded on-disk LRU cache of model artifacts.
+
+    Meant to be used from the event loop: downloads and checksums run in a
+    thread.
+    """
+
+    def __init__(self, storage: BlobStorage, root: str | Path, max_size: int) -> None:
+        """Initialize the cache, indexing the artifacts already in ``root``.
+
+        Args:
+            storage: Blob storage holding the artifacts
+            root: Directory of the cached artifacts
+            max_size: Maximum total size of the cached artifacts, in bytes
+
+        """
+        self.storage = storage
+        self.root = Path(root).resolve()
+        self.max_size = max_size
+        # Key to size of the artifact, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._downloads: dict[str, asyncio.Task[Path]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self._evict()
+
+    @staticmethod
+    def key(uri: str, checksum: str | None = None) -> str:
+        """Return the cache key of an artifact."""
+        return hashlib.sha256(f"{uri}\0{checksum or ''}".encode()).hexdigest()
+
+    async def get(self, uri: str, checksum: str | None = None) -> Path:
+        """Return the local path of an artifact, downloading it on a miss.
+
+        The file may be evicted once other artifacts are cached: use ``open``
+        to read it.
+
+        Args:
+            uri: URI of the artifact in blob storage
+            checksum: Hex SHA-256 of the artifact, checked once downloaded
+
+        Returns:
+            Path of the cached artifact
+
+        Raises:
+            ValueError: If the downloaded artifact does not match ``checksum``
+
+        """
+        key = self.key(uri, checksum)
+        path = self.root / key
+        try:
+            # Recency is kept in modification times across restarts
+            os.utime(path)
+        except FileNotFoundError:
+            self._discard(key)
+            return await self._download(key, uri, checksum)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            # Downloaded by another process sharing the directory
+            self._add(key, path.stat().st_size)
+        self.hits += 1
+        self.bytes_saved += self._entries[key]
+        return path
+
+    async def open(self, uri: str, checksum: str | None = None) -> BinaryIO:
+        """Open an artifact for reading, downloading it on a miss.
+
+        The file stays readable after the artifact is evicted.
+        """
+        path = await self.get(uri, checksum)
+        return path.open("rb")
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache counters."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "bytes_downloaded": self.bytes_downloaded,
+        }
+
+    async def _download(self, key: str, uri: str, checksum: str | None) -> Path:
+        """Download an artifact, once however many requests wait for it."""
+        task = self._downloads.get(key)
+        if task is not None:
+            self.coalesced += 1
+            path = await asyncio.shield(task)
+            self.bytes_saved += self._entries.get(key, 0)
+            return path
+
+        self.misses += 1
+        task = asyncio.create_task(self._fetch(key, uri, checksum))
+        self._downloads[key] = task
+        # Retrieve the error of downloads whose requests were all cancelled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str, uri: str, checksum: str | None) -> Path:
+        try:
+            size = await asyncio.to_thread(self._write, key, uri, checksum)
+        finally:
+            del self._downloads[key]
+        self._evict(keep=key)
+        self.bytes_downloaded += size
+        logger.info("📥 Cached artifact %s (%d bytes)", uri, size)
+        return self.root / key
+
+    def _write(self, key: str, uri: str, checksum: str | None) -> int:
+        """Download an artifact to a temporary file, then move it in place."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            self.storage.download(uri, temporary)
+            if checksum is not None and file_sha256(temporary) != checksum:
+                msg = f"Checksum of artifact {uri} does not match"
+                raise ValueError(msg)
+            size = temporary.stat().st_size
+            temporary.replace(self.root / key)
+        finally:
+            temporary.unlink(missing_ok=True)
+        return size
+
+    def _add(self, key: str, size: int) -> None:
+        """Index an artifact found in ``root``."""
+        self._size += size - self._entries.get(key, 0)
+        self._entries[key] = size
+        self._entries.move_to_end(key)
+
+    def _discard(self, key: str) -> None:
+        """Forget an artifact evicted by another process."""
+        self._size -= self._entries.pop(key, 0)
+
+    def _evict(self, keep: str | None = None) -> None:
+        """Evict the least recently used artifacts of ``root`` over the size.
+
+        ``root`` is indexed again first, so the artifacts of every process
+        sharing it count in its size.
+
+        Args:
+            keep: Artifact never evicted, such as the one just downloaded
+
+        """
+        self._index()
+        if keep in self._entries:
+            self._entries.move_to_end(keep)
+        while self._size > self.max_size and len(self._entries) > 1:
+            evicted, evicted_size = self._entries.popitem(last=False)
+            (self.root / evicted).unlink(missing_ok=True)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def _index(self) -> None:
+        """Index the artifacts of ``root``, least recently used first."""
+        files = []
+        if self.root.is_dir():
+            for entry in os.scandir(self.root):
+                # Temporary files of downloads are hidden
+                if not entry.name.startswith(".") and entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+        self._size = sum(self._entries.values())
@@ -0,0 +1,93 @@
+"""Blob storage interface."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from pathlib import Path
+
+
+class BlobStorage(ABC):
+    """Storage of dataset files and of the parts of uploads in progress.
+
+    An upload is written to a part, at increasing offsets, and committed as a
+    blob once complete. The Parquet copies of files are kept as
+    content-addressed chunks, shared by the files they are part of. Methods
+    are blocking and meant to run in a thread.
+    """
+
+    @abstractmethod
+    def part_size(self, upload_id: str) -> int:
+        """Return the number of bytes written to an upload's part, 0 if none."""
+
+    @abstractmethod
+    def lock_part(self, upload_id: str) -> AbstractContextManager[bool]:
+        """Lock an upload's part against writes from any other process.
+
+        Does not wait for the lock: the context manager yields whether it was
+        acquired, and releases it on exit, or when the process dies.
+        """
+
+    @abstractmethod
+    def write_part(self, upload_id: str, offset: int, data: bytes) -> None:
+        """Write bytes to an upload's part at the given offset."""
+
+    @abstractmethod
+    def truncate_part(self, upload_id: str, size: int) -> None:
+        """Discard the bytes of an upload's part after ``size``."""
+
+    @abstractmethod
+    def read_part(self, upload_id: str, chunk_size: int) -> Iterator[bytes]:
+        """Read an upload's part in chunks of at most ``chunk_size`` bytes."""
+
+    @abstractmethod
+    def commit_part(self, upload_id: str, key: str) -> str:
+        """Move a complete upload's part to the blob ``key``.
+
+        Returns:
+            URI of the blob
+
+        """
+
+    @abstractmethod
+    def restore_part(self, upload_id: str, uri: str) -> None:
+        """Move a blob committed from an upload's part back to the part."""
+
+    @abstractmethod
+    def delete_part(self, upload_id: str) -> None:
+        """Delete an upload's part, if any."""
+
+    @abstractmethod
+    def put_file(self, path: Path, key: str) -> str:
+        """Move a local file to the blob ``key``.
+
+        Returns:
+            URI of the blob
+
+        """
+
+    @abstractmethod
+    def chunk_uri(self, digest: str) -> str:
+        """Return the URI of the chunk with the given hex SHA-256."""
+
+    @abstractmethod
+    def put_chunk(self, path: Path, digest: str) -> bool:
+        """Move a local file to the chunk with the given hex SHA-256.
+
+        The file is discarded if the chunk is already stored.
+
+        Returns:
+            Whether the chunk was stored, False if it already was
+
+        """
+
+    @abstractmethod
+    def download(self, uri: str, target: Path) -> None:
+        """Copy a blob to a local file."""
+
+    @abstractmethod
+    def local_path(self, uri: str) -> Path:
+        """Return a local path of a blob, for memory-mapped reads."""
+
+    @abstractmethod
+    def delete(self, uri: str) -> None:
+        """Delete a blob, if it exists."""
@@ -0,0 +1,77 @@
+"""Content-defined chunking of dataset files.
+
+Files are split into chunks at line ends chosen from the content of the
+lines, not from their offsets: an edit, insertion or deletion of rows only
+changes the chunks around it, and re-uploads of a slightly changed file
+share the other chunks. A line ends a chunk when its CRC-32 modulo the
+target size is below its length, which gives chunks of the target size on
+average; chunks are at least a quarter and at most four times that size.
+"""
+
+import zlib
+from collections.abc import Iterable, Iterator
+from itertools import accumulate
+
+_MIN_RATIO = 4
+"""Chunks are at least the target size divided by this ratio."""
+_MAX_RATIO = 4
+"""Chunks are at most the target size multiplied by this ratio."""
+
+
+def _forced_cut(chunk: bytes, start: int, max_size: int) -> int:
+    """Return the end of the last line of a chunk of the maximum size."""
+    end = chunk.rfind(b"\n", start, start + max_size) + 1
+    # Files without line ends are cut at the maximum size
+    return end if end > start else start + max_size
+
+
+def split_chunks(blocks: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Split a stream of bytes into chunks ending at content-defined lines.
+
+    Lines are split and hashed by block, so only the lines ending a chunk
+    are handled one at a time. Blocks are appended to a buffer in place, so
+    chunks many blocks long are not copied again with each block.
+
+    Args:
+        blocks: Bytes of the file, in blocks of any size
+        size: Target size of the chunks
+
+    Yields:
+        Chunks whose concatenation is the file
+
+    """
+    min_size = size // _MIN_RATIO
+    max_size = size * _MAX_RATIO
+    chunk = bytearray()
+    scanned = 0  # Bytes of the chunk in lines already hashed
+    for block in blocks:
+        chunk += block
+        end = chunk.rfind(b"\n") + 1
+        lines = chunk[scanned:end].split(b"\n")
+        lines.pop()
+        ends = accumulate((len(line) + 1 for line in lines), initial=scanned)
+        next(ends)
+        cuts = [
+            line_end
+            for line, crc, line_end in zip(lines, map(zlib.crc32, lines), ends)
+            if crc % size <= len(line)
+        ]
+        scanned = max(scanned, end)
+
+        start = 0
+        for cut in cuts:
+            while cut - start > max_size:
+                forced = _forced_cut(chunk, start, max_size)
+                yield bytes(chunk[start:forced])
+                start = forced
+            if cut - start >= min_size:
+                yield bytes(chunk[start:cut])
+                start = cut
+        while len(chunk) - start >= max_size:
+            forced = _forced_cut(chunk, start, max_size)
+            yield bytes(chunk[start:forced])
+            start = forced
+        del chunk[:start]
+        scanned = max(scanned - start, 0)
+    if chunk:
+        yield bytes(chunk)
@@ -0,0 +1,576 @@
+"""Columnar (Parquet) copies of dataset files.
+
+Datasets are converted from CSV to Parquet once, at ingest, so readers never
+parse text again. The CSV file is split into content-defined chunks of rows,
+and each chunk is written as a Parquet file of one row group, with column
+statistics and a page index: chunks are stored by content, so files
+differing by a few rows share the chunks of their other rows. Datasets
+converted before chunking are a single Parquet file of several row groups.
+Files are read memory-mapped with only the columns needed.
+
+The first row of each row group is recorded at ingest: a window of rows is
+read from the row groups holding it only, so reading rows deep into a
+dataset costs the same as reading its first rows. Filtered windows skip
+row groups using their statistics.
+
+pyarrow is slow to import: import this module where it is used.
+"""
+
+import bisect
+import datetime as dt
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv
+
+from .chunking import split_chunks
+from app.core.settings import settings
+
+_CSV_BLOCK_SIZE = 1024**2
+"""Bytes of CSV parsed at once; the reader keeps a few dozen blocks ahead."""
+_CSV_INFER_SIZE = 16 * 1024**2
+"""Bytes at the start of a CSV file from which column types are inferred."""
+
+
+def json_value(value: Any) -> Any:
+    """Convert a Parquet statistic to a JSON value."""
+    if isinstance(value, dt.date | dt.datetime | dt.time):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def _column_types(path: Path) -> dict[str, pa.DataType]:
+    """Infer the column types of a CSV file from its start.
+
+    Empty columns are read as strings, rather than as nulls that no later
+    value fits.
+    """
+    with path.open("rb") as file:
+        sample = file.read(_CSV_INFER_SIZE)
+    if len(sample) == _CSV_INFER_SIZE:
+        sample = sample[: sample.rfind(b"\n") + 1]
+    return {
+        field.name: pa.string() if pa.types.is_null(field.type) else field.type
+        for field in csv.read_csv(pa.BufferReader(sample)).schema
+    }
+
+
+def _write_chunk(table: pa.Table, path: Path) -> None:
+    """Write a chunk as a Parquet file of one row group."""
+    pq.write_table(
+        table,
+        path,
+        row_group_size=max(table.num_rows, 1),
+        compression="snappy",
+        write_statistics=True,
+        write_page_index=True,
+    )
+
+
+def _widen(table: pa.Table, schema: pa.Schema) -> tuple[pa.Table, pa.Schema]:
+    """Reconcile the schema of a dataset with a chunk of inferred integer columns.
+
+    Integer columns holding decimals in the chunk are widened to floats.
+
+    Returns:
+        The chunk cast to the reconciled schema, and that schema
+
+    Raises:
+        ValueError: If an integer column holds other values in the chunk
+
+    """
+    for index, field in enumerate(schema):
+        inferred = table.schema.field(field.name).type
+        if pa.types.is_integer(field.type) and pa.types.is_floating(inferred):
+            schema = schema.set(index, field.with_type(pa.float64()))
+    return table.select(schema.names).cast(schema), schema
+
+
+def convert_csv(source: Path, target: Path) -> tuple[list[Path], dict[str, Any]]:
+    """Convert a CSV file to Parquet chunks, one chunk at a time.
+
+    Column types are inferred from the start of the file and kept for every
+    chunk, so identifiers such as geo codes keep their type. An integer column is
+    only widened to floats once a chunk holds a decimal in it, and the chunks
+    written before it are then rewritten with the wider type.
+
+    Args:
+        source: CSV file, with a header row
+        target: Directory where the chunks are written
+
+    Returns:
+        The paths of the chunks in order, and the number of rows and
+        statistics of each column, as returned by ``summarize``
+
+    Raises:
+        ValueError: If a value does not match the type of its column
+
+    """
+    column_types = _column_types(source)
+    schema: pa.Schema | None = None
+    chunks: list[Path] = []
+
+    def read(rows: bytes, types: dict[str, pa.DataType]) -> pa.Table:
+        return csv.read_csv(
+            pa.BufferReader(header + rows),
+            read_options=csv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+            convert_options=csv.ConvertOptions(column_types=types),
+        )
+
+    def write(rows: bytes) -> None:
+        nonlocal schema
+        if schema is None:
+            table = read(rows, column_types)
+            schema = table.schema
+        else:
+            types = dict(zip(schema.names, schema.types, strict=True))
+            try:
+                table = read(rows, types)
+            except pa.ArrowInvalid:
+                # Infer the integer columns of the chunk, then widen them
+                fixed = {
+                    name: type_
+                    for name, type_ in types.items()
+                    if not pa.types.is_integer(type_)
+                }
+                table, widened = _widen(read(rows, fixed), schema)
+                if not widened.equals(schema):
+                    for path in chunks:
+                        _write_chunk(pq.read_table(path).cast(widened), path)
+                    schema = widened
+        path = target / f"{len(chunks)}.parquet"
+        _write_chunk(table, path)
+        chunks.append(path)
+
+    with source.open("rb") as file:
+        header = file.readline()
+        blocks = iter(lambda: file.read(_CSV_BLOCK_SIZE), b"")
+        for rows in split_chunks(blocks, settings.DATASET_CHUNK_SIZE):
+            write(rows)
+    if not chunks:
+        # Files of a header only get an empty chunk, for their columns
+        write(b"")
+    return chunks, summarize([pq.read_metadata(path) for path in chunks])
+
+
+def row_group_offsets(metadata: Sequence[pq.FileMetaData]) -> list[int]:
+    """Return the index of the first row of each row group of Parquet files."""
+    offsets = []
+    row = 0
+    for file in metadata:
+        for index in range(file.num_row_groups):
+            offsets.append(row)
+            row += file.row_group(index).num_rows
+    return offsets
+
+
+def summarize(metadata: Sequence[pq.FileMetaData]) -> dict[str, Any]:
+    """Aggregate the row group statistics of Parquet files per column.
+
+    The files must share their schema, like the chunks of a dataset.
+
+    Returns:
+        ``num_rows``, ``row_group_offsets`` and, for each column, its
+        ``name``, ``type``, ``null_count``, ``min`` and ``max``
+
+    """
+    columns = []
+    schema = metadata[0].schema.to_arrow_schema()
+    row_groups = [
+        file.row_group(index)
+        for file in metadata
+        for index in range(file.num_row_groups)
+    ]
+    for index, field in enumerate(schema):
+        null_count = 0
+        minimum = maximum = None
+        for row_group in row_groups:
+            stats = row_group.column(index).statistics
+            if stats is None:
+                continue
+            null_count += stats.null_count or 0
+            if stats.has_min_max:
+                minimum = stats.min if minimum is None else min(minimum, stats.min)
+                maximum = stats.max if maximum is None else max(maximum, stats.max)
+        columns.append(
+            {
+                "name": field.name,
+                "type": str(field.type),
+                "null_count": null_count,
+                "min": json_value(minimum),
+                "max": json_value(maximum),
+            },
+        )
+    return {
+        "num_rows": sum(file.num_rows for file in metadata),
+        "row_group_offsets": row_group_offsets(metadata),
+        "columns": columns,
+    }
+
+
+def open_parquet(path: str | Path) -> pq.ParquetFile:
+    """Open a Parquet file memory-mapped, so reads do not copy it."""
+    return pq.ParquetFile(path, memory_map=True)
+
+
+class _RowGroups:
+    """Row groups of the Parquet files of a dataset, opened as they are read.
+
+    A dataset is either a single file, or chunks of one row group each.
+    """
+
+    def __init__(self, paths: Sequence[str | Path]) -> None:
+        self.paths = paths
+        self._files: dict[int, pq.ParquetFile] = {}
+
+    def _file(self, index: int) -> pq.ParquetFile:
+        if index not in self._files:
+            self._files[index] = open_parquet(self.paths[index])
+        return self._files[index]
+
+    def __len__(self) -> int:
+        if len(self.paths) == 1:
+            return self._file(0).num_row_groups
+        return len(self.paths)
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Schema of the dataset."""
+        return self._file(0).schema_arrow
+
+    def metadata(self, index: int) -> pq.RowGroupMetaData:
+        """Return the metadata of a row group."""
+        if len(self.paths) == 1:
+            return self._file(0).metadata.row_group(index)
+        return self._file(index).metadata.row_group(0)
+
+    def read(self, index: int, columns: list[str]) -> pa.Table:
+        """Read the given columns of a row group."""
+        if len(self.paths) == 1:
+            return self._file(0).read_row_group(index, columns=columns)
+        return self._file(index).read_row_group(0, columns=columns)
+
+    def offsets(self) -> list[int]:
+        """Return the index of the first row of each row group."""
+        if len(self.paths) == 1:
+            return row_group_offsets([self._file(0).metadata])
+        return row_group_offsets(
+            [self._file(index).metadata for index in range(len(self.paths))],
+        )
+
+
+def read_table(
+    paths: Sequence[str | Path],
+    columns: list[str] | None = None,
+) -> pa.Table:
+    """Read the given columns of the Parquet files of a dataset, memory-mapped.
+
+    Args:
+        paths: Parquet files, in order
+        columns: Columns to read, all of them if None
+
+    Returns:
+        The columns, as a table
+
+    """
+    # Files are read in parallel, in order
+    return pq.read_table(
+        [str(path) for path in paths], columns=columns, memory_map=True
+    )
+
+
+def _take(batches: Iterable[pa.RecordBatch], limit: int, schema: pa.Schema) -> pa.Table:
+    """Collect the first ``limit`` rows of a stream of batches."""
+    taken = []
+    rows = 0
+    for batch in batches:
+        taken.append(batch.slice(0, limit - rows))
+        rows += taken[-1].num_rows
+        if rows >= limit:
+            break
+    return pa.Table.from_batches(taken, schema)
+
+
+def head(
+    paths: Sequence[str | Path],
+    limit: int,
+    columns: list[str] | None = None,
+) -> pa.Table:
+    """Read the first rows of the Parquet files of a dataset, memory-mapped.
+
+    Only the row groups holding the rows are read.
+    """
+    schema = open_parquet(paths[0]).schema_arrow
+    if columns is not None:
+        schema = pa.schema([schema.field(name) for name in columns])
+    batches = (
+        batch
+        for path in paths
+        for batch in open_parquet(path).iter_batches(batch_size=limit, columns=columns)
+    )
+    return _take(batches, limit, schema)
+
+
+def csv_head(
+    path: str | Path, limit: int, columns: list[str] | None = None
+) -> pa.Table:
+    """Read the first rows of a CSV file, for datasets never converted."""
+    reader = csv.open_csv(
+        path,
+        convert_options=csv.ConvertOptions(include_columns=columns),
+    )
+    try:
+        return _take(reader, limit, reader.schema)
+    finally:
+        reader.close()
+
+
+@dataclass(frozen=True, slots=True)
+class RowFilter:
+    """Filter on the geo and time period of the rows of a dataset."""
+
+    geo_column: str
+    time_column: str
+    geos: tuple[str, ...] = ()
+    start: dt.date | None = None
+    end: dt.date | None = None
+
+    @property
+    def columns(self) -> list[str]:
+        """Columns the filter reads."""
+        columns = []
+        if self.geos:
+            columns.append(self.geo_column)
+        if self.start is not None or self.end is not None:
+            columns.append(self.time_column)
+        return columns
+
+    def bind(self, schema: pa.Schema) -> "_BoundFilter":
+        """Convert the filter values to the types of the columns of a table.
+
+        Raises:
+            ValueError: If a value cannot be converted to its column's type
+
+        """
+        geos = start = end = None
+        if self.geos:
+            geo_type = schema.field(self.geo_column).type
+            geos = pa.array(self.geos).cast(geo_type).to_pylist()
+        time_type = schema.field(self.time_column).type if self.columns else None
+        if self.start is not None:
+            start = pa.scalar(self.start).cast(time_type).as_py()
+        if self.end is not None:
+            end = pa.scalar(self.end).cast(time_type).as_py()
+        return _BoundFilter(self, geos, start, end)
+
+
+@dataclass(frozen=True, slots=True)
+class _BoundFilter:
+    """Filter whose values have the types of the columns of a table."""
+
+    row_filter: RowFilter
+    geos: list[Any] | None
+    start: Any
+    end: Any
+
+    def expression(self) -> pc.Expression:
+        """Build the filter expression."""
+        geo = pc.field(self.row_filter.geo_column)
+        time = pc.field(self.row_filter.time_column)
+        expression = pc.scalar(True)
+        if self.geos is not None:
+            expression &= geo.isin(self.geos)
+        if self.start is not None:
+            expression &= time >= self.start
+        if self.end is not None:
+            expression &= time <= self.end
+        return expression
+
+    def match(self, row_group: pq.RowGroupMetaData) -> bool | None:
+        """Tell from its statistics whether all rows of a row group match.
+
+        Returns:
+            True if all rows match, False if none does, None if it is unknown
+
+        """
+        stats = {}
+        for index in range(row_group.num_columns):
+            column = row_group.column(index)
+            if column.path_in_schema in self.row_filter.columns:
+                if column.statistics is None or not column.statistics.has_min_max:
+                    return None
+                stats[column.path_in_schema] = column.statistics
+
+        matches = []
+        if self.geos is not None:
+            geo = stats[self.row_filter.geo_column]
+            if geo.max < min(self.geos) or geo.min > max(self.geos):
+                return False
+            matches.append(geo.min == geo.max and geo.min in self.geos)
+        if self.start is not None or self.end is not None:
+            time = stats[self.row_filter.time_column]
+            if (self.start is not None and time.max < self.start) or (
+                self.end is not None and time.min > self.end
+            ):
+                return False
+            matches.append(
+                (self.start is None or time.min >= self.start)
+                and (self.end is None or time.max <= self.end),
+            )
+        has_nulls = any(column.null_count for column in stats.values())
+        return True if all(matches) and not has_nulls else None
+
+
+def _window(
+    tables: Iterable[pa.Table],
+    offset: int,
+    limit: int,
+) -> Iterator[pa.RecordBatch]:
+    """Skip ``offset`` rows of a stream of tables then yield ``limit`` rows."""
+    for table in tables:
+        if offset >= table.num_rows:
+            offset -= table.num_rows
+            continue
+        window = table.slice(offset, limit)
+        offset = 0
+        limit -= window.num_rows
+        yield from window.to_batches()
+        if not limit:
+            return
+
+
+def _filtered_rows(
+    row_groups: _RowGroups,
+    offset: int,
+    limit: int,
+    columns: list[str],
+    bound: _BoundFilter,
+) -> Iterator[pa.RecordBatch]:
+    """Read a window of the rows of a dataset matching a filter.
+
+    Row groups are skipped, or counted, from their statistics when possible.
+    Otherwise their matching rows are counted from the filtered columns, and
+    their other columns are only read if they hold rows of the window.
+    """
+    expression = bound.expression()
+    filter_columns = bound.row_filter.columns
+    read_columns = list(dict.fromkeys([*columns, *filter_columns]))
+    for index in range(len(row_groups)):
+        metadata = row_groups.metadata(index)
+        match = bound.match(metadata)
+        if match is False:
+            continue
+        if match:
+            count = metadata.num_rows
+        else:
+            filtered = row_groups.read(index, filter_columns)
+            count = filtered.filter(expression).num_rows
+        if offset >= count:
+            offset -= count
+            continue
+        table = row_groups.read(index, read_columns)
+        if not match:
+            table = table.filter(expression)
+        window = table.select(columns).slice(offset, limit)
+        offset = 0
+        limit -= window.num_rows
+        yield from window.to_batches()
+        if not limit:
+            return
+
+
+def iter_rows(
+    paths: Sequence[str | Path],
+    offset: int,
+    limit: int,
+    columns: list[str] | None = None,
+    row_filter: RowFilter | None = None,
+    offsets: list[int] | None = None,
+) -> tuple[list[str], Iterator[pa.RecordBatch]]:
+    """Read a window of rows of the Parquet files of a dataset, memory-mapped.
+
+    The first file is opened and the filter checked at once; rows are read
+    as the returned iterator is consumed, from the row groups holding them
+    only.
+
+    Args:
+        paths: Parquet files, in order
+        offset: Number of rows, matching the filter, to skip
+        limit: Maximum number of rows
+        columns: Columns to read, all of them if None
+        row_filter: Filter of the rows, if any
+        offsets: First row of each row group, read from the files if None
+
+    Returns:
+        The names of the columns and the batches of the rows
+
+    Raises:
+        ValueError: If a filter value does not match the type of its column
+
+    """
+    row_groups = _RowGroups(paths)
+    columns = columns or row_groups.schema.names
+    if row_filter is not None and row_filter.columns:
+        bound = row_filter.bind(row_groups.schema)
+        return columns, _filtered_rows(row_groups, offset, limit, columns, bound)
+
+    offsets = offsets or row_groups.offsets()
+    if not offsets:
+        return columns, iter(())
+    first = bisect.bisect_right(offsets, offset) - 1
+    tables = (row_groups.read(index, columns) for index in range(first, len(offsets)))
+    return columns, _window(tables, offset - offsets[first], limit)
+
+
+def csv_rows(
+    path: str | Path,
+    offset: int,
+    limit: int,
+    columns: list[str] | None = None,
+    row_filter: RowFilter | None = None,
+) -> tuple[list[str], Iterator[pa.RecordBatch]]:
+    """Read a window of rows of a CSV file, for datasets never converted.
+
+    The file is parsed from its start, as rows are read.
+
+    Returns:
+        The names of the columns and the batches of the rows
+
+    Raises:
+        ValueError: If a filter value does not match the type of its column
+
+    """
+    reader = csv.open_csv(path)
+    columns = columns or reader.schema.names
+    expression = None
+    if row_filter is not None and row_filter.columns:
+        try:
+            expression = row_filter.bind(reader.schema).expression()
+        except BaseException:
+            reader.close()
+            raise
+    return columns, _csv_rows(reader, offset, limit, columns, expression)
+
+
+def _csv_rows(
+    reader: csv.CSVStreamingReader,
+    offset: int,
+    limit: int,
+    columns: list[str],
+    expression: pc.Expression | None,
+) -> Iterator[pa.RecordBatch]:
+    """Read a window of the rows of a CSV file matching a filter, if any."""
+    try:
+        tables = (pa.Table.from_batches([batch]) for batch in reader)
+        if expression is not None:
+            tables = (table.filter(expression) for table in tables)
+        yield from _window((table.select(columns) for table in tables), offset, limit)
+    finally:
+        reader.close()
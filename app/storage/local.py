@@ -0,0 +1,166 @@
+"""Blob storage on the local filesystem.
+
+Stands in for object storage in development and single-host deployments.
+Parts are written under ``uploads/`` and committed with an atomic rename
+under ``datasets/``, so a blob is never seen partially written. Parts are
+locked with ``flock`` on a lock file next to them, which the system releases
+if the process holding it dies. Chunks are
+written under ``chunks/``, in directories named after the first two hex
+digits of their hash, with an atomic rename too.
+"""
+
+import fcntl
+import os
+import shutil
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .base import BlobStorage
+
+
+class LocalBlobStorage(BlobStorage):
+    """Blob storage in a local directory."""
+
+    def __init__(self, root: str | Path) -> None:
+        """Initialize the storage.
+
+        Args:
+            root: Directory holding the blobs and the parts of uploads
+
+        """
+        self.root = Path(root).resolve()
+        self._uploads = self.root / "uploads"
+        self._blobs = self.root / "datasets"
+        self._chunks = self.root / "chunks"
+
+    def _part(self, upload_id: str) -> Path:
+        return self._uploads / f"{upload_id}.part"
+
+    def _lock(self, upload_id: str) -> Path:
+        return self._uploads / f"{upload_id}.lock"
+
+    def part_size(self, upload_id: str) -> int:
+        """Return the number of bytes written to an upload's part, 0 if none."""
+        try:
+            return self._part(upload_id).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def lock_part(self, upload_id: str) -> Iterator[bool]:
+        """Lock an upload's part against writes from any other process.
+
+        Does not wait for the lock: yields whether it was acquired.
+        """
+        self._uploads.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock(upload_id), os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+            else:
+                yield True
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
+
+    def write_part(self, upload_id: str, offset: int, data: bytes) -> None:
+        """Write bytes to an upload's part at the given offset."""
+        self._uploads.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._part(upload_id), os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+        finally:
+            os.close(fd)
+
+    def truncate_part(self, upload_id: str, size: int) -> None:
+        """Discard the bytes of an upload's part after ``size``."""
+        part = self._part(upload_id)
+        if part.exists():
+            os.truncate(part, size)
+
+    def read_part(self, upload_id: str, chunk_size: int) -> Iterator[bytes]:
+        """Read an upload's part in chunks of at most ``chunk_size`` bytes."""
+        part = self._part(upload_id)
+        if not part.exists():
+            return
+        with part.open("rb") as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    def commit_part(self, upload_id: str, key: str) -> str:
+        """Move a complete upload's part to the blob ``key``.
+
+        Returns:
+            Path of the blob
+
+        """
+        blob = self._blobs / key
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        self._part(upload_id).replace(blob)
+        self._lock(upload_id).unlink(missing_ok=True)
+        return str(blob)
+
+    def restore_part(self, upload_id: str, uri: str) -> None:
+        """Move a blob committed from an upload's part back to the part."""
+        Path(uri).replace(self._part(upload_id))
+
+    def delete_part(self, upload_id: str) -> None:
+        """Delete an upload's part, if any."""
+        self._part(upload_id).unlink(missing_ok=True)
+        self._lock(upload_id).unlink(missing_ok=True)
+
+    def put_file(self, path: Path, key: str) -> str:
+        """Move a local file to the blob ``key``.
+
+        Returns:
+            Path of the blob
+
+        """
+        blob = self._blobs / key
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(path, blob)
+        return str(blob)
+
+    def chunk_uri(self, digest: str) -> str:
+        """Return the path of the chunk with the given hex SHA-256."""
+        return str(self._chunks / digest[:2] / digest)
+
+    def put_chunk(self, path: Path, digest: str) -> bool:
+        """Move a local file to the chunk with the given hex SHA-256.
+
+        The file is discarded if the chunk is already stored.
+
+        Returns:
+            Whether the chunk was stored, False if it already was
+
+        """
+        chunk = Path(self.chunk_uri(digest))
+        if chunk.exists():
+            path.unlink()
+            return False
+        chunk.parent.mkdir(parents=True, exist_ok=True)
+        # Moved across filesystems in two steps, so the chunk is never partial
+        temporary = chunk.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        shutil.move(path, temporary)
+        temporary.replace(chunk)
+        return True
+
+    def download(self, uri: str, target: Path) -> None:
+        """Copy a blob to a local file."""
+        shutil.copyfile(uri, target)
+
+    def local_path(self, uri: str) -> Path:
+        """Return the path of a blob."""
+        return Path(uri)
+
+    def delete(self, uri: str) -> None:
+        """Delete a blob, if it exists."""
+        Path(uri).unlink(missing_ok=True)
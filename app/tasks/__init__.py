@@ -0,0 +1 @@
+"""Background tasks of the application, such as pipeline job execution."""
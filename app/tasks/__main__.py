@@ -0,0 +1,23 @@
+"""Run a standalone pipeline job executor.
+
+Usage:
+    uv run python -m app.tasks
+"""
+
+import asyncio
+import signal
+
+from .executor import JobExecutor
+
+
+async def main() -> None:
+    """Run the job executor until SIGINT or SIGTERM, then drain it."""
+    executor = JobExecutor()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, executor.stop)
+    await executor.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
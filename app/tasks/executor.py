@@ -0,0 +1,509 @@
+"""Pipeline job executor.
+
+The executor claims pending jobs from the ``jobs`` table with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of executors can share
+the table without running a job twice, and runs them in a bounded process
+pool, so CPU-heavy model fits never block the event loop. Which pending jobs
+start is decided by the fair-share scheduler of ``app.tasks.scheduler``.
+
+Each job goes from ``pending`` to ``running``, then to ``succeeded`` (with
+the fitted ``Model``) or ``failed`` (with its error), and each transition is
+published to the watchers of the job's project. On shutdown the
+executor stops claiming jobs and waits for running ones up to a drain
+timeout; jobs still running after it are put back to ``pending``.
+
+Executors renew the lease of their running jobs with a heartbeat. Before
+each claim, running jobs whose lease expired, because their executor
+crashed, are put back to ``pending`` so they stop counting against the
+running jobs of their project.
+
+A worker process that dies, killed for running out of memory for instance,
+breaks the whole pool: the pool is then replaced, and the jobs it was
+running are put back to ``pending``, up to ``JOB_MAX_RETRIES`` times.
+"""
+
+import asyncio
+import contextlib
+import multiprocessing
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, case, update
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .pipeline import JobPayload, JobResult, run_pipeline
+from .scheduler import PRIORITY_RANK, Candidate, schedule
+from app.core import metrics
+from app.core.db import get_async_engine
+from app.core.events import publish_job_events
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.schemas import Dataset, Job, Model, Pipeline
+from app.schemas.job import JobEvent
+from app.services.dataset import dataset_uris
+from app.storage import get_blob_storage
+from app.storage.artifacts import file_sha256
+from app.validations.enums import JobStatus
+
+logger = get_logger(__name__)
+
+INTERRUPTED_ERROR = "Interrupted by shutdown"
+LEASE_EXPIRED_ERROR = "Executor stopped sending heartbeats"
+WORKER_DIED_ERROR = "Worker process died"
+
+Runner = Callable[[JobPayload], JobResult]
+"""Function running a job in a worker process, returning its model artifacts."""
+
+
+def _default_session() -> AsyncSession:
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+def _queue_state_query() -> Select:
+    """Build the query counting pending and running jobs per project."""
+    return (
+        select(Pipeline.project_id, Job.status, func.count(), func.min(Job.created_at))
+        .join(Pipeline, Job.pipeline_id == Pipeline.id)
+        .where(Job.status.in_([JobStatus.pending, JobStatus.running]))
+        .group_by(Pipeline.project_id, Job.status)
+    )
+
+
+def _candidates_query(per_project: int) -> Select:
+    """Build the query returning the first pending jobs of each project.
+
+    No project can start more than ``per_project`` jobs at once, so the
+    scheduler never needs to look further down a project's queue.
+    """
+    position = (
+        func.row_number()
+        .over(
+            partition_by=Pipeline.project_id,
+            order_by=(case(PRIORITY_RANK, value=Job.priority), Job.created_at),
+        )
+        .label("position")
+    )
+    pending = (
+        select(Job.id, Pipeline.project_id, Job.priority, Job.created_at, position)
+        .join(Pipeline, Job.pipeline_id == Pipeline.id)
+        .where(Job.status == JobStatus.pending)
+        .subquery()
+    )
+    return select(
+        pending.c.id,
+        pending.c.project_id,
+        pending.c.priority,
+        pending.c.created_at,
+    ).where(pending.c.position <= per_project)
+
+
+class JobExecutor:
+    """Claims pending pipeline jobs and runs them in a process pool."""
+
+    def __init__(
+        self,
+        runner: Runner = run_pipeline,
+        *,
+        max_workers: int = settings.JOB_EXECUTOR_MAX_WORKERS,
+        poll_interval: float = settings.JOB_EXECUTOR_POLL_INTERVAL,
+        drain_timeout: float = settings.JOB_EXECUTOR_DRAIN_TIMEOUT,
+        heartbeat_interval: float = settings.JOB_HEARTBEAT_INTERVAL,
+        lease_timeout: float = settings.JOB_LEASE_TIMEOUT,
+        max_retries: int = settings.JOB_MAX_RETRIES,
+        session_factory: Callable[[], AsyncSession] = _default_session,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            runner: Picklable function running a job in a worker process
+            max_workers: Maximum number of jobs running at once
+            poll_interval: Seconds between polls of the jobs table when idle
+            drain_timeout: Seconds to wait for running jobs on shutdown
+            heartbeat_interval: Seconds between heartbeats of running jobs
+            lease_timeout: Seconds without heartbeat after which a running
+                job is put back to pending
+            max_retries: Times a job is put back to pending after its worker
+                died, before it fails
+            session_factory: Factory of database sessions
+
+        """
+        self.runner = runner
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_timeout = lease_timeout
+        self.max_retries = max_retries
+        self._session_factory = session_factory
+        self._pool: ProcessPoolExecutor | None = None
+        self._running: dict[str, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self.claimed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.requeued = 0
+        self.expired = 0
+        self.pool_restarts = 0
+        # Pending and running jobs per project, as of the last claim
+        self._queues: dict[str, dict[str, Any]] = {}
+        # Number, total and maximum of queue wait times per project
+        self._waits: dict[str, list[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        metrics.register("job_executor", self.stats)
+
+    async def run(self) -> None:
+        """Claim and run jobs until ``stop`` is called, then drain."""
+        self._pool = self._new_pool()
+        logger.info("⚙️ Job executor started with %d workers", self.max_workers)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping.is_set():
+                free = self.max_workers - len(self._running)
+                if free > 0:
+                    try:
+                        for payload in await self._claim(free):
+                            self._start(payload)
+                    except Exception:
+                        logger.exception("Failed to claim pending jobs")
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                self._wakeup.clear()
+        finally:
+            await self._drain()
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Forking a process running an event loop and threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def stop(self) -> None:
+        """Stop claiming jobs; ``run`` returns once running jobs are drained."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the executor counters and the queue of each project.
+
+        For each project: pending and running jobs, seconds the oldest pending
+        job has waited, and average and maximum wait of the jobs started.
+        """
+        now = datetime.now(UTC)
+        queues = {}
+        for project_id in self._queues.keys() | self._waits.keys():
+            queue = self._queues.get(project_id, {})
+            started, total_wait, max_wait = self._waits.get(project_id, (0, 0.0, 0.0))
+            oldest = queue.get("oldest_pending")
+            queues[project_id] = {
+                "pending": queue.get("pending", 0),
+                "running": queue.get("running", 0),
+                "oldest_pending_wait": (now - oldest).total_seconds()
+                if oldest
+                else 0.0,
+                "wait_avg": total_wait / started if started else 0.0,
+                "wait_max": max_wait,
+            }
+        return {
+            "max_workers": self.max_workers,
+            "running": len(self._running),
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "requeued": self.requeued,
+            "expired": self.expired,
+            "pool_restarts": self.pool_restarts,
+            "queues": queues,
+        }
+
+    async def _claim(self, limit: int) -> list[JobPayload]:
+        """Mark up to ``limit`` pending jobs as running and return them.
+
+        The scheduler picks the jobs among the first pending jobs of each
+        project, given the jobs running across all executors. Picked jobs are
+        then locked, skipping those another executor claimed meanwhile.
+        """
+        async with self._session_factory() as session:
+            await self._requeue_expired(session)
+            await self._refresh_queues(session)
+            running = {p: queue["running"] for p, queue in self._queues.items()}
+            candidates = await session.exec(
+                _candidates_query(settings.JOB_MAX_RUNNING_PER_PROJECT),
+            )
+            picked = schedule(
+                [Candidate(*row) for row in candidates.all()],
+                running,
+                limit,
+                max_running=settings.JOB_MAX_RUNNING_PER_PROJECT,
+                weights=settings.JOB_PROJECT_WEIGHTS,
+            )
+            if not picked:
+                return []
+
+            order = {candidate.job_id: i for i, candidate in enumerate(picked)}
+            query = (
+                select(Job, Pipeline.project_id, Pipeline.model_spec, Dataset)
+                .join(Pipeline, Job.pipeline_id == Pipeline.id)
+                .join(Dataset, Pipeline.dataset_id == Dataset.id)
+                .where(Job.id.in_(order), Job.status == JobStatus.pending)
+                # Jobs locked by another executor are skipped rather than waited on
+                .with_for_update(skip_locked=True, of=Job)
+            )
+            rows = sorted(
+                (await session.exec(query)).all(), key=lambda r: order[r[0].id]
+            )
+            now = datetime.now(UTC)
+            for job, project_id, _, _ in rows:
+                job.status = JobStatus.running
+                job.started_at = now
+                job.heartbeat_at = now
+                job.finished_at = None
+                job.error = None
+                self._observe_wait(project_id, now - job.created_at)
+            await publish_job_events(
+                session,
+                [JobEvent.from_job(job, project_id) for job, project_id, _, _ in rows],
+            )
+            await session.commit()
+
+        self.claimed += len(rows)
+        storage = get_blob_storage()
+        return [
+            JobPayload(
+                job_id=job.id,
+                project_id=project_id,
+                dataset_uris=dataset_uris(storage, dataset),
+                model_spec=model_spec,
+                params=job.params,
+            )
+            for job, project_id, model_spec, dataset in rows
+        ]
+
+    async def _requeue_expired(self, session: AsyncSession) -> None:
+        """Put back to pending the running jobs whose lease expired."""
+        expired_at = datetime.now(UTC) - timedelta(seconds=self.lease_timeout)
+        query = (
+            select(Job, Pipeline.project_id)
+            .join(Pipeline, Job.pipeline_id == Pipeline.id)
+            .where(
+                Job.status == JobStatus.running,
+                # Jobs claimed before leases existed have no heartbeat
+                func.coalesce(Job.heartbeat_at, Job.started_at) < expired_at,
+            )
+            .with_for_update(skip_locked=True, of=Job)
+        )
+        rows = (await session.exec(query)).all()
+        if not rows:
+            return
+        for job, _ in rows:
+            job.status = JobStatus.pending
+            job.started_at = None
+            job.heartbeat_at = None
+            job.error = LEASE_EXPIRED_ERROR
+            logger.warning("⏸️ Job %s put back to pending, lease expired", job.id)
+        await publish_job_events(
+            session,
+            [JobEvent.from_job(job, project_id) for job, project_id in rows],
+        )
+        await session.commit()
+        self.expired += len(rows)
+
+    async def _heartbeat(self) -> None:
+        """Renew the lease of the running jobs until cancelled."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not self._running:
+                continue
+            try:
+                async with self._session_factory() as session:
+                    await session.exec(
+                        update(Job)
+                        .where(
+                            Job.id.in_(list(self._running)),
+                            Job.status == JobStatus.running,
+                        )
+                        .values(heartbeat_at=datetime.now(UTC)),
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to renew the lease of running jobs")
+
+    async def _refresh_queues(self, session: AsyncSession) -> None:
+        """Count the pending and running jobs of each project."""
+        queues: dict[str, dict[str, Any]] = defaultdict(
+            lambda: {"pending": 0, "running": 0, "oldest_pending": None},
+        )
+        for project_id, status, count, oldest in await session.exec(
+            _queue_state_query(),
+        ):
+            queues[project_id][status.value] = count
+            if status == JobStatus.pending:
+                queues[project_id]["oldest_pending"] = oldest
+        self._queues = dict(queues)
+
+    def _observe_wait(self, project_id: str, wait: timedelta) -> None:
+        """Record the time a job waited in its project's queue."""
+        seconds = wait.total_seconds()
+        waits = self._waits[project_id]
+        waits[0] += 1
+        waits[1] += seconds
+        waits[2] = max(waits[2], seconds)
+
+    def _start(self, payload: JobPayload) -> None:
+        """Run a claimed job in the background."""
+        logger.info("▶️ Job %s running", payload.job_id)
+        task = asyncio.create_task(self._execute(payload))
+        self._running[payload.job_id] = task
+
+        def _done(task: asyncio.Task) -> None:
+            self._running.pop(payload.job_id, None)
+            if not task.cancelled() and (exc := task.exception()):
+                logger.error(
+                    "Failed to record the outcome of job %s",
+                    payload.job_id,
+                    exc_info=exc,
+                )
+            # A worker is free, claim the next job without waiting for a poll
+            self._wakeup.set()
+
+        task.add_done_callback(_done)
+
+    async def _execute(self, payload: JobPayload) -> None:
+        """Run a job in the process pool and record its outcome."""
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            result = await loop.run_in_executor(pool, self.runner, payload)
+            checksum = await asyncio.to_thread(
+                file_sha256,
+                get_blob_storage().local_path(result.model_uri),
+            )
+        except asyncio.CancelledError:
+            await self._finish(payload, JobStatus.pending, INTERRUPTED_ERROR)
+            self.requeued += 1
+            logger.warning("⏸️ Job %s put back to pending", payload.job_id)
+            raise
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            await self._retry(payload)
+        except Exception as exc:
+            await self._finish(
+                payload,
+                JobStatus.failed,
+                f"{type(exc).__name__}: {exc}",
+            )
+            self.failed += 1
+            logger.exception("❌ Job %s failed", payload.job_id)
+        else:
+            await self._finish(
+                payload,
+                JobStatus.succeeded,
+                model_uri=result.model_uri,
+                model_sha256=checksum,
+                curves_sha256=result.curves_sha256,
+            )
+            self.succeeded += 1
+            logger.info("✅ Job %s succeeded", payload.job_id)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a pool broken by a dead worker, once for all its jobs."""
+        if self._pool is not broken or self._stopping.is_set():
+            return
+        self._pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.pool_restarts += 1
+        logger.error("💥 A worker process died, replaced the process pool")
+
+    async def _retry(self, payload: JobPayload) -> None:
+        """Put back to pending a job whose worker died, unless it died too often."""
+        async with self._session_factory() as session:
+            job = await session.get(Job, payload.job_id)
+            if job is None:
+                return
+            job.retries += 1
+            job.heartbeat_at = None
+            if job.retries > self.max_retries:
+                job.status = JobStatus.failed
+                job.error = f"{WORKER_DIED_ERROR} {job.retries} times"
+                job.finished_at = datetime.now(UTC)
+                self.failed += 1
+                logger.error("❌ Job %s failed, its worker died", payload.job_id)
+            else:
+                job.status = JobStatus.pending
+                job.error = WORKER_DIED_ERROR
+                job.started_at = None
+                self.requeued += 1
+                logger.warning(
+                    "⏸️ Job %s put back to pending, its worker died",
+                    payload.job_id,
+                )
+            await publish_job_events(
+                session,
+                [JobEvent.from_job(job, payload.project_id)],
+            )
+            await session.commit()
+
+    async def _finish(
+        self,
+        payload: JobPayload,
+        status: JobStatus,
+        error: str | None = None,
+        model_uri: str | None = None,
+        model_sha256: str | None = None,
+        curves_sha256: str | None = None,
+    ) -> None:
+        """Record the outcome of a job, and its model if one was fitted."""
+        async with self._session_factory() as session:
+            job = await session.get(Job, payload.job_id)
+            if job is None:
+                return
+            job.status = status
+            job.error = error
+            job.heartbeat_at = None
+            if status == JobStatus.pending:
+                job.started_at = None
+            else:
+                job.finished_at = datetime.now(UTC)
+            if model_uri is not None:
+                session.add(
+                    Model(
+                        job_id=job.id,
+                        uri=model_uri,
+                        sha256=model_sha256,
+                        curves_sha256=curves_sha256,
+                    ),
+                )
+            await publish_job_events(
+                session,
+                [JobEvent.from_job(job, payload.project_id)],
+            )
+            await session.commit()
+
+    async def _drain(self) -> None:
+        """Wait for running jobs, then put back the ones still running."""
+        if self._running:
+            logger.info("⏳ Draining %d running jobs", len(self._running))
+            _, pending = await asyncio.wait(
+                list(self._running.values()),
+                timeout=self.drain_timeout,
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._pool is not None:
+            # ProcessPoolExecutor cannot stop busy workers through its public
+            # API before Python 3.14, and their jobs were put back to pending
+            for process in (getattr(self._pool, "_processes", None) or {}).values():
+                process.terminate()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        logger.info("⚙️ Job executor stopped")
@@ -0,0 +1,38 @@
+"""Hash the API keys stored in plain text before keys were hashed.
+
+Keys of the ``api_key`` table created before keyed hashes were introduced
+are only usable through the Supabase fallback until hashed. Run once after
+upgrading, with the ``AUTH_SECRET`` of the application; running it again
+does nothing.
+
+Usage:
+    uv run python -m app.tasks.hash_api_keys [--batch-size N]
+"""
+
+import argparse
+import asyncio
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.auth import backfill_api_key_hashes
+from app.core.db import dispose_engines, get_async_engine
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def main(batch_size: int) -> None:
+    """Hash every plain text API key."""
+    try:
+        async with AsyncSession(get_async_engine()) as session:
+            hashed = await backfill_api_key_hashes(session, batch_size)
+    finally:
+        await dispose_engines()
+    logger.info("🔑 Hashed %d plain text API keys", hashed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1_000, help="(default: 1000)")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,192 @@
+"""Pipeline job runner.
+
+Runs in the worker processes of the job executor, so it only receives plain,
+picklable data and never touches the application's database connections.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.core.settings import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from meridian.model.model import Meridian
+
+
+@dataclass(frozen=True, slots=True)
+class JobPayload:
+    """Everything a worker process needs to run a pipeline job."""
+
+    job_id: str
+    project_id: str
+    dataset_uris: list[str]
+    """URIs of the dataset file, or of its Parquet chunks."""
+    model_spec: dict[str, Any]
+    params: dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class JobResult:
+    """Artifacts of a fitted model, returned by worker processes."""
+
+    model_uri: str
+    curves_sha256: str
+    """Checksum of the response curves, exported next to the model artifact."""
+
+
+def run_pipeline(payload: JobPayload) -> JobResult:
+    """Fit the Meridian model of a pipeline job.
+
+    Args:
+        payload: Dataset, model specification and sampling parameters. Parquet
+            datasets are read memory-mapped, with only the columns used.
+
+    Returns:
+        URI of the fitted model artifact, and checksum of its response curves
+
+    Raises:
+        RuntimeError: If Meridian is not installed
+
+    """
+    try:
+        from meridian.data import load
+        from meridian.model import model, spec
+    except ImportError as exc:
+        msg = "Meridian is required to run pipeline jobs"
+        raise RuntimeError(msg) from exc
+
+    columns = payload.model_spec["columns"]
+    options = {
+        "kpi_type": payload.model_spec["kpi_type"],
+        "coord_to_columns": load.CoordToColumns(
+            time=columns["time"],
+            geo=columns["geo"],
+            kpi=columns["kpi"],
+            controls=columns["controls"],
+            media=columns["media"],
+            media_spend=columns["media_spend"],
+        ),
+        "media_to_channel": {media: media for media in columns["media"]},
+        "media_spend_to_channel": dict(
+            zip(columns["media_spend"], columns["media"], strict=True),
+        ),
+    }
+    if payload.dataset_uris[0].endswith(".csv"):
+        loader = load.CsvDataLoader(csv_path=payload.dataset_uris[0], **options)
+    else:
+        loader = load.DataFrameDataLoader(
+            df=_read_parquet(payload.dataset_uris, columns),
+            **options,
+        )
+    mmm = model.Meridian(
+        input_data=loader.load(),
+        model_spec=spec.ModelSpec(
+            max_lag=payload.model_spec["max_lag"],
+            hill_before_adstock=payload.model_spec["hill_before_adstock"],
+            knots=payload.model_spec["knots"],
+        ),
+    )
+    params = payload.params
+    mmm.sample_prior(params["n_prior_draws"])
+    mmm.sample_posterior(
+        n_chains=params["n_chains"],
+        n_adapt=params["n_adapt"],
+        n_burnin=params["n_burnin"],
+        n_keep=params["n_keep"],
+        seed=params["seed"],
+    )
+
+    artifact = Path(settings.JOB_ARTIFACTS_DIR) / f"{payload.job_id}.pkl"
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    model.save_mmm(mmm, str(artifact))
+    return JobResult(
+        model_uri=str(artifact),
+        curves_sha256=_export_response_curves(mmm, str(artifact)),
+    )
+
+
+def _export_response_curves(mmm: "Meridian", model_uri: str) -> str:
+    """Export the response curves of a fitted model next to its artifact.
+
+    The incremental KPI of each channel is computed with its spend scaled by
+    each multiplier of ``CURVE_MULTIPLIERS``, on a thinned posterior, so the
+    API simulates budgets without loading Meridian.
+
+    Returns:
+        Hex SHA-256 of the response curves file
+
+    """
+    import numpy as np
+    from meridian.analysis import analyzer
+
+    from app.analytics.simulation import (
+        CURVE_MULTIPLIERS,
+        ResponseCurves,
+        response_curves_uri,
+    )
+    from app.storage.artifacts import file_sha256
+
+    analysis = analyzer.Analyzer(mmm)
+    points = []
+    for multiplier in CURVE_MULTIPLIERS[1:]:
+        outcome = np.asarray(
+            analysis.incremental_outcome(
+                use_posterior=True,
+                scaling_factor0=0.0,
+                scaling_factor1=multiplier,
+            ),
+        )
+        # Chains × draws × channels to samples × channels
+        points.append(outcome.reshape(-1, outcome.shape[-1]))
+    samples = len(points[0])
+    kept = np.linspace(0, samples - 1, min(samples, settings.SIMULATION_MAX_SAMPLES))
+    incremental = np.stack([np.zeros_like(points[0]), *points])[:, kept.astype(int)]
+
+    spend = mmm.input_data.media_spend
+    curves_uri = response_curves_uri(model_uri)
+    ResponseCurves.save(
+        curves_uri,
+        channels=spend.coords["media_channel"].values.tolist(),
+        spend=spend.sum(dim=[dim for dim in spend.dims if dim != "media_channel"]),
+        multipliers=np.asarray(CURVE_MULTIPLIERS),
+        incremental=incremental,
+    )
+    return file_sha256(curves_uri)
+
+
+def _read_parquet(uris: list[str], columns: dict[str, Any]) -> "pd.DataFrame":
+    """Read the columns used by a model from a Parquet dataset, memory-mapped."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    from app.storage import columnar
+
+    used = [
+        columns["time"],
+        columns["geo"],
+        columns["kpi"],
+        *columns["media"],
+        *columns["media_spend"],
+        *columns["controls"],
+    ]
+    table = columnar.read_table(uris, columns=list(dict.fromkeys(used)))
+    # Meridian expects time coordinates as formatted in CSV files
+    time = table.column(columns["time"])
+    if pa.types.is_temporal(time.type):
+        table = table.set_column(
+            table.schema.get_field_index(columns["time"]),
+            columns["time"],
+            pc.strftime(time, format="%Y-%m-%d"),
+        )
+    # Datasets converted before integer columns were kept have float geo codes
+    geo = table.column(columns["geo"])
+    if pa.types.is_floating(geo.type) and pc.all(pc.equal(geo, pc.floor(geo))).as_py():
+        table = table.set_column(
+            table.schema.get_field_index(columns["geo"]),
+            columns["geo"],
+            geo.cast(pa.int64()),
+        )
+    # Release Arrow buffers as they are converted, to halve peak memory
+    return table.to_pandas(split_blocks=True, self_destruct=True)
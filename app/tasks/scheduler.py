@@ -0,0 +1,80 @@
+"""Fair-share admission of pending pipeline jobs.
+
+Decides which pending jobs start when workers are free, so one project
+submitting a large batch does not hold back everyone else:
+
+- Free workers go to the project with the fewest running jobs relative to
+  its weight (weighted fair share), then to the project of the oldest job.
+- Priority classes only order the jobs of a project: a pending ``high`` job
+  starts before the ``normal`` ones of its project. Priorities are chosen
+  by clients, so they never let a project take the share of another.
+- A project never runs more than ``max_running`` jobs at once.
+"""
+
+from collections import defaultdict, deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.validations.enums import JobPriority
+
+PRIORITY_RANK = {JobPriority.high: 0, JobPriority.normal: 1, JobPriority.low: 2}
+"""Order in which the priority classes of a project are served."""
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """A pending job considered for admission."""
+
+    job_id: str
+    project_id: str
+    priority: JobPriority
+    created_at: datetime
+
+
+def schedule(
+    candidates: Iterable[Candidate],
+    running: Mapping[str, int],
+    slots: int,
+    *,
+    max_running: int,
+    weights: Mapping[str, float] | None = None,
+) -> list[Candidate]:
+    """Pick the pending jobs to start in the free worker slots.
+
+    Args:
+        candidates: Pending jobs, typically the head of each project's queue
+        running: Number of running jobs per project
+        slots: Number of free worker slots
+        max_running: Maximum number of running jobs per project
+        weights: Weight of each project (default: 1)
+
+    Returns:
+        The jobs to start, in order
+
+    """
+    weights = weights or {}
+    queues: dict[str, deque[Candidate]] = defaultdict(deque)
+    for candidate in sorted(
+        candidates,
+        key=lambda c: (PRIORITY_RANK[c.priority], c.created_at),
+    ):
+        queues[candidate.project_id].append(candidate)
+    running = defaultdict(int, running)
+
+    picked: list[Candidate] = []
+    while len(picked) < slots:
+        eligible = [
+            project_id
+            for project_id, queue in queues.items()
+            if queue and running[project_id] < max_running
+        ]
+        if not eligible:
+            break
+        project_id = min(
+            eligible,
+            key=lambda p: (running[p] / weights.get(p, 1.0), queues[p][0].created_at),
+        )
+        picked.append(queues[project_id].popleft())
+        running[project_id] += 1
+    return picked
@@ -0,0 +1 @@
+"""Validation models shared by the database schemas and the API."""
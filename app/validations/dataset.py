@@ -0,0 +1,38 @@
+"""Validation of dataset files."""
+
+import csv
+
+MIN_COLUMNS = 2
+"""A dataset has at least a time column and a KPI column."""
+
+INVALID_HEADER_ERROR = "The first row of the dataset must be a header of column names"
+
+
+def parse_csv_header(line: bytes) -> list[str]:
+    """Parse and validate the header row of a CSV dataset.
+
+    Args:
+        line: First line of the file, without or with its line terminator
+
+    Returns:
+        The column names
+
+    Raises:
+        ValueError: If the header is not UTF-8, or has too few, empty or
+            duplicate column names
+
+    """
+    try:
+        text = line.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        msg = "Dataset files must be encoded in UTF-8"
+        raise ValueError(msg) from exc
+
+    columns = [name.strip() for name in next(csv.reader([text.rstrip("\r\n")]), [])]
+    if len(columns) < MIN_COLUMNS or not all(columns):
+        raise ValueError(INVALID_HEADER_ERROR)
+    duplicates = sorted({name for name in columns if columns.count(name) > 1})
+    if duplicates:
+        msg = f"Duplicate column names: {', '.join(duplicates)}"
+        raise ValueError(msg)
+    return columns
@@ -0,0 +1,32 @@
+"""Enumeration definitions for validation models."""
+
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    """Enumeration for the status of a pipeline job."""
+
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class JobPriority(str, Enum):
+    """Enumeration for the priority class of a pipeline job.
+
+    Pending jobs of a higher class start before those of a lower one of the
+    same project. Classes do not order the jobs of different projects.
+    """
+
+    high = "high"
+    normal = "normal"
+    low = "low"
+
+
+class KpiType(str, Enum):
+    """Enumeration for the type of KPI a model explains."""
+
+    revenue = "revenue"
+    non_revenue = "non_revenue"
@@ -0,0 +1,18 @@
+"""Parameters of a pipeline job."""
+
+from pydantic import BaseModel, Field
+
+
+class JobParams(BaseModel):
+    """Sampling parameters of a model fit."""
+
+    n_chains: int = Field(default=4, ge=1, le=16, description="Number of MCMC chains")
+    n_adapt: int = Field(default=500, ge=1, description="Adaptation steps per chain")
+    n_burnin: int = Field(default=500, ge=0, description="Burn-in steps per chain")
+    n_keep: int = Field(default=1000, ge=1, description="Kept samples per chain")
+    n_prior_draws: int = Field(
+        default=500,
+        ge=1,
+        description="Number of prior predictive draws",
+    )
+    seed: int | None = Field(default=None, description="Random seed of the sampler")
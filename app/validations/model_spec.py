@@ -0,0 +1,50 @@
+"""Model specification of a pipeline."""
+
+from pydantic import BaseModel, Field, model_validator
+
+from .enums import KpiType
+
+MEDIA_SPEND_MISMATCH_ERROR = (
+    "media and media_spend must list the same number of columns"
+)
+
+
+class ColumnMapping(BaseModel):
+    """Columns of a dataset used by a model."""
+
+    time: str = Field(default="time", description="Column of the time period")
+    geo: str = Field(default="geo", description="Column of the geography")
+    kpi: str = Field(default="kpi", description="Column of the KPI to explain")
+    media: list[str] = Field(
+        min_length=1,
+        description="Columns of media execution (impressions, clicks...)",
+    )
+    media_spend: list[str] = Field(
+        min_length=1,
+        description="Columns of media spend, in the order of ``media``",
+    )
+    controls: list[str] = Field(default_factory=list, description="Control columns")
+
+    @model_validator(mode="after")
+    def validate_media_spend(self) -> "ColumnMapping":
+        """Validate each media column has a spend column."""
+        if len(self.media) != len(self.media_spend):
+            raise ValueError(MEDIA_SPEND_MISMATCH_ERROR)
+        return self
+
+
+class ModelSpec(BaseModel):
+    """Specification of a marketing mix model."""
+
+    kpi_type: KpiType = Field(default=KpiType.revenue, description="Type of the KPI")
+    columns: ColumnMapping = Field(description="Dataset columns used by the model")
+    max_lag: int = Field(default=8, ge=0, description="Maximum adstock lag, in periods")
+    hill_before_adstock: bool = Field(
+        default=False,
+        description="Whether the Hill transformation is applied before adstock",
+    )
+    knots: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of knots of the time effects (default: one per period)",
+    )
@@ -0,0 +1,123 @@
+"""Benchmark loading a dataset for a job, from CSV and from Parquet.
+
+Generates a geo × week × channel dataset, converts it to Parquet as done at
+ingest, then loads the columns used by a model the way jobs do: memory-mapped
+Parquet with only those columns, against parsing the whole CSV file. The CSV
+baseline uses Arrow's multi-threaded parser, faster than the pandas parser
+of Meridian's CSV loader, so the speedup is a lower bound. The script exits
+with a non-zero status when the speedup is below its target.
+
+Usage:
+    uv run python -m benchmarks.dataset_load [--rows N] [--min-speedup X]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+from pyarrow import csv
+
+from app.storage import columnar
+
+CHANNELS = 8
+CONTROLS = 2
+GEOS = 200
+BLOCK_ROWS = 100_000
+
+# A model typically uses some of the channels and controls of a dataset
+USED_COLUMNS = [
+    "time",
+    "geo",
+    "kpi",
+    *(f"media_{i}" for i in range(CHANNELS // 2)),
+    *(f"spend_{i}" for i in range(CHANNELS // 2)),
+    "control_0",
+]
+
+
+def _block() -> pa.Table:
+    """Build a block of rows, geos varying fastest."""
+    start = date(2020, 1, 6)
+    columns = {
+        "time": [start + timedelta(weeks=i // GEOS) for i in range(BLOCK_ROWS)],
+        "geo": [f"geo_{i % GEOS}" for i in range(BLOCK_ROWS)],
+        "kpi": [random.uniform(0, 1e5) for _ in range(BLOCK_ROWS)],
+    }
+    for i in range(CHANNELS):
+        columns[f"media_{i}"] = [random.uniform(0, 1e6) for _ in range(BLOCK_ROWS)]
+        columns[f"spend_{i}"] = [random.uniform(0, 1e4) for _ in range(BLOCK_ROWS)]
+    for i in range(CONTROLS):
+        columns[f"control_{i}"] = [random.gauss(0, 1) for _ in range(BLOCK_ROWS)]
+    return pa.table(columns)
+
+
+def generate(path: Path, rows: int) -> None:
+    """Write a CSV dataset of ``rows`` rows."""
+    block = _block()
+    with csv.CSVWriter(path, block.schema) as writer:
+        for offset in range(0, rows, BLOCK_ROWS):
+            writer.write_table(block.slice(0, rows - offset))
+
+
+def measure(load: Callable[[], pa.Table]) -> tuple[float, int]:
+    """Return the seconds taken by a load and the size of the loaded table."""
+    start = time.perf_counter()
+    table = load()
+    return time.perf_counter() - start, table.nbytes
+
+
+def main() -> None:
+    """Run the benchmark, print the load times and enforce the target."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=5_000_000,
+        help="Number of rows of the dataset (default: 5,000,000)",
+    )
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=3.0,
+        help="Minimum speedup of Parquet over CSV loading (default: 3)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "dataset.csv"
+        target = Path(tmp) / "chunks"
+        target.mkdir()
+        generate(source, args.rows)
+
+        start = time.perf_counter()
+        chunks, _ = columnar.convert_csv(source, target)
+        convert_time = time.perf_counter() - start
+
+        csv_time, csv_memory = measure(lambda: csv.read_csv(source))
+        parquet_time, parquet_memory = measure(
+            lambda: columnar.read_table(chunks, columns=USED_COLUMNS),
+        )
+
+        mb = 1024**2
+        parquet_size = sum(chunk.stat().st_size for chunk in chunks)
+        print(
+            f"{args.rows:,} rows: CSV {source.stat().st_size / mb:.0f}MB, "
+            f"Parquet {parquet_size / mb:.0f}MB in {len(chunks)} chunks "
+            f"(converted once in {convert_time:.2f}s)",
+        )
+    print(f"CSV load:     {csv_time:.2f}s, {csv_memory / mb:.0f}MB")
+    print(f"Parquet load: {parquet_time:.2f}s, {parquet_memory / mb:.0f}MB")
+    speedup = csv_time / parquet_time
+    print(f"speedup: {speedup:.1f}x (target {args.min_speedup}x)")
+    if speedup < args.min_speedup:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark profiling a dataset.
+
+Generates a 200-geo × 156-week × 20-channel dataset, with an impressions and
+a spend column per channel, converts it to Parquet as done at ingest, then
+profiles it the way the profile endpoint does on a cache miss: reading the
+memory-mapped Parquet file and aggregating every column in one vectorized
+pass. The script exits with a non-zero status when profiling is over its
+time budget.
+
+Usage:
+    uv run python -m benchmarks.profiling [--geos N] [--weeks N] [--channels N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+from pyarrow import csv
+
+from app.analytics.profiling import profile_table
+from app.storage import columnar
+
+RUNS = 5
+
+
+def generate(path: Path, geos: int, weeks: int, channels: int) -> None:
+    """Write a CSV dataset with a row per geo and week."""
+    rows = geos * weeks
+    start = date(2021, 1, 4)
+    columns = {
+        "time": [start + timedelta(weeks=i // geos) for i in range(rows)],
+        "geo": [f"geo_{i % geos}" for i in range(rows)],
+        "kpi": [random.lognormvariate(10, 1) for _ in range(rows)],
+        "population": [float(random.randint(10_000, 1_000_000)) for _ in range(rows)],
+    }
+    for i in range(channels):
+        columns[f"media_{i}"] = [random.uniform(0, 1e6) for _ in range(rows)]
+        columns[f"spend_{i}"] = [random.uniform(0, 1e4) for _ in range(rows)]
+    csv.write_csv(pa.table(columns), path)
+
+
+def main() -> None:
+    """Run the benchmark, print the profiling time and enforce the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--geos", type=int, default=200, help="(default: 200)")
+    parser.add_argument("--weeks", type=int, default=156, help="(default: 156)")
+    parser.add_argument("--channels", type=int, default=20, help="(default: 20)")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=0.5,
+        help="Time budget of a profile, median of 5 runs (default: 0.5)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "dataset.csv"
+        target = Path(tmp) / "chunks"
+        target.mkdir()
+        generate(source, args.geos, args.weeks, args.channels)
+        chunks, _ = columnar.convert_csv(source, target)
+
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            profile = profile_table(columnar.read_table(chunks), "time", "geo")
+            timings.append(time.perf_counter() - start)
+
+    coverage = profile["time_coverage"]
+    print(
+        f"{profile['num_rows']:,} rows × {len(profile['columns'])} columns, "
+        f"{len(coverage['geos'])} geos × {coverage['periods']} periods",
+    )
+    median = statistics.median(timings)
+    print(f"profile: {median * 1000:.0f}ms (budget {args.max_seconds * 1000:.0f}ms)")
+    if median > args.max_seconds:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the overhead of rate limiting per request.
+
+Drives the ``rate_limit`` and ``rate_limit_project`` dependencies the way
+FastAPI does for an authenticated request on a project route: key and
+project buckets, plus a concurrency slot held until the response. Buckets are refilled between requests so every request is
+allowed, which is the path taken by most traffic. The script exits with a
+non-zero status when the overhead exceeds its budget.
+
+Usage:
+    uv run python -m benchmarks.rate_limit [--budget US]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.rate_limit import rate_limit, rate_limit_project, rate_limiter
+from app.core.settings import settings
+from app.models import Project, User
+
+REQUESTS = 100_000
+KEYS = 1_000
+
+
+async def run(requests: int) -> float:
+    """Return the mean time spent in the dependency per request, in seconds."""
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=f"byn_{i}")
+        for i in range(KEYS)
+    ]
+    user = User(id="user", email="user@example.com")
+    project = Project(id="project", name="Project", slug="project", user_id=user.id)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        dependency = rate_limit(credentials[i % KEYS], user)
+        await anext(dependency)
+        await rate_limit_project(project)
+        await dependency.aclose()
+    return (time.perf_counter() - start) / requests
+
+
+def main() -> None:
+    """Run the benchmark, print the overhead and enforce the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=50.0,
+        help="Maximum overhead per request, in µs (default: 50)",
+    )
+    args = parser.parse_args()
+
+    # Never run out of tokens, so only the allowed path is measured
+    settings.RATE_LIMIT_KEY_BURST = settings.RATE_LIMIT_PROJECT_BURST = REQUESTS
+    rate_limiter.enabled = True
+
+    overhead = asyncio.run(run(REQUESTS)) * 1e6
+    print(f"rate limit overhead: {overhead:.1f}µs per request (budget {args.budget}µs)")
+    if overhead > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the serialization of project listings.
+
+Compares FastAPI's response model path (ORM objects validated against
+``list[ProjectPublic]`` then stdlib JSON encoding) with the path used by the
+list endpoints (projected row tuples rendered by ``FastJSONResponse``).
+
+Usage:
+    uv run python -m benchmarks.serialization
+"""
+
+import asyncio
+import timeit
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import FastJSONResponse
+from app.models.project import Project, ProjectPublic
+from app.services.project import PUBLIC_COLUMNS, _to_page
+
+SIZES = (1_000, 10_000)
+REPEAT = 5
+
+response_field = create_model_field(
+    "Response",
+    list[ProjectPublic],
+    mode="serialization",
+)
+
+
+def make_projects(n: int) -> list[Project]:
+    """Build ``n`` projects as returned by the database."""
+    start = datetime.now(UTC)
+    return [
+        Project(
+            id=str(uuid4()),
+            name=f"Project {i}",
+            slug=f"project-{i}",
+            user_id="user",
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def response_model_path(projects: list[Project]) -> bytes:
+    """Serialize through FastAPI's response model validation."""
+    content = [{**p.model_dump(), "owner_id": p.user_id} for p in projects]
+    body = asyncio.run(
+        serialize_response(
+            field=response_field,
+            response_content=content,
+            exclude_none=True,
+            exclude_unset=True,
+        ),
+    )
+    return JSONResponse(body).body
+
+
+def trusted_path(projects: list[Project]) -> bytes:
+    """Serialize projected rows with orjson."""
+    fields = tuple(PUBLIC_COLUMNS)
+    rows = [(p.id, p.name, p.user_id, p.created_at, p.updated_at) for p in projects]
+    page = _to_page(rows, fields, fields, len(rows))
+    return FastJSONResponse(page.items).body
+
+
+def best_time(fn: Callable[[list[Project]], bytes], projects: list[Project]) -> float:
+    """Return the best time of ``fn(projects)`` over ``REPEAT`` runs."""
+    return min(timeit.repeat(partial(fn, projects), number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    """Run the benchmark and print timings in milliseconds."""
+    print(f"{'projects':>10} {'response model':>16} {'trusted':>10} {'speedup':>8}")
+    for size in SIZES:
+        projects = make_projects(size)
+        before = best_time(response_model_path, projects)
+        after = best_time(trusted_path, projects)
+        print(
+            f"{size:>10} {before * 1000:>14.1f}ms {after * 1000:>8.1f}ms "
+            f"{before / after:>7.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark simulating budget scenarios on a deployed model.
+
+Generates the response curves of a 20-channel model with 1,000 posterior
+samples, from Hill curves with random parameters per sample, then simulates
+a batch of 5,000 random budget scenarios the way the simulate endpoint does
+once the model is in memory, with and without percentiles. The script exits
+with a non-zero status when the throughput with percentiles is under its
+target.
+
+Usage:
+    uv run python -m benchmarks.simulation [--scenarios N] [--channels N] [--samples N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from app.analytics.simulation import CURVE_MULTIPLIERS, ResponseCurves, simulate
+from app.core.settings import settings
+
+RUNS = 5
+
+
+def generate(channels: int, samples: int) -> ResponseCurves:
+    """Build response curves from Hill curves with random parameters."""
+    rng = np.random.default_rng(0)
+    multipliers = np.asarray(CURVE_MULTIPLIERS)
+    scale = rng.lognormal(10, 1, size=(samples, channels))
+    half_saturation = rng.uniform(0.5, 2, size=(samples, channels))
+    slope = rng.uniform(1, 3, size=(samples, channels))
+    ratio = (multipliers[:, None, None] / half_saturation) ** slope
+    return ResponseCurves.from_arrays(
+        channels=[f"channel_{i}" for i in range(channels)],
+        spend=rng.uniform(1e5, 1e6, size=channels),
+        multipliers=multipliers,
+        incremental=scale * ratio / (1 + ratio),
+    )
+
+
+def main() -> None:
+    """Run the benchmark, print the throughput and enforce the target."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=5_000, help="(default: 5000)")
+    parser.add_argument("--channels", type=int, default=20, help="(default: 20)")
+    parser.add_argument("--samples", type=int, default=1_000, help="(default: 1000)")
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=20_000,
+        help="Scenarios simulated per second, median of 5 runs (default: 20000)",
+    )
+    args = parser.parse_args()
+
+    curves = generate(args.channels, args.samples)
+    rng = np.random.default_rng(1)
+    budgets = curves.spend * rng.uniform(0, 3, size=(args.scenarios, args.channels))
+
+    print(
+        f"{args.scenarios:,} scenarios × {args.channels} channels × "
+        f"{args.samples:,} samples",
+    )
+    rates = {}
+    for intervals in (True, False):
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            simulate(
+                curves,
+                budgets,
+                settings.SIMULATION_BLOCK_ELEMENTS,
+                intervals=intervals,
+            )
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        rates[intervals] = args.scenarios / median
+        label = "with percentiles" if intervals else "means only"
+        print(
+            f"{label}: {median * 1000:.0f}ms, {rates[intervals]:,.0f} scenarios/s",
+        )
+    print(f"target: {args.min_rate:,.0f} scenarios/s with percentiles")
+    if rates[True] < args.min_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
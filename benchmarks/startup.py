@@ -0,0 +1,107 @@
+"""Benchmark the cold start of the application.
+
+Each run starts a fresh interpreter, imports ``app.main`` and serves a first
+request through the full lifespan, which is what an autoscaled instance goes
+through before it can take traffic. The script exits with a non-zero status
+when the best run exceeds a budget, or when importing the application imports
+a module meant to be imported on first use, so it can gate CI.
+
+Settings are read from the environment as usual.
+
+Usage:
+    uv run python -m benchmarks.startup [--import-budget MS] [--first-request-budget MS]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+RUNS = 5
+
+LAZY_MODULES = (
+    "numpy",
+    "pyarrow",
+    "pandas",
+    "supabase",
+    "asyncpg",
+    "multiprocessing",
+    "app.tasks.executor",
+    "app.tasks.pipeline",
+)
+"""Slow modules only imported on first use, never by importing the application."""
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+loaded = [name for name in {lazy!r} if name in sys.modules]
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/health").raise_for_status()
+    served = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_request": served - start}}))
+print(json.dumps(loaded))
+"""
+
+
+def probe() -> tuple[dict[str, float], list[str]]:
+    """Time one cold start in a fresh interpreter, in milliseconds.
+
+    Returns:
+        The timings, and the modules of ``LAZY_MODULES`` imported with the
+        application
+
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    *_, timings, loaded = output.splitlines()
+    timings = json.loads(timings)
+    return {name: seconds * 1000 for name, seconds in timings.items()}, json.loads(
+        loaded
+    )
+
+
+def main() -> None:
+    """Run the benchmark, print timings and enforce the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=900.0,
+        help="Maximum time to import the application, in ms (default: 900)",
+    )
+    parser.add_argument(
+        "--first-request-budget",
+        type=float,
+        default=1100.0,
+        help="Maximum time until the first response, in ms (default: 1100)",
+    )
+    args = parser.parse_args()
+
+    probes = [probe() for _ in range(RUNS)]
+    runs = [timings for timings, _ in probes]
+    best = {name: min(run[name] for run in runs) for name in runs[0]}
+    loaded = sorted({name for _, names in probes for name in names})
+    budgets = {"import": args.import_budget, "first_request": args.first_request_budget}
+
+    print(f"{'phase':>14} {'best':>10} {'budget':>10}")
+    over_budget = False
+    for name, budget in budgets.items():
+        over_budget |= best[name] > budget
+        flag = "" if best[name] <= budget else "  over budget"
+        print(f"{name:>14} {best[name]:>8.1f}ms {budget:>8.1f}ms{flag}")
+    if loaded:
+        print(f"Imported with the application: {', '.join(loaded)}")
+
+    if over_budget or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Fixtures running the application on SQLite and local storage."""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import get_async_session
+from app.core.dependencies import get_current_user
+from app.core.rate_limit import rate_limiter
+from app.core.response_cache import response_cache
+from app.main import app
+from app.models import Project, User
+from app.storage import LocalBlobStorage, get_blob_storage
+
+USER = User(id="user", email="user@example.com")
+PROJECT_ID = "project"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_: JSONB, compiler: object, **kwargs: object) -> str:
+    """Store JSONB columns as JSON on SQLite."""
+    return "JSON"
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[AsyncEngine]:
+    """Database with the tables of the application, a user and a project."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async def setup() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(User(id=USER.id, email=USER.email))
+            session.add(
+                Project(id=PROJECT_ID, name="Project", slug="project", user_id=USER.id)
+            )
+            await session.commit()
+
+    asyncio.run(setup())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> LocalBlobStorage:
+    """Local blob storage in a temporary directory."""
+    return LocalBlobStorage(tmp_path / "storage")
+
+
+@pytest.fixture
+def client(
+    engine: AsyncEngine,
+    storage: LocalBlobStorage,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[TestClient]:
+    """Client of the application, authenticated as the user of the project."""
+
+    async def session() -> AsyncIterator[AsyncSession]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    monkeypatch.setattr(rate_limiter, "enabled", False)
+    monkeypatch.setattr(response_cache, "enabled", False)
+    app.dependency_overrides[get_async_session] = session
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_blob_storage] = lambda: storage
+    yield TestClient(app, headers={"Authorization": "Bearer key"})
+    app.dependency_overrides.clear()
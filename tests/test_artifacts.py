@@ -0,0 +1,141 @@
+"""Tests of the local cache of model artifacts and the registry of models."""
+
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.analytics import ModelRegistry
+from app.analytics.simulation import ResponseCurves, response_curves_uri
+from app.storage import ArtifactCache, LocalBlobStorage
+from app.storage.artifacts import file_sha256
+
+SIZE = 1_000
+
+
+@pytest.fixture
+def blobs(tmp_path: Path) -> dict[str, str]:
+    """URIs of artifacts of ``SIZE`` bytes, by name."""
+    root = tmp_path / "blobs"
+    root.mkdir()
+    uris = {}
+    for name in ("a", "b", "c", "d"):
+        path = root / name
+        path.write_bytes(name.encode() * SIZE)
+        uris[name] = str(path)
+    return uris
+
+
+def _cache(tmp_path: Path, max_size: int = 10 * SIZE) -> ArtifactCache:
+    return ArtifactCache(
+        LocalBlobStorage(tmp_path / "storage"),
+        tmp_path / "cache",
+        max_size=max_size,
+    )
+
+
+def _directory_size(cache: ArtifactCache) -> int:
+    return sum(path.stat().st_size for path in cache.root.iterdir())
+
+
+def test_hits_and_checksums(tmp_path: Path, blobs: dict[str, str]) -> None:
+    cache = _cache(tmp_path)
+    checksum = file_sha256(blobs["a"])
+
+    async def run() -> None:
+        path = await cache.get(blobs["a"], checksum)
+        assert await cache.get(blobs["a"], checksum) == path
+        with pytest.raises(ValueError):
+            await cache.get(blobs["b"], checksum)
+
+    asyncio.run(run())
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 1
+    # Artifacts failing their checksum leave nothing behind
+    assert len(list(cache.root.iterdir())) == 1
+
+
+def test_concurrent_requests_share_download(
+    tmp_path: Path,
+    blobs: dict[str, str],
+) -> None:
+    cache = _cache(tmp_path)
+
+    async def run() -> list[Path]:
+        return await asyncio.gather(*(cache.get(blobs["a"]) for _ in range(5)))
+
+    assert len(set(asyncio.run(run()))) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["bytes_downloaded"] == SIZE
+
+
+def test_processes_sharing_directory_stay_within_size(
+    tmp_path: Path,
+    blobs: dict[str, str],
+) -> None:
+    first = _cache(tmp_path, max_size=2 * SIZE)
+    second = _cache(tmp_path, max_size=2 * SIZE)
+
+    async def run() -> None:
+        await first.get(blobs["a"])
+        await second.get(blobs["b"])
+        # Recently used by the first process, so the second keeps it
+        await first.get(blobs["a"])
+        await second.get(blobs["c"])
+
+    asyncio.run(run())
+
+    assert _directory_size(first) == 2 * SIZE
+    assert sorted(path.read_bytes()[:1] for path in first.root.iterdir()) == [
+        b"a",
+        b"c",
+    ]
+
+
+def test_open_artifact_stays_readable_once_evicted(
+    tmp_path: Path,
+    blobs: dict[str, str],
+) -> None:
+    cache = _cache(tmp_path, max_size=SIZE)
+
+    async def run() -> bytes:
+        with await cache.open(blobs["a"]) as file:
+            await cache.get(blobs["b"])
+            return file.read()
+
+    assert asyncio.run(run()) == b"a" * SIZE
+    assert cache.stats()["evictions"] == 1
+
+
+def _save_curves(model_uri: str, incremental: float) -> str:
+    """Save the response curves of a model, and return their checksum."""
+    path = response_curves_uri(model_uri)
+    ResponseCurves.save(
+        path,
+        ["tv", "search"],
+        np.array([100.0, 200.0]),
+        np.array([0.0, 1.0]),
+        np.full((2, 3, 2), incremental),
+    )
+    return file_sha256(path)
+
+
+def test_registry_reloads_replaced_curves(tmp_path: Path) -> None:
+    model_uri = str(tmp_path / "model.pkl")
+    registry = ModelRegistry(_cache(tmp_path, max_size=1024**2), max_size=10)
+
+    async def get(checksum: str) -> ResponseCurves:
+        return await registry.get(model_uri, checksum)
+
+    first = _save_curves(model_uri, 1.0)
+    assert asyncio.run(get(first)).curves.max() == 1.0
+    second = _save_curves(model_uri, 2.0)
+
+    assert asyncio.run(get(second)).curves.max() == 2.0
+    assert asyncio.run(get(second)).channels == ("tv", "search")
+    assert registry.stats()["misses"] == 2
+    assert registry.stats()["hits"] == 1
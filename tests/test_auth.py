@@ -0,0 +1,267 @@
+"""Tests of the authentication of API keys, through their filter and cache."""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import auth, dependencies, notifications
+from app.core.auth import (
+    API_KEYS_CHANNEL,
+    api_key_cache,
+    api_key_filter,
+    authenticate_api_key,
+    backfill_api_key_hashes,
+    hash_api_key,
+    invalidate_user,
+    is_api_key_hash,
+)
+from app.core.dependencies import get_current_user
+from app.core.settings import settings
+from app.main import app
+from app.models.key import Key, KeyCreate
+from app.services import AsyncKeyService
+from tests.conftest import PROJECT_ID, USER
+
+DATASET = f"/v1/projects/{PROJECT_ID}/datasets/missing"
+
+
+@pytest.fixture
+def key_filter(
+    client: TestClient,
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[None]:
+    """Built, empty API key filter, with keys authenticated for real."""
+    del app.dependency_overrides[get_current_user]
+    monkeypatch.setattr(settings, "AUTH_SUPABASE_FALLBACK", False)
+    monkeypatch.setattr(auth, "get_async_engine", lambda: engine)
+    for name in ("_filter", "synced_at", "rejections", "syncs", "rebuilds"):
+        monkeypatch.setattr(api_key_filter, name, getattr(api_key_filter, name))
+    api_key_filter.rebuild([], time.perf_counter())
+    api_key_filter.synced_at = datetime.now(UTC)
+    api_key_cache.clear()
+    yield
+    api_key_cache.clear()
+
+
+def _get(client: TestClient, key: str) -> int:
+    return client.get(DATASET, headers={"Authorization": f"Bearer {key}"}).status_code
+
+
+def _create_key(engine: AsyncEngine) -> str:
+    async def create() -> str:
+        async with AsyncSession(engine) as session:
+            created = await AsyncKeyService(session).create(
+                KeyCreate(description="test", project_id=PROJECT_ID),
+            )
+            return created.key
+
+    return asyncio.run(create())
+
+
+def _revoke_key(engine: AsyncEngine, key: str) -> None:
+    async def revoke() -> None:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            db_key = (
+                await session.exec(select(Key).where(Key.key == hash_api_key(key)))
+            ).one()
+            assert await AsyncKeyService(session).revoke(db_key.id)
+
+    asyncio.run(revoke())
+
+
+def _insert_key(engine: AsyncEngine, key: str) -> None:
+    """Store a key without going through the API, as another service would."""
+
+    async def insert() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(
+                Key(description="test", project_id=PROJECT_ID, key=hash_api_key(key)),
+            )
+            await session.commit()
+
+    asyncio.run(insert())
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_unknown_keys_are_rejected_without_lookup(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def lookup(*args: object) -> None:
+        raise AssertionError
+
+    monkeypatch.setattr(dependencies, "authenticate_api_key", lookup)
+
+    for _ in range(20):
+        assert _get(client, uuid.uuid4().hex) == 401
+
+    assert api_key_filter.stats()["rejections"] == 20
+    assert api_key_filter.stats()["syncs"] == 0
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_created_keys_are_accepted_right_away(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    key = _create_key(engine)
+
+    assert _get(client, key) == 404
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_notified_keys_are_added_to_filter(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    key = "byn_created_by_another_worker"
+    _insert_key(engine, key)
+    assert _get(client, key) == 401
+
+    notifications._dispatch(None, 0, API_KEYS_CHANNEL, hash_api_key(key))
+
+    assert _get(client, key) == 404
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_sync_catches_up_with_keys_created_elsewhere(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    key = "byn_created_elsewhere"
+    _insert_key(engine, key)
+    assert _get(client, key) == 401
+
+    asyncio.run(auth._sync_api_key_filter())
+
+    assert _get(client, key) == 404
+    assert api_key_filter.stats()["syncs"] == 1
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_authenticated_keys_are_cached_until_revoked(
+    client: TestClient,
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    key = _create_key(engine)
+    lookups = []
+
+    async def lookup(*args: object) -> object:
+        lookups.append(args)
+        return await auth.authenticate_api_key(*args)
+
+    monkeypatch.setattr(dependencies, "authenticate_api_key", lookup)
+
+    assert [_get(client, key) for _ in range(3)] == [404, 404, 404]
+    assert len(lookups) == 1
+
+    _revoke_key(engine, key)
+
+    assert _get(client, key) == 401
+    assert _get(client, key) == 401
+    assert len(lookups) == 2
+
+
+@pytest.mark.usefixtures("key_filter")
+def test_invalidated_users_are_looked_up_again(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    key = _create_key(engine)
+    assert _get(client, key) == 404
+    assert api_key_cache.peek(hash_api_key(key)).id == USER.id
+
+    assert invalidate_user(USER.id) == 1
+
+    assert api_key_cache.peek(hash_api_key(key)) is None
+    assert _get(client, key) == 404
+
+
+def test_keys_are_hashed_with_secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    key_hash = hash_api_key("byn_key")
+
+    assert is_api_key_hash(key_hash)
+    assert not is_api_key_hash("byn_key")
+    assert hash_api_key("byn_key") == key_hash
+    assert hash_api_key("byn_other") != key_hash
+
+    monkeypatch.setattr(settings, "AUTH_SECRET", SecretStr("other"))
+
+    assert hash_api_key("byn_key") != key_hash
+
+
+def test_backfill_hashes_plain_keys_once(engine: AsyncEngine) -> None:
+    plain_keys = [f"byn_legacy_{index}" for index in range(5)]
+
+    async def backfill() -> tuple[int, int, list[str]]:
+        async with AsyncSession(engine) as session:
+            session.add_all(
+                Key(description="legacy", project_id=PROJECT_ID, key=key)
+                for key in plain_keys
+            )
+            session.add(
+                Key(
+                    description="hashed",
+                    project_id=PROJECT_ID,
+                    key=hash_api_key("byn_hashed"),
+                )
+            )
+            await session.commit()
+            first = await backfill_api_key_hashes(session, batch_size=2)
+            second = await backfill_api_key_hashes(session, batch_size=2)
+            stored = (await session.exec(select(Key.key))).all()
+            return first, second, stored
+
+    first, second, stored = asyncio.run(backfill())
+
+    assert (first, second) == (5, 0)
+    assert sorted(stored) == sorted(
+        hash_api_key(key) for key in [*plain_keys, "byn_hashed"]
+    )
+
+
+def test_only_active_unexpired_keys_authenticate(engine: AsyncEngine) -> None:
+    now = datetime.now(UTC)
+    keys = {
+        "byn_valid": {},
+        "byn_unexpired": {"expires_at": now + timedelta(days=1)},
+        "byn_expired": {"expires_at": now - timedelta(days=1)},
+        "byn_inactive": {"is_active": False},
+    }
+
+    async def authenticate() -> dict[str, str | None]:
+        async with AsyncSession(engine) as session:
+            session.add_all(
+                Key(
+                    description="test",
+                    project_id=PROJECT_ID,
+                    key=hash_api_key(key),
+                    **fields,
+                )
+                for key, fields in keys.items()
+            )
+            await session.commit()
+            users = {}
+            for key in [*keys, "byn_unknown"]:
+                user = await authenticate_api_key(session, hash_api_key(key))
+                users[key] = user.id if user else None
+            return users
+
+    assert asyncio.run(authenticate()) == {
+        "byn_valid": USER.id,
+        "byn_unexpired": USER.id,
+        "byn_expired": None,
+        "byn_inactive": None,
+        "byn_unknown": None,
+    }
@@ -0,0 +1,39 @@
+"""Tests of the Bloom filter."""
+
+from app.core.bloom import BloomFilter
+
+CAPACITY = 5_000
+ERROR_RATE = 0.01
+
+
+def _filled() -> BloomFilter:
+    bloom = BloomFilter(capacity=CAPACITY, error_rate=ERROR_RATE)
+    for index in range(CAPACITY):
+        bloom.add(f"present_{index}")
+    return bloom
+
+
+def test_added_items_are_always_found() -> None:
+    bloom = _filled()
+
+    assert all(f"present_{index}" in bloom for index in range(CAPACITY))
+    assert len(bloom) == CAPACITY
+
+
+def test_false_positive_rate_stays_near_target() -> None:
+    bloom = _filled()
+    trials = 20_000
+
+    false_positives = sum(f"absent_{index}" in bloom for index in range(trials))
+
+    assert false_positives / trials < 2 * ERROR_RATE
+    assert bloom.false_positive_rate < 2 * ERROR_RATE
+    # About 9.6 bits per item at a 1% error rate
+    assert bloom.size_bytes < CAPACITY * 10 / 8 + 1
+
+
+def test_empty_filter_contains_nothing() -> None:
+    bloom = BloomFilter(capacity=0, error_rate=ERROR_RATE)
+
+    assert "anything" not in bloom
+    assert bloom.false_positive_rate == 0.0
@@ -0,0 +1,68 @@
+"""Tests of the in-process TTL cache."""
+
+import pytest
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Time of the cache, advanced by the test."""
+    now = [1_000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire(clock: list[float]) -> None:
+    entries: TTLCache[str] = TTLCache(maxsize=10, ttl=60)
+    entries.set("default", "a")
+    entries.set("short", "b", ttl=5)
+
+    clock[0] += 10
+
+    assert entries.get("short") is None
+    assert entries.get("default") == "a"
+    clock[0] += 60
+    assert entries.get("default", default=...) is ...
+    assert entries.stats()["hits"] == 1
+    assert entries.stats()["misses"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(clock: list[float]) -> None:
+    entries: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+    entries.set("a", 1)
+    entries.set("b", 2)
+
+    assert entries.get("a") == 1
+    entries.set("c", 3)
+
+    assert entries.peek("b") is None
+    assert entries.peek("a") == 1
+    assert entries.peek("c") == 3
+    assert entries.stats()["evictions"] == 1
+
+
+def test_peek_does_not_touch_recency(clock: list[float]) -> None:
+    entries: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+    entries.set("a", 1)
+    entries.set("b", 2)
+
+    assert entries.peek("a") == 1
+    entries.set("c", 3)
+
+    assert entries.peek("a") is None
+    assert entries.stats()["hits"] == 0
+
+
+def test_delete_entries(clock: list[float]) -> None:
+    entries: TTLCache[int] = TTLCache(maxsize=10, ttl=60)
+    for value in range(6):
+        entries.set(f"key_{value}", value)
+
+    assert entries.delete("key_0")
+    assert not entries.delete("key_0")
+    assert entries.delete_where(lambda _, value: value % 2 == 1) == 3
+    assert len(entries) == 2
+    entries.clear()
+    assert len(entries) == 0
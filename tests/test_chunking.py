@@ -0,0 +1,83 @@
+"""Tests of the content-defined chunking of dataset files."""
+
+import random
+
+import pytest
+
+from app.storage.chunking import split_chunks
+
+SIZE = 1024
+
+
+def _file(rows: int = 5_000, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    return b"time,geo,kpi\n" + b"".join(
+        b"2024-%02d-%02d,geo_%d,%d\n"
+        % (
+            rng.randint(1, 12),
+            rng.randint(1, 28),
+            rng.randint(0, 9),
+            rng.randrange(10**6),
+        )
+        for _ in range(rows)
+    )
+
+
+def _blocks(data: bytes, block_size: int) -> list[bytes]:
+    return [data[i : i + block_size] for i in range(0, len(data), block_size)]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 100, 1024, 5_000, 1_000_000])
+def test_chunks_do_not_depend_on_block_size(block_size: int) -> None:
+    data = _file()
+    expected = list(split_chunks([data], SIZE))
+
+    chunks = list(split_chunks(_blocks(data, block_size), SIZE))
+
+    assert chunks == expected
+    assert b"".join(chunks) == data
+
+
+def test_chunks_end_at_lines_within_bounds() -> None:
+    chunks = list(split_chunks(_blocks(_file(), 4096), SIZE))
+
+    assert len(chunks) > 10
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert all(len(chunk) <= 4 * SIZE for chunk in chunks)
+    assert all(len(chunk) >= SIZE // 4 for chunk in chunks[:-1])
+
+
+def test_lines_longer_than_chunks_are_cut() -> None:
+    data = b"x" * (10 * SIZE) + b"\n" + b"y" * 100
+
+    chunks = list(split_chunks(_blocks(data, 1000), SIZE))
+
+    assert b"".join(chunks) == data
+    assert all(len(chunk) <= 4 * SIZE for chunk in chunks)
+
+
+def test_edit_only_changes_nearby_chunks() -> None:
+    data = _file()
+    lines = data.splitlines(keepends=True)
+    lines[2_500] = b"2024-06-15,geo_3,123456\n"
+    edited = b"".join(lines)
+
+    original = list(split_chunks(_blocks(data, 4096), SIZE))
+    changed = list(split_chunks(_blocks(edited, 4096), SIZE))
+
+    assert len(set(changed) - set(original)) <= 2
+    assert len(set(original) & set(changed)) >= len(original) - 2
+
+
+def test_insertion_only_changes_nearby_chunks() -> None:
+    data = _file()
+    lines = data.splitlines(keepends=True)
+    inserted = b"".join(lines[:1_000] + lines[1:50] + lines[1_000:])
+
+    original = list(split_chunks(_blocks(data, 4096), SIZE))
+    changed = list(split_chunks(_blocks(inserted, 4096), SIZE))
+
+    # New chunks hold the inserted rows, and those of at most two chunks
+    assert len(set(original) - set(changed)) <= 2
+    new = sum(len(chunk) for chunk in set(changed) - set(original))
+    assert new <= len(inserted) - len(data) + 2 * 4 * SIZE
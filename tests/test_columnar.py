@@ -0,0 +1,141 @@
+"""Tests of the row windows of Parquet datasets."""
+
+import datetime as dt
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.core.settings import settings
+from app.storage import columnar
+from app.storage.columnar import RowFilter, convert_csv, iter_rows
+
+ROWS = 500
+TABLE = pa.table(
+    {
+        "time": pa.array(
+            [dt.date(2024, 1, 1) + dt.timedelta(days=i // 4) for i in range(ROWS)],
+        ),
+        # Runs of a geo, so some row groups hold a single one
+        "geo": [f"geo_{i // 60 % 4}" for i in range(ROWS)],
+        "kpi": list(range(ROWS)),
+    },
+)
+FILTERS = [
+    RowFilter("geo", "time", geos=("geo_1",)),
+    RowFilter("geo", "time", geos=("geo_0", "geo_3")),
+    RowFilter("geo", "time", geos=("geo_9",)),
+    RowFilter("geo", "time", start=dt.date(2024, 1, 20), end=dt.date(2024, 3, 1)),
+    RowFilter("geo", "time", geos=("geo_2",), start=dt.date(2024, 2, 1)),
+]
+
+
+@pytest.fixture(params=["row_groups", "chunks"])
+def paths(request: pytest.FixtureRequest, tmp_path: Path) -> list[Path]:
+    """Dataset as one file of row groups, or as chunks of unequal sizes."""
+    if request.param == "row_groups":
+        path = tmp_path / "dataset.parquet"
+        pq.write_table(TABLE, path, row_group_size=37)
+        return [path]
+    paths = []
+    start = 0
+    for size in (1, 45, 120, 7, 200, 127):
+        path = tmp_path / f"{len(paths)}.parquet"
+        pq.write_table(TABLE.slice(start, size), path, row_group_size=size)
+        paths.append(path)
+        start += size
+    assert start == ROWS
+    return paths
+
+
+def _read(
+    paths: list[Path],
+    offset: int,
+    limit: int,
+    row_filter: RowFilter | None = None,
+) -> pa.Table:
+    columns, batches = iter_rows(paths, offset, limit, row_filter=row_filter)
+    return pa.Table.from_batches(list(batches), schema=TABLE.select(columns).schema)
+
+
+@pytest.mark.parametrize(
+    ("offset", "limit"),
+    [(0, 10), (0, ROWS), (36, 2), (37, 37), (40, 150), (166, 1), (499, 10), (500, 5)],
+)
+def test_window_across_row_groups(paths: list[Path], offset: int, limit: int) -> None:
+    rows = _read(paths, offset, limit)
+
+    assert rows.equals(TABLE.slice(offset, limit))
+
+
+@pytest.mark.parametrize("row_filter", FILTERS)
+@pytest.mark.parametrize(("offset", "limit"), [(0, 1_000), (0, 7), (25, 50), (90, 3)])
+def test_filtered_window_across_row_groups(
+    paths: list[Path],
+    row_filter: RowFilter,
+    offset: int,
+    limit: int,
+) -> None:
+    expected = TABLE.filter(row_filter.bind(TABLE.schema).expression())
+
+    rows = _read(paths, offset, limit, row_filter)
+
+    assert rows.equals(expected.slice(offset, limit))
+
+
+def test_filter_value_of_wrong_type(paths: list[Path]) -> None:
+    row_filter = RowFilter("kpi", "time", geos=("not a number",))
+
+    with pytest.raises(ValueError):
+        iter_rows(paths, 0, 10, row_filter=row_filter)
+
+
+def _convert(tmp_path: Path, lines: list[bytes]) -> list[pa.Table]:
+    source = tmp_path / "dataset.csv"
+    source.write_bytes(b"time,geo,kpi\n" + b"".join(lines))
+    target = tmp_path / "chunks"
+    target.mkdir()
+    chunks, _ = convert_csv(source, target)
+    assert len(chunks) > 3
+    return [pq.read_table(chunk) for chunk in chunks]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Split CSV files into many chunks, and infer types from the first only."""
+    monkeypatch.setattr(settings, "DATASET_CHUNK_SIZE", 512)
+    monkeypatch.setattr(columnar, "_CSV_INFER_SIZE", 512)
+
+
+@pytest.mark.usefixtures("small_chunks")
+def test_integer_columns_stay_integers(tmp_path: Path) -> None:
+    lines = [b"2024-01-%02d,%d,%d\n" % (i % 28 + 1, 501 + i % 3, i) for i in range(500)]
+
+    chunks = _convert(tmp_path, lines)
+
+    assert {chunk.schema.field("geo").type for chunk in chunks} == {pa.int64()}
+    assert {chunk.schema.field("kpi").type for chunk in chunks} == {pa.int64()}
+    assert pa.concat_tables(chunks).column("geo").to_pylist()[:3] == [501, 502, 503]
+
+
+@pytest.mark.usefixtures("small_chunks")
+def test_decimals_widen_integer_column_in_every_chunk(tmp_path: Path) -> None:
+    lines = [b"2024-01-%02d,%d,%d\n" % (i % 28 + 1, 501 + i % 3, i) for i in range(500)]
+    lines[400] = b"2024-01-01,501,0.5\n"
+
+    chunks = _convert(tmp_path, lines)
+
+    assert {chunk.schema.field("kpi").type for chunk in chunks} == {pa.float64()}
+    assert {chunk.schema.field("geo").type for chunk in chunks} == {pa.int64()}
+    kpis = pa.concat_tables(chunks).column("kpi").to_pylist()
+    assert kpis == [0.5 if i == 400 else i for i in range(500)]
+
+
+@pytest.mark.usefixtures("small_chunks")
+def test_text_in_integer_column(tmp_path: Path) -> None:
+    lines = [b"2024-01-%02d,%d,%d\n" % (i % 28 + 1, 501 + i % 3, i) for i in range(500)]
+    lines[400] = b"2024-01-01,UK,1\n"
+
+    with pytest.raises(ValueError):
+        _convert(tmp_path, lines)
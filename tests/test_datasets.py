@@ -0,0 +1,105 @@
+"""Tests of the storage of datasets in shared chunks."""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.storage import LocalBlobStorage
+from tests.conftest import PROJECT_ID
+
+DATASETS = f"/v1/projects/{PROJECT_ID}/datasets"
+LINES = [b"2024-01-%02d,geo_%d,%d\n" % (i % 28 + 1, i % 7, i) for i in range(2_000)]
+CONTENT = b"time,geo,kpi\n" + b"".join(LINES)
+EDITED = b"time,geo,kpi\n" + b"".join(
+    [*LINES[:1_000], b"2024-01-01,geo_1,999999\n", *LINES[1_001:]]
+)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Split datasets into many chunks, as large files would be."""
+    monkeypatch.setattr(settings, "DATASET_CHUNK_SIZE", 2048)
+
+
+def _upload(client: TestClient, data: bytes) -> str:
+    upload = client.post(
+        f"{DATASETS}/uploads", json={"name": "sales", "size": len(data)}
+    ).json()
+    response = client.patch(
+        f"{DATASETS}/uploads/{upload['id']}",
+        content=data,
+        headers={"Upload-Offset": "0"},
+    )
+    assert response.status_code == 200
+    return response.json()["dataset_id"]
+
+
+def _chunks(storage: LocalBlobStorage) -> set[str]:
+    return {
+        path.name for path in Path(storage.root, "chunks").rglob("*") if path.is_file()
+    }
+
+
+def _kpis(client: TestClient, dataset_id: str) -> list[float]:
+    response = client.get(f"{DATASETS}/{dataset_id}/rows", params={"limit": 5_000})
+    return [row[2] for row in response.json()["rows"]]
+
+
+def test_similar_datasets_share_chunks(
+    client: TestClient,
+    storage: LocalBlobStorage,
+) -> None:
+    original = _upload(client, CONTENT)
+    stored = _chunks(storage)
+    edited = _upload(client, EDITED)
+
+    assert len(stored) > 5
+    assert len(_chunks(storage) - stored) <= 2
+    assert _kpis(client, original) == list(range(2_000))
+    assert _kpis(client, edited)[1_000] == 999_999
+
+
+def test_delete_keeps_chunks_still_used(
+    client: TestClient,
+    storage: LocalBlobStorage,
+) -> None:
+    original = _upload(client, CONTENT)
+    copy = _upload(client, CONTENT)
+    edited = _upload(client, EDITED)
+    stored = _chunks(storage)
+
+    assert client.delete(f"{DATASETS}/{original}").status_code == 204
+    assert _chunks(storage) == stored
+    assert _kpis(client, copy) == list(range(2_000))
+
+    assert client.delete(f"{DATASETS}/{copy}").status_code == 204
+    remaining = _chunks(storage)
+    assert 0 < len(stored - remaining) <= 2
+    assert _kpis(client, edited)[1_000] == 999_999
+
+    assert client.delete(f"{DATASETS}/{edited}").status_code == 204
+    assert _chunks(storage) == set()
+    assert client.get(f"{DATASETS}/{edited}").status_code == 404
+
+
+def test_rows_filtered_on_named_columns(client: TestClient) -> None:
+    content = b"week,region,kpi\n" + b"".join(
+        b"2024-01-%02d,r%d,%d\n" % (i % 28 + 1, i % 3, i) for i in range(300)
+    )
+    dataset_id = _upload(client, content)
+    filters = {"geo": "r1", "start": "2024-01-10", "end": "2024-01-12"}
+
+    response = client.get(
+        f"{DATASETS}/{dataset_id}/rows",
+        params={**filters, "geo_column": "region", "time_column": "week"},
+    )
+
+    rows = response.json()["rows"]
+    assert response.status_code == 200
+    assert rows
+    assert {row[1] for row in rows} == {"r1"}
+    assert {row[0] for row in rows} <= {"2024-01-10", "2024-01-11", "2024-01-12"}
+    unnamed = client.get(f"{DATASETS}/{dataset_id}/rows", params=filters)
+    assert unnamed.status_code == 400
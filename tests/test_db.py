@@ -0,0 +1,111 @@
+"""Tests of the shared database engines and Supabase clients."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import db, metrics
+from app.core.pool import TimedQueuePool, instrument, pool_stats
+from app.main import app
+
+
+@pytest.fixture
+def supabase() -> Iterator[None]:
+    """Supabase clients created by the test, closed afterwards."""
+    db.close_supabase_clients()
+    yield
+    db.close_supabase_clients()
+
+
+@pytest.mark.usefixtures("supabase")
+def test_supabase_clients_are_shared() -> None:
+    client = db.get_supabase_client()
+    admin = db.get_supabase_admin_auth_client()
+
+    assert db.get_supabase_client() is client
+    assert db.get_supabase_admin_auth_client() is admin
+    assert admin is not client
+    # Separate HTTP clients, on a single connection pool
+    assert admin.postgrest.session is not client.postgrest.session
+    assert admin.postgrest.session._transport is client.postgrest.session._transport
+
+
+@pytest.mark.usefixtures("supabase")
+def test_closed_supabase_clients_are_recreated() -> None:
+    client = db.get_supabase_client()
+    session = client.postgrest.session
+
+    db.close_supabase_clients()
+
+    assert session.is_closed
+    assert db.get_supabase_client() is not client
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+    """Engine on an instrumented pool of a single connection."""
+    monkeypatch.setattr(metrics, "_collectors", dict(metrics._collectors))
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument(engine, "test_pool")
+    yield engine
+    engine.dispose()
+
+
+def test_pool_metrics_count_checkouts_and_waits(engine: Engine) -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert pool_stats(engine)["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["checkins"] == 1
+    assert stats["connects"] == 1
+    assert stats["wait_time_max"] >= 0.05
+
+
+def test_pool_metrics_survive_dispose(engine: Engine, client: TestClient) -> None:
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    stats = client.get("/health/metrics").json()["test_pool"]
+
+    assert stats["connects"] == 2
+    assert stats["closes"] == 1
+    assert stats["checkouts"] == 2
+
+
+def _dependencies(dependant: Dependant) -> Iterator[object]:
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _dependencies(dependency)
+
+
+def test_v1_routes_only_use_async_sessions() -> None:
+    routes = [
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith("/v1/")
+    ]
+    calls = {call for route in routes for call in _dependencies(route.dependant)}
+
+    assert db.get_async_session in calls
+    assert db.get_session not in calls
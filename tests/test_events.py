@@ -0,0 +1,145 @@
+"""Tests of the streaming of job events."""
+
+import asyncio
+import importlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import notifications
+from app.core.events import (
+    JOB_EVENTS_CHANNEL,
+    JobEventBroker,
+    Subscription,
+    job_event_broker,
+)
+from app.schemas import Dataset, Job, Pipeline
+from app.schemas.job import JobEvent
+from app.validations.enums import JobStatus
+from tests.conftest import PROJECT_ID
+
+jobs_router = importlib.import_module("app.routers.v1.projects.[project_id].jobs")
+
+EVENTS = f"/v1/projects/{PROJECT_ID}/jobs/events"
+
+
+def _event(job_id: str) -> JobEvent:
+    return JobEvent(job_id=job_id, project_id=PROJECT_ID, status=JobStatus.running)
+
+
+def test_events_reach_watchers_of_their_project() -> None:
+    broker = JobEventBroker(queue_size=10)
+
+    async def run() -> list[JobEvent | None]:
+        watchers = [broker.subscribe(PROJECT_ID), broker.subscribe(PROJECT_ID)]
+        other = broker.subscribe("other")
+        broker.publish(_event("job"))
+        assert other._queue.empty()
+        return [await watcher.get() for watcher in watchers]
+
+    assert [event.job_id for event in asyncio.run(run())] == ["job", "job"]
+    assert broker.stats()["delivered"] == 2
+    assert broker.stats()["watchers"] == 3
+
+
+def test_slow_watchers_are_disconnected() -> None:
+    broker = JobEventBroker(queue_size=2)
+
+    async def run() -> JobEvent | None:
+        watcher = broker.subscribe(PROJECT_ID)
+        for index in range(4):
+            broker.publish(_event(f"job_{index}"))
+        return await watcher.get()
+
+    assert asyncio.run(run()) is None
+    assert broker.stats()["watchers"] == 0
+    assert broker.stats()["delivered"] == 2
+    assert broker.stats()["overflowed"] == 1
+
+
+def test_notified_events_are_published(monkeypatch: pytest.MonkeyPatch) -> None:
+    published = []
+    monkeypatch.setattr(job_event_broker, "publish", published.append)
+
+    notifications._dispatch(None, 0, JOB_EVENTS_CHANNEL, "not json")
+    notifications._dispatch(
+        None, 0, JOB_EVENTS_CHANNEL, _event("job").model_dump_json()
+    )
+
+    assert [event.job_id for event in published] == ["job"]
+
+
+def test_stream_follows_snapshot_with_live_events() -> None:
+    broker = JobEventBroker(queue_size=2)
+
+    async def run() -> list[str]:
+        subscription = broker.subscribe(PROJECT_ID)
+        stream = jobs_router._event_stream([_event("pending")], subscription)
+        messages = [await anext(stream)]
+        broker.publish(_event("started"))
+        messages.append(await anext(stream))
+        for index in range(3):
+            broker.publish(_event(f"flood_{index}"))
+        messages += [message async for message in stream]
+        return messages
+
+    snapshot, started, overflow = asyncio.run(run())
+
+    assert snapshot.startswith("event: job\n")
+    assert json.loads(started.split("data: ")[1])["job_id"] == "started"
+    assert overflow == f"event: overflow\ndata: {jobs_router.OVERFLOW_DETAIL}\n\n"
+
+
+def test_stream_starts_with_active_jobs(
+    client: TestClient,
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def add_jobs() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(Dataset(id="dataset", name="d", project_id=PROJECT_ID, uri="-"))
+            session.add(
+                Pipeline(
+                    id="pipeline",
+                    project_id=PROJECT_ID,
+                    dataset_id="dataset",
+                    model_spec={},
+                ),
+            )
+            session.add(Job(id="pending", pipeline_id="pipeline", params={}))
+            session.add(
+                Job(
+                    id="done",
+                    pipeline_id="pipeline",
+                    params={},
+                    status=JobStatus.succeeded,
+                )
+            )
+            await session.commit()
+
+    asyncio.run(add_jobs())
+    subscribe = job_event_broker.subscribe
+
+    def overflowing_subscribe(project_id: str) -> Subscription:
+        # Ends the stream after the snapshot, as for a watcher too slow
+        subscription = subscribe(project_id)
+        for index in range(job_event_broker.queue_size + 1):
+            subscription.put(_event(f"flood_{index}"))
+        return subscription
+
+    monkeypatch.setattr(job_event_broker, "subscribe", overflowing_subscribe)
+
+    response = client.get(EVENTS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = response.text.split("\n\n")[:-1]
+    assert [message.split("\n")[0] for message in messages] == [
+        "event: job",
+        "event: overflow",
+    ]
+    assert json.loads(messages[0].split("data: ")[1])["job_id"] == "pending"
+    assert job_event_broker.stats()["watchers"] == 0
@@ -0,0 +1,201 @@
+"""Tests of the pipeline job executor."""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas import Dataset, Job, Model, Pipeline
+from app.tasks.executor import LEASE_EXPIRED_ERROR, JobExecutor
+from app.tasks.pipeline import JobPayload, JobResult
+from app.validations.enums import JobStatus
+from tests.conftest import PROJECT_ID
+
+ARTIFACTS = "TEST_EXECUTOR_ARTIFACTS"
+"""Environment variable of the directory runners write to, in worker processes."""
+
+
+def _fit(payload: JobPayload) -> JobResult:
+    """Write a model artifact, and kill the worker on demand."""
+    artifacts = Path(os.environ[ARTIFACTS])
+    crashed = artifacts / f"{payload.job_id}.crashed"
+    if payload.job_id == "crash" or (payload.job_id == "once" and not crashed.exists()):
+        crashed.touch()
+        os._exit(1)
+    model = artifacts / f"{payload.job_id}.pkl"
+    model.write_bytes(payload.job_id.encode())
+    return JobResult(model_uri=str(model), curves_sha256="0" * 64)
+
+
+def _hang(payload: JobPayload) -> JobResult:
+    """Never finish, like a long fit."""
+    time.sleep(60)
+    raise AssertionError
+
+
+@pytest.fixture
+def artifacts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Directory the runners write to, inherited by worker processes."""
+    monkeypatch.setenv(ARTIFACTS, str(tmp_path))
+    return tmp_path
+
+
+def _add_jobs(engine: AsyncEngine, *jobs: Job) -> None:
+    async def add() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(Dataset(id="dataset", name="d", project_id=PROJECT_ID, uri="-"))
+            session.add(
+                Pipeline(
+                    id="pipeline",
+                    project_id=PROJECT_ID,
+                    dataset_id="dataset",
+                    model_spec={},
+                ),
+            )
+            session.add_all(jobs)
+            await session.commit()
+
+    asyncio.run(add())
+
+
+def _run(
+    engine: AsyncEngine,
+    executor: JobExecutor,
+    done: Callable[[dict[str, Job]], bool],
+    timeout: float = 30,
+) -> dict[str, Job]:
+    """Run an executor until ``done`` holds for the jobs, then stop it."""
+
+    async def jobs() -> dict[str, Job]:
+        async with AsyncSession(engine) as session:
+            return {job.id: job for job in (await session.exec(select(Job))).all()}
+
+    async def run() -> dict[str, Job]:
+        task = asyncio.create_task(executor.run())
+        deadline = asyncio.get_running_loop().time() + timeout
+        try:
+            while not done(state := await jobs()):
+                assert asyncio.get_running_loop().time() < deadline, state
+                await asyncio.sleep(0.1)
+        finally:
+            executor.stop()
+            await task
+        return await jobs()
+
+    return asyncio.run(run())
+
+
+def _executor(engine: AsyncEngine, runner: Callable, **kwargs: float) -> JobExecutor:
+    return JobExecutor(
+        runner,
+        max_workers=1,
+        poll_interval=0.1,
+        drain_timeout=0.1,
+        session_factory=lambda: AsyncSession(engine, expire_on_commit=False),
+        **kwargs,
+    )
+
+
+def _finished(jobs: dict[str, Job]) -> bool:
+    return all(
+        job.status in (JobStatus.succeeded, JobStatus.failed) for job in jobs.values()
+    )
+
+
+def test_job_succeeds(engine: AsyncEngine, artifacts: Path) -> None:
+    _add_jobs(engine, Job(id="fit", pipeline_id="pipeline", params={}))
+    executor = _executor(engine, _fit)
+
+    jobs = _run(engine, executor, _finished)
+
+    assert jobs["fit"].status == JobStatus.succeeded
+
+    async def model() -> Model:
+        async with AsyncSession(engine) as session:
+            return (await session.exec(select(Model))).one()
+
+    assert asyncio.run(model()).uri == str(artifacts / "fit.pkl")
+
+
+def test_dead_worker_requeues_job_and_replaces_pool(
+    engine: AsyncEngine,
+    artifacts: Path,
+) -> None:
+    _add_jobs(
+        engine,
+        Job(id="once", pipeline_id="pipeline", params={}),
+        Job(id="next", pipeline_id="pipeline", params={}),
+    )
+    executor = _executor(engine, _fit)
+
+    jobs = _run(engine, executor, _finished)
+
+    assert jobs["once"].status == JobStatus.succeeded
+    assert jobs["once"].retries == 1
+    assert jobs["next"].status == JobStatus.succeeded
+    assert executor.stats()["pool_restarts"] >= 1
+
+
+def test_job_killing_its_worker_fails_after_retries(
+    engine: AsyncEngine,
+    artifacts: Path,
+) -> None:
+    _add_jobs(
+        engine,
+        Job(id="crash", pipeline_id="pipeline", params={}),
+        Job(id="fit", pipeline_id="pipeline", params={}),
+    )
+    executor = _executor(engine, _fit, max_retries=2)
+
+    jobs = _run(engine, executor, _finished)
+
+    assert jobs["crash"].status == JobStatus.failed
+    assert jobs["crash"].retries == 3
+    assert jobs["fit"].status == JobStatus.succeeded
+
+
+def test_expired_lease_requeues_job(engine: AsyncEngine, artifacts: Path) -> None:
+    long_ago = datetime.now(UTC) - timedelta(hours=1)
+    _add_jobs(
+        engine,
+        Job(
+            id="orphan",
+            pipeline_id="pipeline",
+            params={},
+            status=JobStatus.running,
+            started_at=long_ago,
+            heartbeat_at=long_ago,
+        ),
+    )
+    executor = _executor(engine, _fit, lease_timeout=60)
+
+    jobs = _run(engine, executor, _finished)
+
+    assert jobs["orphan"].status == JobStatus.succeeded
+    assert executor.stats()["expired"] == 1
+
+
+def test_heartbeat_renews_lease(engine: AsyncEngine, artifacts: Path) -> None:
+    _add_jobs(engine, Job(id="long", pipeline_id="pipeline", params={}))
+    executor = _executor(engine, _hang, heartbeat_interval=0.1, lease_timeout=0.5)
+    beats = []
+
+    def renewed(jobs: dict[str, Job]) -> bool:
+        job = jobs["long"]
+        if job.heartbeat_at is not None:
+            beats.append(job.heartbeat_at)
+        return len(set(beats)) > 3
+
+    jobs = _run(engine, executor, renewed)
+
+    # Never expired while its executor ran, and put back to pending on shutdown
+    assert executor.stats()["expired"] == 0
+    assert jobs["long"].status == JobStatus.pending
+    assert jobs["long"].error != LEASE_EXPIRED_ERROR
@@ -0,0 +1,119 @@
+"""Tests of the submission of pipeline jobs and the reuse of their results."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas import Dataset, Job, Model, Pipeline
+from app.services.job import fingerprint
+from app.validations.enums import JobStatus
+from app.validations.job_parameters import JobParams
+from tests.conftest import PROJECT_ID
+
+JOBS = f"/v1/projects/{PROJECT_ID}/jobs/"
+SPEC = {"columns": {"media": ["tv"], "media_spend": ["tv_spend"]}}
+SHA256 = "0" * 64
+
+
+@pytest.fixture
+def pipelines(engine: AsyncEngine) -> None:
+    """Pipelines of the same specification, on two datasets of the same content."""
+
+    async def add() -> None:
+        async with AsyncSession(engine) as session:
+            for name in ("first", "copy"):
+                session.add(
+                    Dataset(
+                        id=name,
+                        name=name,
+                        project_id=PROJECT_ID,
+                        uri="-",
+                        sha256=SHA256,
+                    )
+                )
+                session.add(
+                    Pipeline(
+                        id=name,
+                        project_id=PROJECT_ID,
+                        dataset_id=name,
+                        model_spec=SPEC,
+                    )
+                )
+            await session.commit()
+
+    asyncio.run(add())
+
+
+def _succeed(engine: AsyncEngine, job_id: str) -> None:
+    """Record a job as succeeded with a model, as the executor would."""
+
+    async def succeed() -> None:
+        async with AsyncSession(engine) as session:
+            job = await session.get(Job, job_id)
+            job.status = JobStatus.succeeded
+            job.finished_at = datetime.now(UTC)
+            session.add(job)
+            session.add(Model(job_id=job_id, uri="model.pkl", sha256=SHA256))
+            await session.commit()
+
+    asyncio.run(succeed())
+
+
+def test_equivalent_jobs_share_fingerprint() -> None:
+    explicit = {
+        "max_lag": 8,
+        "columns": {"time": "time", "media_spend": ["tv_spend"], "media": ["tv"]},
+    }
+    params = JobParams()
+
+    assert fingerprint(SHA256, SPEC, params) == fingerprint(SHA256, explicit, params)
+    assert fingerprint(SHA256, SPEC, params) != fingerprint("other", SPEC, params)
+    assert fingerprint(SHA256, SPEC, params) != fingerprint(
+        SHA256, SPEC, JobParams(seed=1)
+    )
+
+
+@pytest.mark.usefixtures("pipelines")
+def test_identical_jobs_reuse_succeeded_model(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    submitted = client.post(JOBS, json={"pipeline_id": "first"}).json()
+    # Not succeeded yet, so fitted again
+    queued = client.post(JOBS, json={"pipeline_id": "first"}).json()
+    assert [submitted["status"], queued["status"]] == ["pending", "pending"]
+    _succeed(engine, submitted["id"])
+
+    response = client.post(JOBS, json={"pipeline_id": "copy"})
+
+    assert response.status_code == 202
+    memoized = response.json()
+    assert memoized["status"] == "succeeded"
+    assert memoized["memoized_from"] == submitted["id"]
+
+    async def get_model() -> Model:
+        async with AsyncSession(engine) as session:
+            return await session.get(Model, memoized["model_id"])
+
+    model = asyncio.run(get_model())
+    assert (model.job_id, model.uri) == (memoized["id"], "model.pkl")
+
+
+@pytest.mark.usefixtures("pipelines")
+def test_forced_or_different_jobs_are_queued(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    submitted = client.post(JOBS, json={"pipeline_id": "first"}).json()
+    _succeed(engine, submitted["id"])
+
+    forced = client.post(JOBS, json={"pipeline_id": "first", "force": True})
+    reseeded = client.post(JOBS, json={"pipeline_id": "first", "params": {"seed": 1}})
+
+    assert forced.json()["status"] == "pending"
+    assert reseeded.json()["status"] == "pending"
+    assert forced.json()["memoized_from"] is None
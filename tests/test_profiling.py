@@ -0,0 +1,123 @@
+"""Tests of the profiling of datasets."""
+
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics.profiling import profile_table
+from app.services import dataset
+from tests.conftest import PROJECT_ID
+from tests.test_datasets import _upload
+
+DATASETS = f"/v1/projects/{PROJECT_ID}/datasets"
+CONTENT = (
+    b"time,geo,spend,kpi\n"
+    b"2024-01-01,a,1.0,1\n"
+    b"2024-01-08,a,2.0,2\n"
+    b"2024-01-15,a,,3\n"
+    b"2024-01-01,b,4.0,4\n"
+    b"2024-01-08,b,5.0,5\n"
+)
+
+
+@pytest.fixture
+def profiles(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    """Arguments of every profile computed, rather than read from storage."""
+    computed = []
+    profile = dataset._profile
+
+    def record(*args: object) -> dict:
+        computed.append(args[1:])
+        return profile(*args)
+
+    monkeypatch.setattr(dataset, "_profile", record)
+    return computed
+
+
+def test_profile_columns_and_coverage() -> None:
+    table = pa.table(
+        {
+            "time": ["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-01"],
+            "geo": ["a", "a", "a", "b"],
+            "spend": [1.0, 2.0, None, 3.0],
+        }
+    )
+
+    profile = profile_table(table, "time", "geo")
+
+    assert profile["num_rows"] == 4
+    spend = profile["columns"][2]
+    assert spend["numeric"]
+    assert spend["null_ratio"] == 0.25
+    assert (spend["min"], spend["max"], spend["sum"], spend["mean"]) == (
+        1.0,
+        3.0,
+        6.0,
+        2.0,
+    )
+    assert spend["quantiles"]["p50"] == 2.0
+    assert not profile["columns"][1]["numeric"]
+    coverage = profile["time_coverage"]
+    assert coverage["periods"] == 3
+    assert [(geo["geo"], geo["missing"]) for geo in coverage["geos"]] == [
+        ("a", 0),
+        ("b", 2),
+    ]
+
+
+def test_profiles_are_computed_once_per_content(
+    client: TestClient,
+    profiles: list[tuple],
+) -> None:
+    first = _upload(client, CONTENT)
+    second = _upload(client, CONTENT)
+
+    responses = [
+        client.get(f"{DATASETS}/{dataset_id}/profile")
+        for dataset_id in (first, first, second)
+    ]
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert responses[0].json() == responses[2].json()
+    assert responses[0].json()["time_coverage"]["geos"][1]["missing"] == 1
+    assert profiles == [("time", "geo")]
+
+    response = client.get(f"{DATASETS}/{first}/profile", params={"geo_column": "kpi"})
+
+    assert response.status_code == 200
+    assert profiles == [("time", "geo"), ("time", "kpi")]
+
+
+def test_profiles_of_unknown_columns_are_rejected(
+    client: TestClient,
+    profiles: list[tuple],
+) -> None:
+    dataset_id = _upload(client, CONTENT)
+
+    response = client.get(
+        f"{DATASETS}/{dataset_id}/profile", params={"time_column": "date"}
+    )
+
+    assert response.status_code == 400
+    assert profiles == []
+
+
+def test_model_specs_are_checked_against_profile(client: TestClient) -> None:
+    dataset_id = _upload(client, CONTENT)
+    spec = {
+        "columns": {"media": ["impressions"], "media_spend": ["spend"]},
+        "max_lag": 3,
+    }
+
+    response = client.post(f"{DATASETS}/{dataset_id}/validate", json=spec)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "valid": False,
+        "issues": [
+            "Column impressions does not exist",
+            "Column spend has 20.0% missing values",
+            "1 geos do not cover every period: b",
+            "max_lag must be below the 3 periods",
+        ],
+    }
@@ -0,0 +1,177 @@
+"""Tests of the listing and batch operations of projects."""
+
+import asyncio
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models import Project, User
+from tests.conftest import PROJECT_ID, USER
+
+PROJECTS = "/v1/projects/"
+
+
+def _add_projects(engine: AsyncEngine, count: int) -> list[str]:
+    """Store projects created at the same time, and return every project ID."""
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+
+    async def add() -> None:
+        async with AsyncSession(engine) as session:
+            for index in range(count):
+                session.add(
+                    Project(
+                        id=f"project_{index:02d}",
+                        name=f"Project {index}",
+                        slug=f"project-{index}",
+                        user_id=USER.id,
+                        created_at=created_at,
+                    )
+                )
+            await session.commit()
+
+    asyncio.run(add())
+    return [*(f"project_{index:02d}" for index in range(count)), PROJECT_ID]
+
+
+def test_cursors_page_through_every_project(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    expected = _add_projects(engine, 11)
+    ids = []
+    pages = 0
+    params = {"limit": 4}
+
+    while True:
+        response = client.get(PROJECTS, params=params)
+        assert response.status_code == 200
+        ids += [project["id"] for project in response.json()]
+        pages += 1
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert ids == expected
+    assert pages == 3
+
+
+def test_invalid_cursors_are_rejected(client: TestClient) -> None:
+    response = client.get(PROJECTS, params={"cursor": "not a cursor"})
+
+    assert response.status_code == 400
+
+
+def test_fields_select_only_their_columns(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    _add_projects(engine, 3)
+    statements = []
+
+    def record(*args: object) -> None:
+        statements.append(args[2])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    response = client.get(PROJECTS, params={"fields": "name, id", "limit": 2})
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": "project_00", "name": "Project 0"},
+        {"id": "project_01", "name": "Project 1"},
+    ]
+    assert NEXT_CURSOR_HEADER in response.headers
+    [listing] = [statement for statement in statements if "LIMIT" in statement]
+    assert "slug" not in listing
+    assert "user_id" not in listing.split("WHERE")[0]
+
+
+def test_unknown_fields_are_rejected(client: TestClient) -> None:
+    response = client.get(PROJECTS, params={"fields": "id,slug"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: slug"
+
+
+def test_unchanged_projects_are_not_modified(client: TestClient) -> None:
+    etag = client.get(PROJECTS).headers["ETag"]
+
+    response = client.get(PROJECTS, headers={"If-None-Match": f'"other", W/{etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert client.get(PROJECTS, params={"limit": 1}).headers["ETag"] != etag
+
+
+def test_writes_change_etag(client: TestClient) -> None:
+    etag = client.get(PROJECTS).headers["ETag"]
+    assert client.post(PROJECTS, json={"name": "New"}).status_code == 201
+
+    response = client.get(PROJECTS, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["ETag"] != etag
+
+
+def test_batch_creates_projects_in_request_order(client: TestClient) -> None:
+    names = ["First", "Second", "Third"]
+
+    response = client.post(
+        f"{PROJECTS}batch", json={"projects": [{"name": name} for name in names]}
+    )
+
+    assert response.status_code == 201
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert {result["status"] for result in results} == {"created"}
+    listed = {project["id"]: project["name"] for project in client.get(PROJECTS).json()}
+    assert [listed[result["id"]] for result in results] == names
+
+
+def test_batches_with_invalid_projects_create_none(client: TestClient) -> None:
+    response = client.post(
+        f"{PROJECTS}batch", json={"projects": [{"name": "Valid"}, {"name": "x"}]}
+    )
+
+    assert response.status_code == 422
+    assert len(client.get(PROJECTS).json()) == 1
+
+
+def test_batch_deletes_only_owned_projects(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    async def add_other_user_project() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(User(id="other", email="other@example.com"))
+            session.add(
+                Project(id="theirs", name="Theirs", slug="theirs", user_id="other")
+            )
+            await session.commit()
+
+    asyncio.run(add_other_user_project())
+
+    response = client.post(
+        f"{PROJECTS}batch-delete", json={"ids": ["theirs", PROJECT_ID, "missing"]}
+    )
+
+    assert response.status_code == 200
+    assert [(result["id"], result["status"]) for result in response.json()] == [
+        ("theirs", "not_found"),
+        (PROJECT_ID, "deleted"),
+        ("missing", "not_found"),
+    ]
+    assert client.get(PROJECTS).json() == []
+
+    async def get_theirs() -> Project | None:
+        async with AsyncSession(engine) as session:
+            return await session.get(Project, "theirs")
+
+    assert asyncio.run(get_theirs()) is not None
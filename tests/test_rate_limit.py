@@ -0,0 +1,127 @@
+"""Tests of the rate limits of API keys and projects."""
+
+import uuid
+from typing import Annotated
+
+import pytest
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.dependencies import get_current_user
+from app.core.exceptions import InvalidApiKeyError, RateLimitExceededError
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter, rate_limiter
+from app.core.security import get_bearer_token
+from app.core.settings import settings
+from app.main import app
+from app.models import User
+from tests.conftest import PROJECT_ID, USER
+
+DATASET = f"/v1/projects/{PROJECT_ID}/datasets/missing"
+USERS = {"owner": USER, "other": User(id="other", email="other@example.com")}
+
+
+def _user_of_key(
+    key: Annotated[HTTPAuthorizationCredentials, Depends(get_bearer_token)],
+) -> User:
+    user = USERS.get(key.credentials)
+    if user is None:
+        raise InvalidApiKeyError
+    return user
+
+
+@pytest.fixture
+def backend(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> MemoryRateLimitBackend:
+    """Enabled rate limiter with empty buckets, and users keyed by API key."""
+    backend = MemoryRateLimitBackend(maxsize=100)
+    monkeypatch.setattr(rate_limiter, "backend", backend)
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_BURST", 5)
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_RATE", 0.001)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PROJECT_BURST", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PROJECT_RATE", 0.001)
+    app.dependency_overrides[get_current_user] = _user_of_key
+    return backend
+
+
+def _get(client: TestClient, key: str) -> int:
+    return client.get(DATASET, headers={"Authorization": f"Bearer {key}"}).status_code
+
+
+def test_invalid_keys_do_not_charge_buckets(
+    client: TestClient,
+    backend: MemoryRateLimitBackend,
+) -> None:
+    for _ in range(50):
+        assert _get(client, uuid.uuid4().hex) == 401
+
+    assert backend.stats()["buckets"] == 0
+    assert _get(client, "owner") == 404
+
+
+def test_other_users_do_not_charge_project(
+    client: TestClient,
+    backend: MemoryRateLimitBackend,
+) -> None:
+    for _ in range(5):
+        assert _get(client, "other") == 404
+    assert _get(client, "other") == 429
+
+    assert _get(client, "owner") == 404
+
+
+def test_project_bucket_limits_owner(
+    client: TestClient,
+    backend: MemoryRateLimitBackend,
+) -> None:
+    for _ in range(3):
+        assert _get(client, "owner") == 404
+
+    response = client.get(DATASET, headers={"Authorization": "Bearer owner"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_buckets_refill_at_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1_000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend(maxsize=100)
+
+    assert [backend.take("bucket", 2.0, 2) for _ in range(3)] == [0.0, 0.0, 0.5]
+    now[0] += 0.5
+    assert backend.take("bucket", 2.0, 2) == 0.0
+    # Idle buckets refill up to their burst only
+    now[0] += 60
+    assert [backend.take("bucket", 2.0, 2) for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_least_recently_used_buckets_are_dropped() -> None:
+    backend = MemoryRateLimitBackend(maxsize=2)
+    for bucket in ("a", "b", "a", "c"):
+        backend.take(bucket, 0.001, 1)
+
+    assert backend.stats()["buckets"] == 2
+    assert backend.take("a", 0.001, 1) > 0
+    # Dropped, so full again
+    assert backend.take("b", 0.001, 1) == 0.0
+
+
+def test_concurrency_is_capped_per_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_CONCURRENCY", 2)
+    limiter = RateLimiter(MemoryRateLimitBackend(maxsize=100))
+
+    with limiter.concurrency("key"), limiter.concurrency("key"):
+        with pytest.raises(RateLimitExceededError), limiter.concurrency("key"):
+            pass
+        with limiter.concurrency("other"):
+            assert limiter.stats()["in_flight"] == 3
+
+    with limiter.concurrency("key"):
+        pass
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["saturated"] == 1
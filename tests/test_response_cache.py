@@ -0,0 +1,122 @@
+"""Tests of the invalidation of cached responses across workers."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import notifications
+from app.core.response_cache import (
+    RESPONSE_CACHE_CHANNEL,
+    MemoryCacheBackend,
+    response_cache,
+)
+from app.models import Project
+from app.services.project import CACHE_NAMESPACE
+from tests.conftest import PROJECT_ID, USER
+
+PROJECTS = "/v1/projects/"
+
+
+@pytest.fixture
+def backend(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> MemoryCacheBackend:
+    """Enabled response cache, as on PostgreSQL with a connected listener."""
+    backend = MemoryCacheBackend(maxsize=100, ttl=60)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    monkeypatch.setattr(response_cache, "enabled", True)
+    monkeypatch.setattr(response_cache, "_shared", True)
+    monkeypatch.setattr(notifications, "listening", True)
+    return backend
+
+
+def _add_project_elsewhere(engine: AsyncEngine) -> None:
+    """Create a project from another worker, whose cache is not this one."""
+
+    async def add() -> None:
+        async with AsyncSession(engine) as session:
+            session.add(
+                Project(id="other", name="Other", slug="other", user_id=USER.id)
+            )
+            await session.commit()
+
+    asyncio.run(add())
+
+
+def _project_ids(client: TestClient) -> list[str]:
+    response = client.get(PROJECTS)
+    assert response.status_code == 200
+    return [project["id"] for project in response.json()]
+
+
+@pytest.mark.usefixtures("backend")
+def test_notified_invalidation_refreshes_other_workers(
+    client: TestClient,
+    engine: AsyncEngine,
+) -> None:
+    assert _project_ids(client) == [PROJECT_ID]
+    _add_project_elsewhere(engine)
+    assert _project_ids(client) == [PROJECT_ID]
+
+    notifications._dispatch(
+        None, 0, RESPONSE_CACHE_CHANNEL, f"{CACHE_NAMESPACE}:{USER.id}"
+    )
+
+    assert sorted(_project_ids(client)) == ["other", PROJECT_ID]
+
+
+@pytest.mark.usefixtures("backend")
+def test_cache_is_bypassed_without_listener(
+    client: TestClient,
+    engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(notifications, "listening", False)
+    assert _project_ids(client) == [PROJECT_ID]
+
+    _add_project_elsewhere(engine)
+
+    assert sorted(_project_ids(client)) == ["other", PROJECT_ID]
+
+
+def test_reconnected_listener_clears_cache(
+    client: TestClient,
+    engine: AsyncEngine,
+    backend: MemoryCacheBackend,
+) -> None:
+    assert _project_ids(client) == [PROJECT_ID]
+    _add_project_elsewhere(engine)
+
+    for callback in notifications._connect_callbacks:
+        callback()
+
+    assert sorted(_project_ids(client)) == ["other", PROJECT_ID]
+
+
+@pytest.mark.usefixtures("backend")
+def test_writes_invalidate_their_worker_before_notification(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The notification of the write is not received yet
+    monkeypatch.setitem(notifications._handlers, RESPONSE_CACHE_CHANNEL, lambda _: None)
+    assert _project_ids(client) == [PROJECT_ID]
+
+    response = client.post(PROJECTS, json={"name": "New"})
+
+    assert response.status_code == 201
+    assert len(_project_ids(client)) == 2
+
+
+def test_generations_are_bounded() -> None:
+    backend = MemoryCacheBackend(maxsize=3, ttl=60)
+    seen = {backend.generation("a"), backend.bump("a")}
+
+    for namespace in "bcdefgh":
+        backend.bump(namespace)
+        assert backend.stats()["generations"] <= 3
+
+    # Dropped, but never back to a generation its stale entries were cached under
+    assert backend.generation("a") not in seen
+    assert backend.generation("a") == backend.generation("unknown")
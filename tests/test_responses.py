@@ -0,0 +1,51 @@
+"""Tests of the JSON rendering of responses."""
+
+import json
+from datetime import UTC, datetime
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.responses import FastJSONResponse
+from app.models.project import ProjectPublic
+from tests.conftest import PROJECT_ID, USER
+
+
+def test_renders_models_and_arrays() -> None:
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+    project = ProjectPublic(
+        id=PROJECT_ID,
+        name="Project",
+        owner_id=USER.id,
+        created_at=created_at,
+        updated_at=None,
+    )
+
+    response = FastJSONResponse(
+        {"project": project, "created_at": created_at, "values": np.arange(3)}
+    )
+
+    assert json.loads(response.body) == {
+        "project": {
+            "id": PROJECT_ID,
+            "name": "Project",
+            "owner_id": USER.id,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": None,
+        },
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "values": [0, 1, 2],
+    }
+
+
+def test_listed_projects_match_response_model(client: TestClient) -> None:
+    response = client.get("/v1/projects/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [project] = response.json()
+    # Null fields are left out, as by the response model's exclude_none
+    assert project.keys() == set(ProjectPublic.model_fields) - {"updated_at"}
+    assert project["id"] == PROJECT_ID
+    assert project["owner_id"] == USER.id
+    assert datetime.fromisoformat(project["created_at"])
@@ -0,0 +1,92 @@
+"""Tests of the fair-share admission of pending jobs."""
+
+from datetime import UTC, datetime, timedelta
+
+from app.tasks.scheduler import Candidate, schedule
+from app.validations.enums import JobPriority
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _jobs(
+    project_id: str,
+    count: int,
+    priority: JobPriority = JobPriority.normal,
+    start: int = 0,
+) -> list[Candidate]:
+    return [
+        Candidate(
+            f"{project_id}-{priority.value}-{i}",
+            project_id,
+            priority,
+            START + timedelta(minutes=start + i),
+        )
+        for i in range(count)
+    ]
+
+
+def _projects(picked: list[Candidate]) -> list[str]:
+    return [candidate.project_id for candidate in picked]
+
+
+def test_high_priority_does_not_starve_other_projects() -> None:
+    candidates = [*_jobs("greedy", 10, JobPriority.high), *_jobs("other", 1, start=-5)]
+
+    picked = schedule(candidates, {"greedy": 1}, 2, max_running=2)
+
+    assert _projects(picked) == ["other", "greedy"]
+
+
+def test_high_priority_starts_first_within_project() -> None:
+    candidates = [
+        *_jobs("project", 2, JobPriority.low),
+        *_jobs("project", 2, start=1),
+        *_jobs("project", 1, JobPriority.high, start=2),
+    ]
+
+    picked = schedule(candidates, {}, 3, max_running=5)
+
+    assert [candidate.priority for candidate in picked] == [
+        JobPriority.high,
+        JobPriority.normal,
+        JobPriority.normal,
+    ]
+
+
+def test_free_workers_go_to_projects_running_fewest_jobs() -> None:
+    candidates = [*_jobs("busy", 5), *_jobs("idle", 5, start=10)]
+
+    picked = schedule(candidates, {"busy": 2}, 3, max_running=10)
+
+    assert _projects(picked) == ["idle", "idle", "busy"]
+
+
+def test_ties_go_to_oldest_job() -> None:
+    candidates = [*_jobs("late", 2, start=10), *_jobs("early", 2)]
+
+    picked = schedule(candidates, {}, 4, max_running=10)
+
+    assert _projects(picked) == ["early", "late", "early", "late"]
+
+
+def test_weights_share_workers() -> None:
+    candidates = [*_jobs("heavy", 10), *_jobs("light", 10)]
+
+    picked = schedule(candidates, {}, 9, max_running=10, weights={"heavy": 2})
+
+    assert _projects(picked).count("heavy") == 6
+    assert _projects(picked).count("light") == 3
+
+
+def test_projects_are_capped() -> None:
+    candidates = [*_jobs("large", 10), *_jobs("small", 1)]
+
+    picked = schedule(candidates, {"large": 1}, 5, max_running=2)
+
+    assert sorted(_projects(picked)) == ["large", "small"]
+
+
+def test_nothing_to_start() -> None:
+    assert schedule([], {}, 2, max_running=2) == []
+    assert schedule(_jobs("project", 2), {"project": 2}, 2, max_running=2) == []
+    assert schedule(_jobs("project", 2), {}, 0, max_running=2) == []
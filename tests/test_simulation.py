@@ -0,0 +1,112 @@
+"""Tests of the simulation of budget scenarios on response curves."""
+
+import numpy as np
+import pytest
+
+from app.analytics.simulation import ResponseCurves, simulate
+
+MULTIPLIERS = np.array([0.0, 0.5, 1.0, 2.0])
+SPEND = np.array([100.0, 200.0])
+
+
+@pytest.fixture
+def curves() -> ResponseCurves:
+    """Curves of two channels, with three posterior samples."""
+    rng = np.random.default_rng(0)
+    incremental = np.cumsum(rng.uniform(0, 10, size=(4, 3, 2)), axis=0)
+    incremental[0] = 0
+    return ResponseCurves.from_arrays(["tv", "search"], SPEND, MULTIPLIERS, incremental)
+
+
+def _weights(curves: ResponseCurves, budgets: list[list[float]]) -> np.ndarray:
+    weights, _ = curves.weights(np.array(budgets))
+    return weights.reshape(len(budgets), 2, len(MULTIPLIERS))
+
+
+def test_weights_at_grid_points(curves: ResponseCurves) -> None:
+    weights = _weights(curves, [[0.0, 400.0], [50.0, 200.0]])
+
+    np.testing.assert_array_equal(weights[0], [[1, 0, 0, 0], [0, 0, 0, 1]])
+    np.testing.assert_array_equal(weights[1], [[0, 1, 0, 0], [0, 0, 1, 0]])
+
+
+def test_weights_interpolate_between_grid_points(curves: ResponseCurves) -> None:
+    weights = _weights(curves, [[25.0, 300.0], [90.0, 20.0]])
+
+    np.testing.assert_allclose(weights[0], [[0.5, 0.5, 0, 0], [0, 0, 0.5, 0.5]])
+    np.testing.assert_allclose(weights[1], [[0, 0.2, 0.8, 0], [0.8, 0.2, 0, 0]])
+    np.testing.assert_allclose(weights.sum(axis=2), 1.0)
+
+
+def test_weights_cap_budgets_beyond_grid(curves: ResponseCurves) -> None:
+    budgets = np.array([[1_000.0, 200.0], [200.0, 400.0], [100.0, 400.1]])
+
+    weights, capped = curves.weights(budgets)
+
+    weights = weights.reshape(3, 2, len(MULTIPLIERS))
+    np.testing.assert_array_equal(weights[0, 0], [0, 0, 0, 1])
+    np.testing.assert_array_equal(weights[2, 1], [0, 0, 0, 1])
+    np.testing.assert_array_equal(capped, [True, False, True])
+
+
+def test_weights_of_channels_without_spend() -> None:
+    curves = ResponseCurves.from_arrays(
+        ["tv", "search"],
+        np.array([100.0, 0.0]),
+        MULTIPLIERS,
+        np.ones((4, 3, 2)),
+    )
+
+    weights, capped = curves.weights(np.array([[100.0, 50.0], [100.0, 0.0]]))
+
+    np.testing.assert_array_equal(weights.reshape(2, 2, -1)[:, 1], [[1, 0, 0, 0]] * 2)
+    np.testing.assert_array_equal(capped, [True, False])
+
+
+def test_simulate_budget_on_channel_without_spend() -> None:
+    curves = ResponseCurves.from_arrays(
+        ["tv", "search"],
+        np.array([100.0, 0.0]),
+        MULTIPLIERS,
+        np.ones((4, 3, 2)),
+    )
+
+    result = simulate(curves, np.array([[100.0, 50.0], [100.0, 0.0]]), 1_000)
+
+    np.testing.assert_array_equal(result["capped"], [True, False])
+    np.testing.assert_array_equal(result["channel_roi"][:, 1], [np.nan, np.nan])
+    assert np.isfinite(result["channel_roi"][:, 0]).all()
+
+
+def test_simulate_matches_interpolated_samples(curves: ResponseCurves) -> None:
+    budgets = np.array([[25.0, 300.0], [90.0, 20.0], [1_000.0, 0.0]])
+    samples = curves.curves.reshape(2, len(MULTIPLIERS), -1)
+    expected = np.array(
+        [
+            [
+                [
+                    np.interp(
+                        budget / SPEND[channel], MULTIPLIERS, samples[channel, :, s]
+                    )
+                    for s in range(curves.samples)
+                ]
+                for channel, budget in enumerate(row)
+            ]
+            for row in budgets
+        ],
+    )
+
+    result = simulate(curves, budgets, block_elements=4)
+
+    np.testing.assert_allclose(
+        result["channel_incremental"], expected.mean(axis=2), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        result["incremental"]["mean"], expected.sum(axis=1).mean(axis=1), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        result["incremental"]["p95"],
+        np.percentile(expected.sum(axis=1), 95, axis=1),
+        rtol=1e-5,
+    )
+    np.testing.assert_array_equal(result["capped"], [False, False, True])
@@ -0,0 +1,33 @@
+"""Tests of the import of the application."""
+
+import json
+import subprocess
+import sys
+
+from benchmarks.startup import LAZY_MODULES
+
+_PROBE = """
+import json, sys
+import app.main
+from app.core import db
+print(json.dumps({{
+    "loaded": [name for name in {lazy!r} if name in sys.modules],
+    "engines": [db._engine is not None, db._async_engine is not None],
+    "supabase_clients": list(db._supabase_clients),
+}}))
+"""
+
+
+def test_import_is_lazy_and_side_effect_free() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert json.loads(output.splitlines()[-1]) == {
+        "loaded": [],
+        "engines": [False, False],
+        "supabase_clients": [],
+    }
@@ -0,0 +1,179 @@
+"""Tests of resumable dataset uploads."""
+
+import asyncio
+import base64
+import hashlib
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from starlette.requests import ClientDisconnect
+
+from app.core.settings import settings
+from app.main import app
+from tests.conftest import PROJECT_ID
+
+UPLOADS = f"/v1/projects/{PROJECT_ID}/datasets/uploads"
+CONTENT = b"time,geo,kpi\n" + b"".join(
+    b"2024-01-%02d,geo_%d,%d\n" % (day % 28 + 1, day % 3, day) for day in range(200)
+)
+
+
+def _start(client: TestClient, data: bytes = CONTENT) -> str:
+    response = client.post(UPLOADS, json={"name": "sales", "size": len(data)})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _send(
+    client: TestClient,
+    upload_id: str,
+    offset: int,
+    part: bytes,
+    checksum: str | None = None,
+) -> Response:
+    headers = {"Upload-Offset": str(offset)}
+    if checksum is not None:
+        headers["Upload-Checksum"] = checksum
+    return client.patch(f"{UPLOADS}/{upload_id}", content=part, headers=headers)
+
+
+def _send_and_disconnect(upload_id: str, offset: int, parts: list[bytes]) -> None:
+    """Send the start of a part, then drop the connection."""
+    messages = [
+        {"type": "http.request", "body": part, "more_body": True} for part in parts
+    ]
+    messages.append({"type": "http.disconnect"})
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    async def send(message: dict) -> None:
+        pass
+
+    path = f"{UPLOADS}/{upload_id}"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "PATCH",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", b"Bearer key"),
+            (b"upload-offset", str(offset).encode()),
+        ],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    asyncio.run(app(scope, receive, send))
+
+
+def _checksum(part: bytes) -> str:
+    return "sha256 " + base64.b64encode(hashlib.sha256(part).digest()).decode()
+
+
+def _offset(client: TestClient, upload_id: str) -> int:
+    return client.get(f"{UPLOADS}/{upload_id}").json()["offset"]
+
+
+def _rows(client: TestClient, dataset_id: str) -> list[list]:
+    response = client.get(
+        f"/v1/projects/{PROJECT_ID}/datasets/{dataset_id}/rows",
+        params={"limit": 1000},
+    )
+    return response.json()["rows"]
+
+
+@pytest.fixture(autouse=True)
+def small_buffer(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Write parts to storage every few bytes, as large files would be."""
+    monkeypatch.setattr(settings, "UPLOAD_BUFFER_SIZE", 256)
+
+
+def test_upload_in_one_part(client: TestClient) -> None:
+    upload_id = _start(client)
+
+    response = _send(client, upload_id, 0, CONTENT)
+
+    assert response.status_code == 200
+    assert response.headers["Upload-Offset"] == str(len(CONTENT))
+    dataset_id = response.json()["dataset_id"]
+    dataset = client.get(f"/v1/projects/{PROJECT_ID}/datasets/{dataset_id}").json()
+    assert dataset["num_rows"] == 200
+    assert dataset["size"] == len(CONTENT)
+
+
+def test_upload_resumes_after_disconnect(client: TestClient) -> None:
+    upload_id = _start(client)
+
+    with pytest.raises(ClientDisconnect):
+        _send_and_disconnect(upload_id, 0, [CONTENT[:1000], CONTENT[1000:2000]])
+    offset = _offset(client, upload_id)
+    assert 0 < offset <= 2000
+
+    response = _send(client, upload_id, offset, CONTENT[offset:])
+
+    assert response.status_code == 200
+    rows = _rows(client, response.json()["dataset_id"])
+    assert [row[2] for row in rows] == list(range(200))
+
+
+def test_upload_rejects_offset_mismatch(client: TestClient) -> None:
+    upload_id = _start(client)
+    assert _send(client, upload_id, 0, CONTENT[:1000]).status_code == 200
+
+    for offset in (0, 500, 2000):
+        response = _send(client, upload_id, offset, CONTENT[offset:])
+        assert response.status_code == 409
+        assert response.headers["Upload-Offset"] == "1000"
+    assert _offset(client, upload_id) == 1000
+
+
+def test_upload_rejects_complete_upload(client: TestClient) -> None:
+    upload_id = _start(client)
+    assert _send(client, upload_id, 0, CONTENT).status_code == 200
+
+    response = _send(client, upload_id, len(CONTENT), b"")
+
+    assert response.status_code == 409
+
+
+def test_upload_part_checksum_mismatch_truncates_part(client: TestClient) -> None:
+    upload_id = _start(client)
+    assert _send(client, upload_id, 0, CONTENT[:1000]).status_code == 200
+    part = CONTENT[1000:]
+
+    response = _send(client, upload_id, 1000, part, _checksum(part[:-1]))
+
+    assert response.status_code == 422
+    assert _offset(client, upload_id) == 1000
+    response = _send(client, upload_id, 1000, part, _checksum(part))
+    assert response.status_code == 200
+    assert response.json()["dataset_id"] is not None
+
+
+def test_upload_file_checksum_mismatch_restarts_upload(client: TestClient) -> None:
+    response = client.post(
+        UPLOADS,
+        json={"name": "sales", "size": len(CONTENT), "sha256": "0" * 64},
+    )
+    upload_id = response.json()["id"]
+
+    response = _send(client, upload_id, 0, CONTENT)
+
+    assert response.status_code == 422
+    assert _offset(client, upload_id) == 0
+
+
+def test_upload_rejects_part_past_size(client: TestClient) -> None:
+    upload_id = _start(client)
+
+    response = _send(client, upload_id, 0, CONTENT + b"2024-02-01,geo_0,1\n")
+
+    assert response.status_code == 413
+    assert _offset(client, upload_id) == 0